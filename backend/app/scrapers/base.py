@@ -1,7 +1,8 @@
 from abc import ABC, abstractmethod
 import re
 import json
-from typing import List, Optional, Any
+from collections import Counter
+from typing import List, Optional, Any, Dict
 from bs4 import BeautifulSoup
 from app.models.offer import OfferCard
 
@@ -27,8 +28,8 @@ class PortalScraper(ABC):
     def extract_total_pages(self, html: str) -> int:
         pass
 
-    def extract_details(self, html: str) -> dict:
-        """Extracts detailed property specs from a detail page HTML."""
+    def extract_details(self, html) -> dict:
+        """Extracts detailed property specs from a detail page HTML (or parsed BeautifulSoup tree)."""
         return {}
 
     def _normalize_neighborhood(self, location_text: str) -> Optional[str]:
@@ -55,3 +56,75 @@ class PortalScraper(ABC):
             except (json.JSONDecodeError, TypeError):
                 continue
         return json_ld_blocks
+
+
+class BaseScraper:
+    """
+    Run-stats protocol shared by the listing scrapers used by scan jobs.
+    Every method has a working default, so jobs call them directly
+    instead of probing with hasattr().
+    """
+
+    COVERAGE_FIELDS = [
+        "external_id", "url", "title", "price", "area_m2",
+        "bedrooms", "bathrooms", "parking", "neighborhood",
+        "city", "state", "main_image_url", "advertiser"
+    ]
+
+    def __init__(self):
+        self.reset_stats()
+
+    def reset_stats(self):
+        """Reset statistics for new run."""
+        self.stats = {
+            "pages_attempted": 0,
+            "pages_ok": 0,
+            "pages_blocked": 0,
+            "total_cards_found": 0,
+            "total_cards_parsed": 0,
+            "field_coverage": {},
+            "failure_reasons": Counter(),
+        }
+
+    def is_blocked(self, html: str) -> bool:
+        return False
+
+    def get_block_reason(self, html: str, status_code: int = 200) -> Optional[str]:
+        return "blocked"
+
+    def count_filled_fields(self, cards: List[Dict], counts: Dict[str, int]) -> None:
+        """Add each card's non-None COVERAGE_FIELDS to counts (running totals)."""
+        fields = self.COVERAGE_FIELDS
+        for c in cards:
+            for field in fields:
+                if c.get(field) is not None:
+                    counts[field] = counts.get(field, 0) + 1
+
+    def coverage_from_counts(self, counts: Dict[str, int], total: int) -> Dict[str, float]:
+        """Field coverage percentages from running counts over `total` cards."""
+        if not total:
+            return {}
+
+        coverage = {
+            field: round(counts.get(field, 0) / total * 100, 1)
+            for field in self.COVERAGE_FIELDS
+        }
+        self.stats["field_coverage"] = coverage
+        return coverage
+
+    def calculate_field_coverage(self, cards: List[Dict]) -> Dict[str, float]:
+        """Calculate field coverage percentages."""
+        counts: Dict[str, int] = {}
+        self.count_filled_fields(cards, counts)
+        return self.coverage_from_counts(counts, len(cards))
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get current statistics."""
+        success_rate = 0.0
+        if self.stats["total_cards_found"] > 0:
+            success_rate = self.stats["total_cards_parsed"] / self.stats["total_cards_found"] * 100
+
+        return {
+            **self.stats,
+            "success_rate": round(success_rate, 1),
+        }
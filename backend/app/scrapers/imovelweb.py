@@ -6,16 +6,19 @@ from typing import List, Optional
 from datetime import datetime, timezone, timedelta
 from bs4 import BeautifulSoup
 
-from app.scrapers.base import PortalScraper
+from app.scrapers.base import PortalScraper, BaseScraper
 from app.models.offer import OfferCard, Specs, Location
 from app.utils.parsers import parse_ptbr_recency
 
 logger = logging.getLogger(__name__)
 
 
-class ImovelwebScraper(PortalScraper):
+class ImovelwebScraper(PortalScraper, BaseScraper):
     BASE_URL = "https://www.imovelweb.com.br"
 
+    # Título da página sem montar a árvore inteira (is_blocked roda em toda página)
+    TITLE_RE = re.compile(r"<title[^>]*>(.*?)</title>", re.IGNORECASE | re.DOTALL)
+
     # ============================================================
     # Helpers (mesma lógica do “isolated test” que deu certo)
     # ============================================================
@@ -458,8 +461,12 @@ class ImovelwebScraper(PortalScraper):
     # Details (mantive o seu, só corrigindo normalização e guardas)
     # ============================================================
 
-    def extract_details(self, html: str) -> dict:
-        soup = BeautifulSoup(html, "html.parser")
+    def extract_details(self, html) -> dict:
+        # Accepts raw HTML or an already-parsed BeautifulSoup tree
+        if isinstance(html, BeautifulSoup):
+            soup, html = html, str(html)
+        else:
+            soup = BeautifulSoup(html, "html.parser")
         details = {}
         try:
             title_el = soup.select_one('h1[data-qa="POSTING_DETAILS_TITLE"], .section-title')
@@ -551,8 +558,8 @@ class ImovelwebScraper(PortalScraper):
             return False
             
         # Definite block indicators
-        soup = BeautifulSoup(html, "html.parser")
-        title = soup.title.string.strip() if soup.title else ""
+        match = self.TITLE_RE.search(html)
+        title = match.group(1).strip() if match else ""
         
         if "Just a moment" in title or "Access Denied" in title:
             return True
@@ -19,7 +19,8 @@ import random
 import time
 import json
 import hashlib
-from typing import Optional, Dict, Any, Union, List
+from collections import defaultdict
+from typing import Optional, Dict, Any, Union, List, Set
 from pathlib import Path
 
 # Use standard playwright (patchright has network issues on some systems)
@@ -92,6 +93,9 @@ STEALTH_ARGS = [
     "--no-first-run",
 ]
 
+# Challenge widgets that can appear instead of (or on top of) listing content
+CHALLENGE_SELECTOR = 'iframe[src*="challenges.cloudflare"], #challenge-running, #challenge-form'
+
 
 class StealthFetcher:
     """
@@ -115,6 +119,13 @@ class StealthFetcher:
         self.browser = None
         self.context: Optional[BrowserContext] = None
         self.lock = asyncio.Lock()
+        # Pages open on the current context; rotation waits until it's idle
+        self.open_pages = 0
+        self.idle = asyncio.Event()
+        self.idle.set()
+        # Portals whose homepage warm-up already ran on this fetcher's cookies
+        self.warmed_portals: Set[str] = set()
+        self.warmup_locks: Dict[str, asyncio.Lock] = defaultdict(asyncio.Lock)
         
         # Session state
         self.current_user_agent = None
@@ -141,13 +152,34 @@ class StealthFetcher:
         return self.current_viewport
 
     async def start(self, force_new: bool = False):
-        """Initialize browser and context with stealth settings."""
-        if self.playwright and not force_new:
+        """
+        Initialize browser and context with stealth settings.
+
+        force_new rotates the fingerprint (UA/viewport) on a fresh context but
+        keeps the running browser and carries the old context's cookies and
+        storage over, so warm-up/Cloudflare cookies survive the rotation.
+        """
+        if self.context and not force_new:
             return
         
-        # Close existing if forcing new session
-        if force_new:
-            await self.close()
+        if not self.browser:
+            self.playwright = await async_playwright().start()
+            self.browser = await self.playwright.chromium.launch(
+                headless=self.headless,
+                args=STEALTH_ARGS
+            )
+        
+        storage_state = None
+        if self.context:
+            try:
+                storage_state = await self.context.storage_state()
+            except Exception as e:
+                logger.debug(f"Failed to read session state: {e}")
+            try:
+                await self.context.close()
+            except:
+                pass
+            self.context = None
         
         self._rotate_user_agent()
         self._rotate_viewport()
@@ -156,13 +188,6 @@ class StealthFetcher:
         print(f"   📱 UA: {self.current_user_agent[:60]}...")
         print(f"   🖥️ Viewport: {self.current_viewport['width']}x{self.current_viewport['height']}")
         
-        self.playwright = await async_playwright().start()
-        
-        self.browser = await self.playwright.chromium.launch(
-            headless=self.headless,
-            args=STEALTH_ARGS
-        )
-        
         # Create context with randomized fingerprint
         context_options = {
             "user_agent": self.current_user_agent,
@@ -175,8 +200,10 @@ class StealthFetcher:
             "permissions": ["geolocation"],
         }
         
-        # Load session state if available
-        if self.session_dir:
+        # Load session state: the rotated context's, else the saved one
+        if storage_state is not None:
+            context_options["storage_state"] = storage_state
+        elif self.session_dir:
             state_file = Path(self.session_dir) / "session_state.json"
             if state_file.exists():
                 try:
@@ -240,6 +267,32 @@ class StealthFetcher:
         except Exception as e:
             logger.debug(f"Failed to save session: {e}")
 
+    async def _wait_content_or_challenge(self, page: Page, selector: str, timeout: int) -> bool:
+        """
+        Race the content selector against CHALLENGE_SELECTOR; whichever
+        appears first ends the wait. Returns True if the challenge won.
+        """
+        content = asyncio.ensure_future(page.wait_for_selector(selector, timeout=timeout))
+        challenge = asyncio.ensure_future(page.wait_for_selector(CHALLENGE_SELECTOR, timeout=timeout))
+        pending = {content, challenge}
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                # A timed-out wait doesn't decide the race; keep waiting on the other
+                if any(t.exception() is None for t in done):
+                    break
+        finally:
+            for t in pending:
+                t.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+
+        if content.done() and not content.cancelled() and content.exception() is None:
+            return False
+        if challenge.done() and not challenge.cancelled() and challenge.exception() is None:
+            return True
+        logger.debug(f"Selector wait timeout: {content.exception()}")
+        return False
+
     async def simulate_human_behavior(self, page: Page):
         """
         Simulate realistic human behavior before capturing content.
@@ -310,16 +363,53 @@ class StealthFetcher:
             wait_timeout: Timeout for selector wait (ms)
             simulate_human: Whether to simulate human behavior
         """
-        if not self.context:
-            await self.start()
-        
-        # Rotate session every 5 pages to avoid fingerprinting
-        self.page_count += 1
-        if self.page_count > 5:
-            print(f"   🔄 Rotating session after {self.page_count} pages...")
-            await self.start(force_new=True)
+        async with self.lock:
+            if not self.context:
+                await self.start()
+            
+            # Rotate session every 5 pages to avoid fingerprinting
+            self.page_count += 1
+            if self.page_count > 5:
+                # Concurrent fetches may still be using the current context
+                await self.idle.wait()
+                print(f"   🔄 Rotating session after {self.page_count} pages...")
+                await self.start(force_new=True)
+            
+            self.open_pages += 1
+            self.idle.clear()
         
+        try:
+            return await self._fetch_page(
+                url, return_meta, run_id, scenario, request_type, page_num,
+                card_index, referer, wait_for_selector, wait_timeout, simulate_human,
+            )
+        finally:
+            self.open_pages -= 1
+            if self.open_pages == 0:
+                self.idle.set()
+
+    async def _fetch_page(
+        self, url, return_meta, run_id, scenario, request_type, page_num,
+        card_index, referer, wait_for_selector, wait_timeout, simulate_human,
+    ) -> Union[str, Dict[str, Any]]:
+        # One page per fetch on the shared context; closed even if the
+        # fetch raises
         page = await self.context.new_page()
+        try:
+            return await self._fetch_on_page(
+                page, url, return_meta, run_id, scenario, request_type, page_num,
+                card_index, referer, wait_for_selector, wait_timeout, simulate_human,
+            )
+        finally:
+            try:
+                await page.close()
+            except:
+                pass
+
+    async def _fetch_on_page(
+        self, page: Page, url, return_meta, run_id, scenario, request_type, page_num,
+        card_index, referer, wait_for_selector, wait_timeout, simulate_human,
+    ) -> Union[str, Dict[str, Any]]:
         response = None
         html = ""
         meta = {}
@@ -382,14 +472,12 @@ class StealthFetcher:
                     await asyncio.sleep(1.0)
             
             if not cf_cleared:
+                # Content can't render behind the challenge: skip the selector wait
                 print(f"   ⚠️ Cloudflare challenge did not clear after 15s")
-            
-            # Wait for content selector (after CF cleared)
-            if wait_for_selector:
-                try:
-                    await page.wait_for_selector(wait_for_selector, timeout=wait_timeout)
-                except Exception as e:
-                    logger.debug(f"Selector wait timeout: {e}")
+            elif wait_for_selector:
+                # Wait for content selector (after CF cleared), unless a challenge shows up first
+                if await self._wait_content_or_challenge(page, wait_for_selector, wait_timeout):
+                    print("   ⚠️ Challenge widget appeared instead of content")
             
             # Simulate human behavior (critical for Cloudflare bypass)
             if simulate_human:
@@ -485,11 +573,6 @@ class StealthFetcher:
         }
         self.last_meta = meta
         
-        try:
-            await page.close()
-        except:
-            pass
-        
         return meta if return_meta else html
 
     def log_fetch_metrics(self, **kwargs):
@@ -518,10 +601,19 @@ class StealthFetcher:
             "viewport": self.current_viewport,
         }
 
+    async def __aenter__(self) -> "StealthFetcher":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
     async def close(self):
         """Close browser and cleanup."""
         if self.session_dir:
             await self.save_session_state()
+        else:
+            # Cookies die with the context, so the next session warms up again
+            self.warmed_portals.clear()
         
         if self.context:
             try:
@@ -17,11 +17,12 @@ from bs4 import BeautifulSoup
 from bs4.element import NavigableString
 
 from app.models.offer import OfferCard, Specs, Location
+from app.scrapers.base import BaseScraper
 
 logger = logging.getLogger(__name__)
 
 
-class VivaRealListingOnlyScraper:
+class VivaRealListingOnlyScraper(BaseScraper):
     """
     VivaReal scraper for listing pages only (V2).
     No detail fetching, no published_at extraction.
@@ -39,6 +40,18 @@ class VivaRealListingOnlyScraper:
         "captcha",
         "cf-browser-verification",
     ]
+    # All block patterns in one case-insensitive pass (no lowercased copy of the page)
+    BLOCK_RE = re.compile("|".join(map(re.escape, BLOCK_PATTERNS)), re.IGNORECASE)
+    
+    # Valid app shell (Next.js/React page even if not fully rendered)
+    VALID_APP_INDICATORS = [
+        "__NEXT_DATA__",
+        "gtm.start",
+        "_next/static",
+        "vivareal.com.br",
+        "property-card",
+        "listing-results",
+    ]
     
     # Success indicators (if present, likely not blocked)
     # Updated for new VivaReal HTML structure (OLX-based)
@@ -50,17 +63,6 @@ class VivaRealListingOnlyScraper:
         "rp-property-cd",             # fallback
     ]
     
-    def __init__(self):
-        self.stats = {
-            "pages_attempted": 0,
-            "pages_ok": 0,
-            "pages_blocked": 0,
-            "total_cards_found": 0,
-            "total_cards_parsed": 0,
-            "field_coverage": {},
-            "failure_reasons": {},
-        }
-    
     # -------------------------
     # URL Building
     # -------------------------
@@ -116,37 +118,16 @@ class VivaRealListingOnlyScraper:
         
         # Check for valid app shell (Next.js/React page even if not fully rendered)
         # These indicate a real page was loaded, not a Cloudflare block page
-        valid_app_indicators = [
-            "__NEXT_DATA__",
-            "gtm.start",
-            "_next/static",
-            "vivareal.com.br",
-            "property-card",
-            "listing-results",
-        ]
-        for indicator in valid_app_indicators:
+        for indicator in self.VALID_APP_INDICATORS:
             if indicator in html:
                 # Has valid content - not a block page
                 # But cards might not have rendered yet
                 return False
         
-        # Page is likely blocked - check block patterns
-        html_lower = html.lower()
-        for pattern in self.BLOCK_PATTERNS:
-            if pattern.lower() in html_lower:
-                return True
-        
-        # Check title for block indicators
-        try:
-            soup = BeautifulSoup(html, "html.parser")
-            title = soup.title.string.strip() if soup.title else ""
-            title_lower = title.lower()
-            if any(p.lower() in title_lower for p in ["just a moment", "access denied", "attention required"]):
-                return True
-        except:
-            pass
-        
-        return False
+        # Page is likely blocked - check block patterns.
+        # A block title ("Just a moment", ...) is also in the page body, so
+        # this single scan covers the title check as well.
+        return self.BLOCK_RE.search(html) is not None
     
     def content_has_cards(self, html: str) -> bool:
         """Check if HTML has card content to parse."""
@@ -188,8 +169,7 @@ class VivaRealListingOnlyScraper:
         published_at is ALWAYS None (V2 rule).
         """
         if not html:
-            self.stats["failure_reasons"]["empty_html"] = \
-                self.stats["failure_reasons"].get("empty_html", 0) + 1
+            self.stats["failure_reasons"]["empty_html"] += 1
             return []
         
         soup = BeautifulSoup(html, "html.parser")
@@ -210,11 +190,9 @@ class VivaRealListingOnlyScraper:
         
         if not containers:
             if self.is_blocked(html):
-                self.stats["failure_reasons"]["blocked_listing"] = \
-                    self.stats["failure_reasons"].get("blocked_listing", 0) + 1
+                self.stats["failure_reasons"]["blocked_listing"] += 1
             else:
-                self.stats["failure_reasons"]["no_cards_selector"] = \
-                    self.stats["failure_reasons"].get("no_cards_selector", 0) + 1
+                self.stats["failure_reasons"]["no_cards_selector"] += 1
             return []
         
         self.stats["total_cards_found"] += len(containers)
@@ -233,8 +211,7 @@ class VivaRealListingOnlyScraper:
                         cards.append(card)
                         self.stats["total_cards_parsed"] += 1
             except Exception as e:
-                self.stats["failure_reasons"]["parse_exception"] = \
-                    self.stats["failure_reasons"].get("parse_exception", 0) + 1
+                self.stats["failure_reasons"]["parse_exception"] += 1
                 logger.debug(f"Card parse error: {e}")
         
         return cards
@@ -542,48 +519,3 @@ class VivaRealListingOnlyScraper:
         if url.startswith("/"):
             return self.BASE_URL + url
         return self.BASE_URL + "/" + url
-    
-    # -------------------------
-    # Stats / Coverage
-    # -------------------------
-    def calculate_field_coverage(self, cards: List[Dict]) -> Dict[str, float]:
-        """Calculate field coverage percentages."""
-        if not cards:
-            return {}
-        
-        fields = [
-            "external_id", "url", "title", "price", "area_m2", 
-            "bedrooms", "bathrooms", "parking", "neighborhood", 
-            "city", "state", "main_image_url", "advertiser"
-        ]
-        
-        coverage = {}
-        for field in fields:
-            filled = sum(1 for c in cards if c.get(field) is not None)
-            coverage[field] = round(filled / len(cards) * 100, 1)
-        
-        self.stats["field_coverage"] = coverage
-        return coverage
-    
-    def get_stats(self) -> Dict[str, Any]:
-        """Get current statistics."""
-        success_rate = 0.0
-        if self.stats["total_cards_found"] > 0:
-            success_rate = self.stats["total_cards_parsed"] / self.stats["total_cards_found"] * 100
-        
-        return {
-            **self.stats,
-            "success_rate": round(success_rate, 1),
-        }
-    
-    def reset_stats(self):
-        """Reset statistics for new run."""
-        self.stats = {
-            "pages_attempted": 0,
-            "pages_ok": 0,
-            "pages_blocked": 0,
-            "total_cards_found": 0,
-            "total_cards_parsed": 0,
-            "field_coverage": {},
-            "failure_reasons": {},
-        }
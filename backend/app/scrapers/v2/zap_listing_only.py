@@ -17,11 +17,12 @@ from bs4 import BeautifulSoup
 from bs4.element import NavigableString
 
 from app.models.offer import OfferCard, Specs, Location
+from app.scrapers.base import BaseScraper
 
 logger = logging.getLogger(__name__)
 
 
-class ZapListingOnlyScraper:
+class ZapListingOnlyScraper(BaseScraper):
     """
     Zap Imóveis scraper for listing pages only (V2).
     No detail fetching, no published_at extraction.
@@ -39,6 +40,18 @@ class ZapListingOnlyScraper:
         "captcha",
         "cf-browser-verification",
     ]
+    # All block patterns in one case-insensitive pass (no lowercased copy of the page)
+    BLOCK_RE = re.compile("|".join(map(re.escape, BLOCK_PATTERNS)), re.IGNORECASE)
+    
+    # Valid app shell (Next.js/React page even if not fully rendered)
+    VALID_APP_INDICATORS = [
+        "__NEXT_DATA__",
+        "gtm.start",
+        "_next/static",
+        "zapimoveis.com.br",
+        "listing-card",
+        "listing-results",
+    ]
     
     # Success indicators
     SUCCESS_INDICATORS = [
@@ -47,17 +60,6 @@ class ZapListingOnlyScraper:
         "listing-card__container",
     ]
     
-    def __init__(self):
-        self.stats = {
-            "pages_attempted": 0,
-            "pages_ok": 0,
-            "pages_blocked": 0,
-            "total_cards_found": 0,
-            "total_cards_parsed": 0,
-            "field_coverage": {},
-            "failure_reasons": {},
-        }
-    
     # -------------------------
     # URL Building
     # -------------------------
@@ -110,35 +112,14 @@ class ZapListingOnlyScraper:
                 return False
         
         # Check for valid app shell (Next.js/React page)
-        valid_app_indicators = [
-            "__NEXT_DATA__",
-            "gtm.start",
-            "_next/static",
-            "zapimoveis.com.br",
-            "listing-card",
-            "listing-results",
-        ]
-        for indicator in valid_app_indicators:
+        for indicator in self.VALID_APP_INDICATORS:
             if indicator in html:
                 return False
         
-        # Check block patterns
-        html_lower = html.lower()
-        for pattern in self.BLOCK_PATTERNS:
-            if pattern.lower() in html_lower:
-                return True
-        
-        # Check title
-        try:
-            soup = BeautifulSoup(html, "html.parser")
-            title = soup.title.string.strip() if soup.title else ""
-            title_lower = title.lower()
-            if any(p in title_lower for p in ["just a moment", "access denied", "attention required"]):
-                return True
-        except:
-            pass
-        
-        return False
+        # Page is likely blocked - check block patterns.
+        # A block title ("Just a moment", ...) is also in the page body, so
+        # this single scan covers the title check as well.
+        return self.BLOCK_RE.search(html) is not None
     
     def content_has_cards(self, html: str) -> bool:
         """Check if HTML has card content to parse."""
@@ -177,8 +158,7 @@ class ZapListingOnlyScraper:
         published_at is ALWAYS None (V2 rule).
         """
         if not html:
-            self.stats["failure_reasons"]["empty_html"] = \
-                self.stats["failure_reasons"].get("empty_html", 0) + 1
+            self.stats["failure_reasons"]["empty_html"] += 1
             return []
         
         soup = BeautifulSoup(html, "html.parser")
@@ -195,11 +175,9 @@ class ZapListingOnlyScraper:
         
         if not containers:
             if self.is_blocked(html):
-                self.stats["failure_reasons"]["blocked_listing"] = \
-                    self.stats["failure_reasons"].get("blocked_listing", 0) + 1
+                self.stats["failure_reasons"]["blocked_listing"] += 1
             else:
-                self.stats["failure_reasons"]["no_cards_selector"] = \
-                    self.stats["failure_reasons"].get("no_cards_selector", 0) + 1
+                self.stats["failure_reasons"]["no_cards_selector"] += 1
             return []
         
         self.stats["total_cards_found"] += len(containers)
@@ -212,8 +190,7 @@ class ZapListingOnlyScraper:
                     cards.append(card)
                     self.stats["total_cards_parsed"] += 1
             except Exception as e:
-                self.stats["failure_reasons"]["parse_exception"] = \
-                    self.stats["failure_reasons"].get("parse_exception", 0) + 1
+                self.stats["failure_reasons"]["parse_exception"] += 1
                 logger.debug(f"Card parse error: {e}")
         
         return cards
@@ -489,48 +466,3 @@ class ZapListingOnlyScraper:
         if url.startswith("/"):
             return self.BASE_URL + url
         return self.BASE_URL + "/" + url
-    
-    # -------------------------
-    # Stats
-    # -------------------------
-    def calculate_field_coverage(self, cards: List[Dict]) -> Dict[str, float]:
-        """Calculate field coverage percentages."""
-        if not cards:
-            return {}
-        
-        fields = [
-            "external_id", "url", "title", "price", "area_m2", 
-            "bedrooms", "bathrooms", "parking", "neighborhood", 
-            "city", "state", "main_image_url", "advertiser"
-        ]
-        
-        coverage = {}
-        for field in fields:
-            filled = sum(1 for c in cards if c.get(field) is not None)
-            coverage[field] = round(filled / len(cards) * 100, 1)
-        
-        self.stats["field_coverage"] = coverage
-        return coverage
-    
-    def get_stats(self) -> Dict[str, Any]:
-        """Get current statistics."""
-        success_rate = 0.0
-        if self.stats["total_cards_found"] > 0:
-            success_rate = self.stats["total_cards_parsed"] / self.stats["total_cards_found"] * 100
-        
-        return {
-            **self.stats,
-            "success_rate": round(success_rate, 1),
-        }
-    
-    def reset_stats(self):
-        """Reset statistics for new run."""
-        self.stats = {
-            "pages_attempted": 0,
-            "pages_ok": 0,
-            "pages_blocked": 0,
-            "total_cards_found": 0,
-            "total_cards_parsed": 0,
-            "field_coverage": {},
-            "failure_reasons": {},
-        }
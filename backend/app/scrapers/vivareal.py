@@ -461,8 +461,9 @@ class VivaRealScraper(PortalScraper):
     # -------------------------
     # Detail extraction (MUDANÇA AQUI: SELETOR DE DATA SEGURO)
     # -------------------------
-    def extract_details(self, html: str) -> dict:
-        soup = BeautifulSoup(html or "", "html.parser")
+    def extract_details(self, html) -> dict:
+        # Accepts raw HTML or an already-parsed BeautifulSoup tree
+        soup = html if isinstance(html, BeautifulSoup) else BeautifulSoup(html or "", "html.parser")
         details: Dict[str, Any] = {}
         found_date, source_log = None, None
         found_price, found_area, found_bedrooms, found_bathrooms, found_parking = None, None, None, None, None
@@ -817,8 +817,9 @@ class ZapScraper(PortalScraper):
     # -------------------------
     # Detail extraction
     # -------------------------
-    def extract_details(self, html: str) -> dict:
-        soup = BeautifulSoup(html or "", "html.parser")
+    def extract_details(self, html) -> dict:
+        # Accepts raw HTML or an already-parsed BeautifulSoup tree
+        soup = html if isinstance(html, BeautifulSoup) else BeautifulSoup(html or "", "html.parser")
         details: Dict[str, Any] = {}
 
         found_date = None
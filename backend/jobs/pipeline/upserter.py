@@ -2,6 +2,8 @@ from datetime import datetime, timezone
 from typing import Dict, Any, Optional
 from app.core.config import settings
 from supabase import create_client, Client
+from postgrest.exceptions import APIError
+import httpx
 
 _supabase_client: Optional[Client] = None
 
@@ -108,6 +110,136 @@ def batch_upsert_listings(listings: list[Dict[str, Any]]) -> Dict[str, int]:
     return stats
 
 
+# external_ids per existence lookup: the ids travel in the GET query string,
+# and 500 SHA1-style ids push the request line past the usual 8 KB limit
+LOOKUP_BATCH_SIZE = 100
+
+
+def upsert_listings_bulk(listings: list[Dict[str, Any]], chunk_size: int = 500) -> Dict[str, int]:
+    """
+    Bulk UPSERT listings: a few lookups + one upsert round-trip per chunk
+    instead of two per listing.
+    Same rules as upsert_listing (first_seen_at preserved, price changes
+    tracked, None values never overwrite stored data).
+    Input dicts are not modified.
+    Returns counts of new, updated, price_changed and errors.
+    """
+    stats = {
+        "new": 0,
+        "updated": 0,
+        "price_changed": 0,
+        "errors": 0,
+    }
+    
+    # Postgres rejects an upsert that touches the same row twice -> keep last
+    unique: Dict[tuple, Dict[str, Any]] = {}
+    for listing in listings:
+        unique[(listing["portal"], listing["external_id"])] = listing
+    rows = list(unique.values())
+    
+    for start in range(0, len(rows), chunk_size):
+        chunk = rows[start:start + chunk_size]
+        try:
+            chunk_stats = _upsert_chunk(chunk)
+        except (APIError, httpx.HTTPError) as e:
+            # Only the existence lookup raises here: nothing was written yet
+            print(f"❌ Error bulk upserting {len(chunk)} listings: {e}")
+            stats["errors"] += len(chunk)
+            continue
+        for key, value in chunk_stats.items():
+            stats[key] += value
+    
+    return stats
+
+
+def _fetch_existing(supabase, chunk: list[Dict[str, Any]]) -> Dict[tuple, Dict[str, Any]]:
+    """Stored (portal, external_id) -> {price, first_seen_at}, looked up in LOOKUP_BATCH_SIZE slices."""
+    ids_by_portal: Dict[str, list] = {}
+    for listing in chunk:
+        ids_by_portal.setdefault(listing["portal"], []).append(listing["external_id"])
+    
+    existing: Dict[tuple, Dict[str, Any]] = {}
+    for portal, external_ids in ids_by_portal.items():
+        for start in range(0, len(external_ids), LOOKUP_BATCH_SIZE):
+            result = supabase.table("listings").select(
+                "external_id, price, first_seen_at"
+            ).eq(
+                "portal", portal
+            ).in_(
+                "external_id", external_ids[start:start + LOOKUP_BATCH_SIZE]
+            ).execute()
+            for record in result.data or []:
+                existing[(portal, record["external_id"])] = record
+    return existing
+
+
+def _upsert_chunk(chunk: list[Dict[str, Any]]) -> Dict[str, int]:
+    supabase = get_supabase()
+    now = datetime.now(timezone.utc).isoformat()
+    
+    existing = _fetch_existing(supabase, chunk)
+    
+    # PostgREST fills missing keys with NULL in a bulk payload, so rows are
+    # grouped by their (None-stripped) column set to keep upsert_listing's
+    # "don't overwrite with nulls" behaviour.
+    # Each member: (original listing, row to send, is_new, price_changed)
+    groups: Dict[frozenset, list] = {}
+    for listing in chunk:
+        row = dict(listing)
+        record = existing.get((row["portal"], row["external_id"]))
+        price_changed = False
+        if record:
+            row["first_seen_at"] = record["first_seen_at"]
+            old_price = record.get("price")
+            if old_price and row.get("price") and old_price != row["price"]:
+                row["previous_price"] = old_price
+                row["price_changed_at"] = now
+                price_changed = True
+        else:
+            row["first_seen_at"] = now
+        
+        row["last_seen_at"] = now
+        row["scraped_at"] = now
+        row["is_active"] = True
+        
+        clean_row = {k: v for k, v in row.items() if v is not None}
+        groups.setdefault(frozenset(clean_row), []).append(
+            (listing, clean_row, record is None, price_changed)
+        )
+    
+    stats = {"new": 0, "updated": 0, "price_changed": 0, "errors": 0}
+    
+    # Groups commit independently: a failure only affects its own rows
+    for members in groups.values():
+        try:
+            supabase.table("listings").upsert(
+                [clean_row for _, clean_row, _, _ in members],
+                on_conflict="portal,external_id"
+            ).execute()
+        except APIError as e:
+            if not str(e.code or "").startswith("23"):
+                print(f"❌ Error bulk upserting {len(members)} listings: {e}")
+                stats["errors"] += len(members)
+                continue
+            # Integrity violation (SQLSTATE class 23): isolate the bad rows
+            print(f"⚠️ Bulk upsert rejected ({e.code}), retrying {len(members)} listings one by one")
+            group_stats = batch_upsert_listings([dict(listing) for listing, _, _, _ in members])
+            for key, value in group_stats.items():
+                stats[key] += value
+            continue
+        except httpx.HTTPError as e:
+            print(f"❌ Error bulk upserting {len(members)} listings: {e}")
+            stats["errors"] += len(members)
+            continue
+        
+        for _, _, is_new, price_changed in members:
+            stats["new" if is_new else "updated"] += 1
+            if price_changed:
+                stats["price_changed"] += 1
+    
+    return stats
+
+
 def create_scrape_run(city: str, state: str, portals: list[str]) -> str:
     """Create a new scrape run record."""
     supabase = get_supabase()
@@ -15,18 +15,25 @@ Usage:
 """
 import asyncio
 import argparse
+import logging
+import queue
 import sys
 import os
 import random
 import re
+import shelve
 import time
+import unicodedata
 from datetime import datetime, timezone, timedelta
-from typing import List, Optional, Dict, Any, Tuple
+from functools import lru_cache
+from logging.handlers import QueueHandler, QueueListener
+from typing import List, Optional, Dict, Any, Set, Tuple
 from bs4 import BeautifulSoup
 
 # curl_cffi for TLS fingerprint bypass
 from curl_cffi import requests as cur_requests
-from curl_cffi.requests import Session as CurlSession
+from curl_cffi import CurlHttpVersion, CurlOpt
+from curl_cffi.requests import AsyncSession
 
 # Add parent directory to path for imports
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -40,7 +47,7 @@ from jobs.config import (
 )
 from jobs.pipeline.normalizer import normalize_listing, extract_badges_from_text
 from jobs.pipeline.upserter import (
-    upsert_listing, create_scrape_run, finish_scrape_run, log_scrape
+    upsert_listings_bulk, create_scrape_run, finish_scrape_run, log_scrape
 )
 from jobs.pipeline.lifecycle import apply_lifecycle
 
@@ -49,6 +56,8 @@ from app.scrapers.zap import ZapScraper
 from app.scrapers.imovelweb import ImovelwebScraper
 from app.scrapers.stealth import StealthFetcher
 
+logger = logging.getLogger("scan_campinas")
+
 SCRAPERS = {
     "vivareal": VivaRealScraper,
     "zap": ZapScraper,
@@ -70,6 +79,28 @@ PAGE_PAUSE_RANGE = (5, 10)        # Seconds between pages
 # Session management
 ROTATE_SESSION_AFTER_FAILURES = 5  # Rotate session after N consecutive empty_html
 ROTATE_SESSION_AFTER_REQUESTS = 100  # Rotate session after N requests
+RETIRED_SESSION_POOL = 2           # Old sessions kept open for in-flight requests
+
+# Keep DNS answers and TLS session IDs warm on every curl handle
+CURL_OPTIONS = {
+    CurlOpt.DNS_CACHE_TIMEOUT: 600,
+    CurlOpt.SSL_SESSIONID_CACHE: 1,
+}
+
+# Detail concurrency: parallel detail fetches multiplexed over one HTTP/2
+# connection (each slot still honours the adaptive jitter; 1 = sequential)
+DETAIL_CONCURRENCY = 8
+
+# Detail body streaming: once this many bytes are in and the date marker
+# has been seen, the rest of the page is not downloaded
+DETAIL_STREAM_CAP_BYTES = 200_000
+
+# Detail dates already extracted are reused across consecutive runs
+DETAIL_DATE_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache")
+DETAIL_DATE_CACHE_TTL_HOURS = 24
+
+# DB writes: listings per bulk upsert round-trip
+UPSERT_BATCH_SIZE = 500
 
 # Retry configuration
 MAX_RETRIES_PER_DETAIL = 3        # Max retries for a single detail
@@ -91,6 +122,34 @@ USER_AGENTS = [
 ]
 
 
+# Precompiled patterns (hot path: run once per card / per page)
+_PUB_RE = re.compile(r'Publicado\s+há\s*(\d+)\s*(minuto|hora|dia|semana|m[êe]s|ano)', re.I)
+_DATE_FALLBACK_RE = re.compile(r"(Publicado há|Atualizado há)", re.I)
+_PAGINA_RE = re.compile(r'pagina=\d+')
+_PUB_MARKER_RE = re.compile(r"(Publicado|Atualizado)\s+há".encode("utf-8"), re.I)
+
+# Relative-date unit -> days (keys match the _PUB_RE unit group, lowercased)
+_UNIT_DAYS = {
+    'minuto': 0, 'hora': 0,
+    'dia': 1, 'semana': 7,
+    'mês': 30, 'mes': 30,
+    'ano': 365,
+}
+
+
+def _norm(txt: Optional[str]) -> str:
+    """Accent-fold + lowercase for city comparisons."""
+    if not txt:
+        return ""
+    return unicodedata.normalize('NFKD', txt).encode('ascii', 'ignore').decode('utf-8').lower().strip()
+
+
+@lru_cache(maxsize=4096)
+def _iso(dt: datetime) -> str:
+    """ISO string for a timestamp; detail dates repeat a lot (page 'now' minus N days)."""
+    return dt.isoformat()
+
+
 def _sleep_range(rng):
     return asyncio.sleep(random.uniform(rng[0], rng[1]))
 
@@ -104,9 +163,16 @@ class ResilientDetailFetcher:
     Designed for long scraping sessions (100+ pages).
     """
     
-    def __init__(self, impersonate: str = "chrome120"):
+    def __init__(self, impersonate: str = "chrome120", concurrency: int = DETAIL_CONCURRENCY):
         self.impersonate = impersonate
-        self.session: Optional[CurlSession] = None
+        # Single HTTP/2 AsyncSession: concurrent detail/listing requests
+        # share one multiplexed connection per host.
+        self.session: Optional[AsyncSession] = None
+        self._retired_sessions: List[AsyncSession] = []
+        # Strong refs to in-flight close() tasks (asyncio only keeps weak ones)
+        self._closing_tasks: Set[asyncio.Task] = set()
+        self._detail_slots = asyncio.Semaphore(max(1, concurrency))
+        self.concurrency = max(1, concurrency)
         self.current_user_agent = random.choice(USER_AGENTS)
         
         # Stats
@@ -124,28 +190,60 @@ class ResilientDetailFetcher:
         
         self._ensure_session()
     
-    def _ensure_session(self):
-        """Create or rotate session."""
-        if self.session:
-            try:
-                self.session.close()
-            except:
-                pass
+    def _ensure_session(self, keep_connection: bool = False):
+        """
+        Create or rotate session.
+        keep_connection=True (precautionary rotation) only refreshes the
+        User-Agent/headers, so the warm connection, DNS and TLS session survive.
+        """
+        if not (keep_connection and self.session):
+            self._retire_session()
         
         self.current_user_agent = random.choice(USER_AGENTS)
-        self.session = CurlSession(impersonate=self.impersonate)
+        # Headers that stay fixed for the life of the session
+        self._base_headers = {
+            "Accept-Language": "pt-BR,pt;q=0.9,en-US;q=0.8,en;q=0.7",
+            "User-Agent": self.current_user_agent,
+            "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8",
+            "Sec-Fetch-Dest": "document",
+            "Sec-Fetch-Mode": "navigate",
+            "Sec-Fetch-User": "?1",
+        }
+        if self.session is None:
+            self.session = AsyncSession(
+                impersonate=self.impersonate,
+                http_version=CurlHttpVersion.V2_0,
+                max_clients=self.concurrency,
+                curl_options=CURL_OPTIONS,
+            )
         self.session_rotations += 1
-        print(f"   🔄 Nova sessão #{self.session_rotations} | UA: ...{self.current_user_agent[-30:]}")
+        logger.info("   🔄 Nova sessão #%d | UA: ...%s", self.session_rotations, self.current_user_agent[-30:])
+    
+    def _retire_session(self):
+        """
+        Move the current session to the retired pool. In-flight requests may
+        still be using it, so only sessions beyond RETIRED_SESSION_POOL are closed.
+        """
+        if not self.session:
+            return
+        self._retired_sessions.append(self.session)
+        self.session = None
+        while len(self._retired_sessions) > RETIRED_SESSION_POOL:
+            old = self._retired_sessions.pop(0)
+            task = asyncio.ensure_future(old.close())
+            self._closing_tasks.add(task)
+            task.add_done_callback(self._closing_tasks.discard)
     
     def _maybe_rotate_session(self):
         """Rotate session if needed based on failures or request count."""
+        failing = self.consecutive_failures >= ROTATE_SESSION_AFTER_FAILURES
         should_rotate = (
-            self.consecutive_failures >= ROTATE_SESSION_AFTER_FAILURES or
+            failing or
             self.request_count > 0 and self.request_count % ROTATE_SESSION_AFTER_REQUESTS == 0
         )
         if should_rotate:
-            print(f"   ⚠️ Rotacionando sessão (failures={self.consecutive_failures}, requests={self.request_count})")
-            self._ensure_session()
+            logger.info("   ⚠️ Rotacionando sessão (failures=%d, requests=%d)", self.consecutive_failures, self.request_count)
+            self._ensure_session(keep_connection=not failing)
             self.consecutive_failures = 0
             # Reset jitter after rotation
             self.current_jitter = BASE_DETAIL_JITTER
@@ -167,26 +265,24 @@ class ResilientDetailFetcher:
                 new_max = min(MAX_DETAIL_JITTER[1], self.current_jitter[1] * 1.5)
                 self.current_jitter = (new_min, new_max)
                 self.rate_limited = True
-                print(f"   ⚡ Rate limit detectado! Jitter aumentado para {self.current_jitter[0]:.1f}-{self.current_jitter[1]:.1f}s")
+                logger.warning("   ⚡ Rate limit detectado! Jitter aumentado para %.1f-%.1fs", *self.current_jitter)
     
     def _get_headers(self, referer: str = None, site_type: str = "same-origin") -> Dict[str, str]:
-        """Get headers with current User-Agent."""
-        return {
-            "Referer": referer or "",
-            "Accept-Language": "pt-BR,pt;q=0.9,en-US;q=0.8,en;q=0.7",
-            "User-Agent": self.current_user_agent,
-            "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8",
-            "Sec-Fetch-Dest": "document",
-            "Sec-Fetch-Mode": "navigate",
-            "Sec-Fetch-Site": site_type,
-            "Sec-Fetch-User": "?1",
-        }
+        """Get headers with current User-Agent (per-session base + per-request fields)."""
+        headers = self._base_headers.copy()
+        headers["Referer"] = referer or ""
+        headers["Sec-Fetch-Site"] = site_type
+        return headers
     
     async def fetch_with_retry(self, url: str, referer: str, max_retries: int = MAX_RETRIES_PER_DETAIL) -> Tuple[str, str]:
         """
         Fetch with automatic retry and exponential backoff.
         Returns: (html, status) where status is 'ok', 'empty', 'blocked', 'error'
         """
+        async with self._detail_slots:
+            return await self._fetch_with_retry(url, referer, max_retries)
+    
+    async def _fetch_with_retry(self, url: str, referer: str, max_retries: int) -> Tuple[str, str]:
         for attempt in range(max_retries):
             self._maybe_rotate_session()
             
@@ -197,24 +293,29 @@ class ResilientDetailFetcher:
                 jitter *= (RETRY_BACKOFF_BASE ** attempt)
             
             if attempt > 0:
-                print(f"      ↻ Retry {attempt+1}/{max_retries} após {jitter:.1f}s...")
+                logger.debug("      ↻ Retry %d/%d após %.1fs...", attempt + 1, max_retries, jitter)
             
             await asyncio.sleep(jitter)
             
             try:
-                resp = self.session.get(
+                resp = await self.session.get(
                     url,
                     headers=self._get_headers(referer),
-                    timeout=25
+                    timeout=25,
+                    stream=True
                 )
+                try:
+                    text = await self._read_detail_body(resp) if resp.status_code == 200 else ""
+                finally:
+                    await resp.aclose()
                 self.request_count += 1
                 
-                if resp.status_code == 200 and resp.text and len(resp.text) > 5000:
+                if text and len(text) > 5000:
                     self.success_count += 1
                     self.consecutive_failures = 0
                     self._adapt_jitter(success=True)
                     self.last_referer = url
-                    return resp.text, "ok"
+                    return text, "ok"
                 elif resp.status_code == 403:
                     self.block_count += 1
                     self.consecutive_failures += 1
@@ -236,11 +337,28 @@ class ResilientDetailFetcher:
         
         return "", "empty" if self.consecutive_failures > 0 else "blocked"
     
-    def fetch_listing(self, url: str, referer: str = None) -> str:
-        """Fetch listing page with curl_cffi."""
+    async def _read_detail_body(self, resp) -> str:
+        """
+        Stream a detail body, stopping early on large pages once the
+        publication date marker has been received.
+        """
+        buf = bytearray()
+        marker_seen = False
+        async for chunk in resp.aiter_content():
+            # Overlap with the previous chunk so a split marker still matches
+            tail_start = max(0, len(buf) - 32)
+            buf += chunk
+            if not marker_seen:
+                marker_seen = _PUB_MARKER_RE.search(buf, tail_start) is not None
+            if marker_seen and len(buf) >= DETAIL_STREAM_CAP_BYTES:
+                break
+        return buf.decode(resp.encoding or "utf-8", errors="replace")
+    
+    async def fetch_listing_async(self, url: str, referer: str = None) -> str:
+        """Fetch listing page with curl_cffi (native async, no worker thread)."""
         try:
             sec_fetch_site = "same-origin" if referer else "none"
-            resp = self.session.get(
+            resp = await self.session.get(
                 url,
                 headers=self._get_headers(referer, sec_fetch_site),
                 timeout=30
@@ -252,7 +370,7 @@ class ResilientDetailFetcher:
                 return resp.text
             return ""
         except Exception as e:
-            print(f"   ⚡ curl_cffi listing error: {e}")
+            logger.warning("   ⚡ curl_cffi listing error: %s", e)
             return ""
     
     def get_stats(self) -> Dict[str, Any]:
@@ -266,32 +384,36 @@ class ResilientDetailFetcher:
             "current_jitter": self.current_jitter,
         }
     
-    def close(self):
+    async def close(self):
         if self.session:
+            self._retired_sessions.append(self.session)
+            self.session = None
+        for session in self._retired_sessions:
             try:
-                self.session.close()
+                await session.close()
             except:
                 pass
-            self.session = None
+        self._retired_sessions.clear()
+        if self._closing_tasks:
+            await asyncio.gather(*self._closing_tasks, return_exceptions=True)
+            self._closing_tasks.clear()
 
 
 # -------------------------
 # Date extraction
 # -------------------------
-def extract_date_from_detail(html: str) -> Optional[str]:
-    """Extract publication date from detail page."""
-    if not html:
+def extract_date_from_tree(soup: BeautifulSoup) -> Optional[str]:
+    """Extract publication date from an already-parsed detail page."""
+    if soup is None:
         return None
     
-    soup = BeautifulSoup(html, "html.parser")
-    
     # Primary selector
     date_el = soup.find("p", class_="text-neutral-110 text-1-5 font-secondary")
     if date_el:
         return date_el.get_text(strip=True)
     
     # Fallback: regex
-    fallback = soup.find(string=re.compile(r"(Publicado há|Atualizado há)", re.I))
+    fallback = soup.find(string=_DATE_FALLBACK_RE)
     if fallback:
         parent = fallback.find_parent()
         if parent:
@@ -300,31 +422,37 @@ def extract_date_from_detail(html: str) -> Optional[str]:
     return None
 
 
-def parse_relative_date(text: str) -> Optional[datetime]:
-    """Parse relative date text to datetime."""
+def parse_relative_date(text: str, now: Optional[datetime] = None) -> Optional[datetime]:
+    """Parse relative date text to datetime (``now`` may be cached per page)."""
     if not text:
         return None
     
-    pub_match = re.search(r'Publicado\s+há\s*(\d+)\s*(minuto|hora|dia|semana|m[êe]s|ano)', text, re.I)
+    pub_match = _PUB_RE.search(text)
     if pub_match:
-        val = int(pub_match.group(1))
-        unit = pub_match.group(2).lower()
-        
-        multipliers = {
-            'minuto': 0, 'hora': 0,
-            'dia': 1, 'semana': 7,
-            'mês': 30, 'mes': 30,
-            'ano': 365
-        }
-        
-        for key, mult in multipliers.items():
-            if key in unit:
-                days = val * mult if mult > 0 else 0
-                return datetime.now(timezone.utc) - timedelta(days=days)
+        days = _UNIT_DAYS.get(pub_match.group(2).lower())
+        if days is not None:
+            if now is None:
+                now = datetime.now(timezone.utc)
+            return now - timedelta(days=int(pub_match.group(1)) * days)
     
     return None
 
 
+def parse_detail_page(scraper, detail_html: str, page_now: datetime) -> Tuple[Optional[str], Optional[datetime], dict]:
+    """
+    CPU-bound part of a detail page: parse once, the same tree feeds the
+    date and the scraper's detail extraction. Safe to run via asyncio.to_thread.
+    """
+    tree = BeautifulSoup(detail_html, "html.parser")
+    date_text = extract_date_from_tree(tree)
+    parsed_dt = parse_relative_date(date_text, now=page_now) if date_text else None
+    try:
+        details = scraper.extract_details(tree) or {}
+    except Exception:
+        details = {}
+    return date_text, parsed_dt, details
+
+
 def build_paginated_url(base_url: str, page: int) -> str:
     """Build paginated URL."""
     if page <= 1:
@@ -332,7 +460,7 @@ def build_paginated_url(base_url: str, page: int) -> str:
     
     if "?" in base_url:
         if "pagina=" in base_url:
-            return re.sub(r'pagina=\d+', f'pagina={page}', base_url)
+            return _PAGINA_RE.sub(f'pagina={page}', base_url)
         else:
             return f"{base_url}&pagina={page}"
     else:
@@ -352,7 +480,7 @@ async def collect_cards_from_portal(
     """
     scraper_class = SCRAPERS.get(portal)
     if not scraper_class:
-        print(f"❌ Portal desconhecido: {portal}")
+        logger.error("❌ Portal desconhecido: %s", portal)
         return [], {"status": "unknown_portal"}
 
     scraper = scraper_class()
@@ -366,8 +494,8 @@ async def collect_cards_from_portal(
         "recency_days": 365,
     }
 
-    print(f"\n🔍 [{portal.upper()}] Iniciando varredura RESILIENTE de {city.title()}...")
-    print(f"   📊 Configuração: {max_pages} páginas, batch de {PAGES_PER_BATCH}")
+    logger.info("🔍 [%s] Iniciando varredura RESILIENTE de %s...", portal.upper(), city.title())
+    logger.info("   📊 Configuração: %d páginas, batch de %d", max_pages, PAGES_PER_BATCH)
 
     status_meta = {
         "status": "ok",
@@ -381,89 +509,154 @@ async def collect_cards_from_portal(
 
     # RESILIENT FETCHER
     detail_fetcher = ResilientDetailFetcher(impersonate="chrome120")
+
+    # Detail dedup: per run (cards repeat across pages) and across runs
+    # (external_id -> (published_at iso, cached_at epoch) on disk).
+    # seen_ids only holds ids whose date source was settled (listing JSON,
+    # cache or a successful detail fetch), so a failed fetch is retried
+    # when the card shows up again; the bulk upsert keeps the last row.
+    seen_ids: set = set()
+    os.makedirs(DETAIL_DATE_CACHE_DIR, exist_ok=True)
+    date_cache = shelve.open(os.path.join(DETAIL_DATE_CACHE_DIR, f"detail_dates_{portal}"))
+    cache_cutoff = time.time() - DETAIL_DATE_CACHE_TTL_HOURS * 3600
+
+    async def fill_from_detail(card_dict: dict, label: str, listing_url: str, page_now: datetime):
+        """Fetch one detail page and fill date/advertiser fields in place."""
+        detail_html, fetch_status = await detail_fetcher.fetch_with_retry(
+            card_dict["url"],
+            listing_url
+        )
+        
+        status_meta["detail_fetched_count"] += 1
+        
+        if fetch_status == "ok":
+            if card_dict["external_id"]:
+                seen_ids.add(card_dict["external_id"])
+            # Parsing runs in a worker thread so the other in-flight
+            # detail requests keep progressing on the event loop
+            date_text, parsed_dt, details = await asyncio.to_thread(
+                parse_detail_page, scraper, detail_html, page_now
+            )
+            if date_text:
+                card_dict["date_text"] = date_text
+                if parsed_dt:
+                    card_dict["published_at"] = _iso(parsed_dt)
+                    card_dict["published_at_source"] = "detail_extracted"
+                    status_meta["dates_extracted"] += 1
+                    if card_dict["external_id"]:
+                        date_cache[card_dict["external_id"]] = (card_dict["published_at"], time.time())
+                    logger.debug("   %s ✅ %.30s", label, date_text)
+                else:
+                    card_dict["published_at_source"] = "detail_text_unparsed"
+                    status_meta["dates_missing"] += 1
+                    logger.debug("   %s ⚠️ unparsed: %.30s", label, date_text)
+            else:
+                card_dict["published_at_source"] = "detail_not_found"
+                status_meta["dates_missing"] += 1
+                logger.debug("   %s ❌ date not found", label)
+            
+            # Also extract other details
+            if details.get("advertiser") and not card_dict.get("agency_name"):
+                card_dict["agency_name"] = details["advertiser"]
+        else:
+            card_dict["published_at_source"] = f"fetch_{fetch_status}"
+            status_meta["dates_missing"] += 1
+            logger.debug("   %s ❌ %s", label, fetch_status)
     
-    start_time = time.time()
+    async def load_listing(page: int, url: str, previous_page_url: Optional[str]) -> Tuple[Optional[str], bool]:
+        """Fetch one listing page: Playwright with retries, curl_cffi fallback."""
+        html = None
+        page_blocked = False
+
+        # Try Playwright first, then curl_cffi fallback
+        for attempt in range(MAX_RETRIES_LISTING):
+            try:
+                meta = await fetcher.fetch(
+                    url, 
+                    return_meta=True, 
+                    run_id=run_id, 
+                    scenario="job", 
+                    request_type="list", 
+                    page_num=page
+                )
+                html = meta.get("html", "") if isinstance(meta, dict) else meta
+
+                if not html:
+                    logger.warning("   ⚠️ Tentativa %d: HTML vazio", attempt + 1)
+                    await asyncio.sleep(3 + (2 ** attempt))
+                    continue
+
+                if scraper.is_blocked(html):
+                    logger.warning("   🛡️ Tentativa %d: Bloqueio Playwright", attempt + 1)
+                    page_blocked = True
+                    await asyncio.sleep(5 + (2 ** attempt))
+                    continue
+
+                page_blocked = False
+                break
+
+            except Exception as e:
+                logger.warning("   ❌ Tentativa %d: Erro: %s", attempt + 1, e)
+                await asyncio.sleep(2 ** attempt)
+
+        # FALLBACK: curl_cffi for listing
+        if (page_blocked or not html) and page > 1:
+            logger.info("   🔄 Fallback→curl_cffi para listagem...")
+            await asyncio.sleep(random.uniform(5.0, 10.0))
+            
+            try:
+                html = await detail_fetcher.fetch_listing_async(
+                    url,
+                    previous_page_url
+                )
+                
+                if html and not scraper.is_blocked(html):
+                    logger.info("   ✅ curl_cffi listing OK (%dKB)", len(html) // 1000)
+                    page_blocked = False
+                else:
+                    logger.warning("   ❌ curl_cffi listing também bloqueado")
+                    page_blocked = True
+            except Exception as e:
+                logger.warning("   ❌ curl_cffi error: %s", e)
+                page_blocked = True
+
+        return html, page_blocked
+
+    start_time = time.monotonic()
+    # (page, task) for the listing fetched ahead while details are in flight
+    next_listing: Optional[Tuple[int, asyncio.Task]] = None
     
     try:
         for page in range(1, max_pages + 1):
             # Batch pause
             if page > 1 and (page - 1) % PAGES_PER_BATCH == 0:
                 pause = random.uniform(*BATCH_PAUSE_RANGE)
-                print(f"\n⏸️  Pausa de batch ({PAGES_PER_BATCH} páginas): {pause:.0f}s...")
+                logger.info("⏸️  Pausa de batch (%d páginas): %.0fs...", PAGES_PER_BATCH, pause)
                 await asyncio.sleep(pause)
-                print(f"▶️  Retomando...")
+                logger.info("▶️  Retomando...")
             
             # Check for abort
             if consecutive_listing_blocks >= LISTING_BLOCK_ABORT_PAGES:
-                print(f"⛔ Abortando após {consecutive_listing_blocks} bloqueios de listagem")
+                logger.error("⛔ Abortando após %d bloqueios de listagem", consecutive_listing_blocks)
                 status_meta["status"] = "blocked_abort"
                 break
 
             base_url = scraper.build_url(city=city, state=state, filters=filters, page=1)
             url = build_paginated_url(base_url, page)
             
-            elapsed = time.time() - start_time
-            print(f"\n📄 [{portal.upper()}] Página {page}/{max_pages} [{elapsed/60:.1f}min]: {url[:60]}...")
-
-            html = None
-            page_blocked = False
-            previous_page_url = detail_fetcher.last_referer
-
-            # Try Playwright first, then curl_cffi fallback
-            for attempt in range(MAX_RETRIES_LISTING):
-                try:
-                    meta = await fetcher.fetch(
-                        url, 
-                        return_meta=True, 
-                        run_id=run_id, 
-                        scenario="job", 
-                        request_type="list", 
-                        page_num=page
-                    )
-                    html = meta.get("html", "") if isinstance(meta, dict) else meta
-
-                    if not html:
-                        print(f"   ⚠️ Tentativa {attempt+1}: HTML vazio")
-                        await asyncio.sleep(3 + (2 ** attempt))
-                        continue
-
-                    if scraper.is_blocked(html):
-                        print(f"   🛡️ Tentativa {attempt+1}: Bloqueio Playwright")
-                        page_blocked = True
-                        await asyncio.sleep(5 + (2 ** attempt))
-                        continue
+            elapsed = time.monotonic() - start_time
+            page_now = datetime.now(timezone.utc)
+            logger.info("📄 [%s] Página %d/%d [%.1fmin]: %.60s...", portal.upper(), page, max_pages, elapsed / 60, url)
 
-                    page_blocked = False
-                    break
-
-                except Exception as e:
-                    print(f"   ❌ Tentativa {attempt+1}: Erro: {e}")
-                    await asyncio.sleep(2 ** attempt)
-
-            # FALLBACK: curl_cffi for listing
-            if (page_blocked or not html) and page > 1:
-                print(f"   🔄 Fallback→curl_cffi para listagem...")
-                await asyncio.sleep(random.uniform(5.0, 10.0))
-                
-                try:
-                    html = await asyncio.to_thread(
-                        detail_fetcher.fetch_listing,
-                        url,
-                        previous_page_url
-                    )
-                    
-                    if html and not scraper.is_blocked(html):
-                        print(f"   ✅ curl_cffi listing OK ({len(html)//1000}KB)")
-                        page_blocked = False
-                    else:
-                        print(f"   ❌ curl_cffi listing também bloqueado")
-                        page_blocked = True
-                except Exception as e:
-                    print(f"   ❌ curl_cffi error: {e}")
-                    page_blocked = True
+            # Use the prefetched listing when it is for this page
+            if next_listing and next_listing[0] == page:
+                html, page_blocked = await next_listing[1]
+            else:
+                html, page_blocked = await load_listing(page, url, detail_fetcher.last_referer)
+            next_listing = None
 
             if page_blocked or not html:
-                print(f"🚫 Falha na página {page}")
+                logger.warning("🚫 Falha na página %d", page)
                 consecutive_listing_blocks += 1
                 if page == 1:
                     status_meta["status"] = "blocked_initial"
@@ -475,106 +668,101 @@ async def collect_cards_from_portal(
             # Parse cards
             try:
                 scraper.last_search_url = url
-                cards = scraper.parse_cards(html, recency_days=365)
+                cards = await asyncio.to_thread(scraper.parse_cards, html, 365)
             except Exception as e:
-                print(f"⚠️ Erro ao parsear página {page}: {e}")
+                logger.warning("⚠️ Erro ao parsear página %d: %s", page, e)
                 continue
 
             status_meta["pages_scanned"] += 1
 
             if not cards:
-                print(f"⚠️ Página {page}: Nenhum card")
+                logger.warning("⚠️ Página %d: Nenhum card", page)
                 continue
 
-            print(f"✅ Página {page}: {len(cards)} cards | Jitter: {detail_fetcher.current_jitter[0]:.1f}-{detail_fetcher.current_jitter[1]:.1f}s")
+            logger.info("✅ Página %d: %d cards | Jitter: %.1f-%.1fs", page, len(cards), *detail_fetcher.current_jitter)
 
             # Update max_pages
             if page == 1:
                 total_pages = scraper.extract_total_pages(html)
                 if total_pages and total_pages < max_pages:
                     max_pages = total_pages
-                    print(f"📊 Total disponível: {total_pages} páginas")
+                    logger.info("📊 Total disponível: %d páginas", total_pages)
+
+            # Prefetch the next listing page so it overlaps with detail fetching
+            # (not across a batch boundary: that pause is intentional)
+            if page < max_pages and page % PAGES_PER_BATCH != 0:
+                next_url = build_paginated_url(base_url, page + 1)
+                next_listing = (page + 1, asyncio.create_task(load_listing(page + 1, next_url, url)))
 
             # CARD PROCESSING
+            target_city_norm = _norm(city)
+            page_cards = []
+            detail_jobs = []
+            # ids already queued for a detail fetch on this page
+            queued_ids: set = set()
             for i, card in enumerate(cards, 1):
+                specs = card.specs
+                loc = card.location
+                loc_city = loc.city if loc else None
+
                 # City filter
-                if card.location and card.location.city:
-                    import unicodedata
-                    def norm(txt):
-                        if not txt: return ""
-                        t = unicodedata.normalize('NFKD', txt).encode('ascii', 'ignore').decode('utf-8')
-                        return t.lower().strip()
-                    
-                    if norm(card.location.city) and norm(card.location.city) != norm(city):
+                if loc_city:
+                    card_city_norm = _norm(loc_city)
+                    if card_city_norm and card_city_norm != target_city_norm:
                         continue
 
+                # Cards without an id are never deduplicated against each other
+                if card.external_id and (card.external_id in seen_ids or card.external_id in queued_ids):
+                    continue
+
+                published_at = card.published_at
                 card_dict = {
                     "portal": portal,
                     "external_id": card.external_id,
                     "url": card.url,
                     "title": card.title,
                     "price": card.price,
-                    "area_m2": card.specs.area if card.specs else None,
-                    "bedrooms": card.specs.bedrooms if card.specs else None,
-                    "bathrooms": card.specs.bathrooms if card.specs else None,
-                    "parking": card.specs.parking if card.specs else None,
-                    "neighborhood": card.location.neighborhood if card.location else None,
-                    "city": card.location.city if (card.location and card.location.city) else city,
-                    "state": card.location.state if (card.location and card.location.state) else state,
+                    "area_m2": specs.area if specs else None,
+                    "bedrooms": specs.bedrooms if specs else None,
+                    "bathrooms": specs.bathrooms if specs else None,
+                    "parking": specs.parking if specs else None,
+                    "neighborhood": loc.neighborhood if loc else None,
+                    "city": loc_city or city,
+                    "state": (loc.state if loc else None) or state,
                     "main_image_url": card.main_image_url,
                     "agency_name": card.agency_name,
                     "published_days_ago": card.published_days_ago,
-                    "published_at": card.published_at.isoformat() if card.published_at else None,
+                    "published_at": _iso(published_at) if published_at else None,
                     "published_at_source": None,
                 }
 
                 # Check if date already in listing
+                cached = date_cache.get(card.external_id) if card.external_id else None
                 if card_dict.get("published_at"):
                     card_dict["published_at_source"] = "listing_json"
                     status_meta["dates_extracted"] += 1
-                else:
-                    # FETCH DETAIL with retry
-                    if card.url:
-                        print(f"   [{i}/{len(cards)}]", end=" ", flush=True)
-                        
-                        detail_html, fetch_status = await detail_fetcher.fetch_with_retry(
-                            card.url,
-                            url
-                        )
-                        
-                        status_meta["detail_fetched_count"] += 1
-                        
-                        if fetch_status == "ok":
-                            date_text = extract_date_from_detail(detail_html)
-                            if date_text:
-                                card_dict["date_text"] = date_text
-                                parsed_dt = parse_relative_date(date_text)
-                                if parsed_dt:
-                                    card_dict["published_at"] = parsed_dt.isoformat()
-                                    card_dict["published_at_source"] = "detail_extracted"
-                                    status_meta["dates_extracted"] += 1
-                                    print(f"✅ {date_text[:30]}")
-                                else:
-                                    card_dict["published_at_source"] = "detail_text_unparsed"
-                                    status_meta["dates_missing"] += 1
-                                    print(f"⚠️ unparsed: {date_text[:30]}")
-                            else:
-                                card_dict["published_at_source"] = "detail_not_found"
-                                status_meta["dates_missing"] += 1
-                                print(f"❌ date not found")
-                            
-                            # Also extract other details
-                            try:
-                                details = scraper.extract_details(detail_html) or {}
-                                if details.get("advertiser") and not card_dict.get("agency_name"):
-                                    card_dict["agency_name"] = details["advertiser"]
-                            except:
-                                pass
-                        else:
-                            card_dict["published_at_source"] = f"fetch_{fetch_status}"
-                            status_meta["dates_missing"] += 1
-                            print(f"❌ {fetch_status}")
+                    if card.external_id:
+                        seen_ids.add(card.external_id)
+                elif cached and cached[1] >= cache_cutoff:
+                    card_dict["published_at"] = cached[0]
+                    card_dict["published_at_source"] = "detail_cached"
+                    status_meta["dates_extracted"] += 1
+                    if card.external_id:
+                        seen_ids.add(card.external_id)
+                elif card.url:
+                    # FETCH DETAIL with retry (runs concurrently, bounded by the fetcher)
+                    if card.external_id:
+                        queued_ids.add(card.external_id)
+                    detail_jobs.append(
+                        fill_from_detail(card_dict, f"[{i}/{len(cards)}]", url, page_now)
+                    )
+
+                page_cards.append(card_dict)
 
+            if detail_jobs:
+                await asyncio.gather(*detail_jobs)
+
+            for card_dict in page_cards:
                 if not card_dict.get("published_at"):
                     if not card_dict.get("published_at_source"):
                         card_dict["published_at_source"] = "unavailable"
@@ -588,21 +776,24 @@ async def collect_cards_from_portal(
             if page % 10 == 0:
                 stats = detail_fetcher.get_stats()
                 success_rate = (status_meta["dates_extracted"] / max(1, status_meta["dates_extracted"] + status_meta["dates_missing"])) * 100
-                print(f"\n📈 [STATS] Pág {page}: {len(all_cards)} cards | {success_rate:.0f}% datas | Sessions: {stats['sessions']} | Jitter: {stats['current_jitter']}")
+                logger.info("📈 [STATS] Pág %d: %d cards | %.0f%% datas | Sessions: %d | Jitter: %s", page, len(all_cards), success_rate, stats["sessions"], stats["current_jitter"])
 
     finally:
+        if next_listing and not next_listing[1].done():
+            next_listing[1].cancel()
         stats = detail_fetcher.get_stats()
-        detail_fetcher.close()
+        await detail_fetcher.close()
+        date_cache.close()
 
-    elapsed_total = time.time() - start_time
+    elapsed_total = time.monotonic() - start_time
     success_rate = (status_meta["dates_extracted"] / max(1, status_meta["dates_extracted"] + status_meta["dates_missing"])) * 100
     
-    print(f"\n📊 [{portal.upper()}] RESUMO FINAL")
-    print(f"   ⏱️  Tempo: {elapsed_total/60:.1f} min")
-    print(f"   📦 Cards: {len(all_cards)}")
-    print(f"   📅 Datas: {status_meta['dates_extracted']}/{status_meta['dates_extracted']+status_meta['dates_missing']} ({success_rate:.0f}%)")
-    print(f"   🔄 Sessões: {stats['sessions']}")
-    print(f"   📡 Requests: {stats['requests']} ({stats['success']} OK, {stats['empty']} empty, {stats['blocks']} blocked)")
+    logger.info("📊 [%s] RESUMO FINAL", portal.upper())
+    logger.info("   ⏱️  Tempo: %.1f min", elapsed_total / 60)
+    logger.info("   📦 Cards: %d", len(all_cards))
+    logger.info("   📅 Datas: %d/%d (%.0f%%)", status_meta["dates_extracted"], status_meta["dates_extracted"] + status_meta["dates_missing"], success_rate)
+    logger.info("   🔄 Sessões: %d", stats["sessions"])
+    logger.info("   📡 Requests: %d (%d OK, %d empty, %d blocked)", stats["requests"], stats["success"], stats["empty"], stats["blocks"])
     
     return all_cards, status_meta
 
@@ -617,26 +808,29 @@ async def run_scan(
     if portals is None:
         portals = ACTIVE_PORTALS
 
-    print("=" * 70)
-    print(f"🚀 SCRAPER RESILIENTE - {city.upper()}/{state.upper()}")
-    print(f"📅 {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-    print(f"🌐 Portais: {', '.join(portals)}")
-    print(f"📄 Páginas: {max_pages}")
-    print("=" * 70)
+    logger.info("=" * 70)
+    logger.info("🚀 SCRAPER RESILIENTE - %s/%s", city.upper(), state.upper())
+    logger.info("📅 %s", datetime.now().strftime('%Y-%m-%d %H:%M:%S'))
+    logger.info("🌐 Portais: %s", ', '.join(portals))
+    logger.info("📄 Páginas: %s", max_pages)
+    logger.info("=" * 70)
 
     run_id = None
     try:
         run_id = create_scrape_run(city=city, portals=portals)
-        print(f"🆔 Run ID: {run_id}")
+        logger.info("🆔 Run ID: %s", run_id)
     except Exception as e:
         import uuid
         run_id = str(uuid.uuid4())
-        print(f"⚠️ DB offline, ID local: {run_id}")
+        logger.warning("⚠️ DB offline, ID local: %s", run_id)
 
     fetcher = StealthFetcher(headless=True)
     
     all_results = []
     portal_status = {}
+    # Per-card failures, reported once at the end of the run
+    normalize_errors: List[str] = []
+    db_errors = 0
 
     try:
         for portal in portals:
@@ -652,37 +846,47 @@ async def run_scan(
             portal_status[portal] = status.get("status", "unknown")
             
             if not cards:
-                print(f"⚠️ [{portal.upper()}] Nenhum card")
+                logger.warning("⚠️ [%s] Nenhum card", portal.upper())
                 continue
 
-            # Save cards
-            saved = 0
-            start_time = datetime.now()
+            # Save cards (buffered, flushed in bulk)
+            start_time = time.monotonic()
             
+            pending = []
             for card_dict in cards:
                 try:
                     normalized = normalize_listing(card_dict)
-                    if normalized:
-                        result = upsert_listing(normalized)
-                        if result:
-                            saved += 1
-                except Exception as e:
-                    pass
-
-            elapsed = (datetime.now() - start_time).total_seconds() * 1000
-            print(f"💾 [{portal.upper()}] {saved} cards salvos em {elapsed:.0f}ms")
+                except (TypeError, ValueError, AttributeError) as e:
+                    normalize_errors.append(f"{card_dict.get('url')}: {e}")
+                    continue
+                if not normalized or not normalized.get("external_id"):
+                    normalize_errors.append(f"{card_dict.get('url')}: sem external_id")
+                    continue
+                pending.append(normalized)
+
+            result = upsert_listings_bulk(pending, chunk_size=UPSERT_BATCH_SIZE)
+            saved = result["new"] + result["updated"]
+            db_errors += result["errors"]
+
+            elapsed = (time.monotonic() - start_time) * 1000
+            logger.info("💾 [%s] %s cards salvos em %.0fms", portal.upper(), saved, elapsed)
             
             all_results.extend(cards)
 
     finally:
         await fetcher.close()
-        print("👤 Sessão Playwright encerrada")
+        logger.info("👤 Sessão Playwright encerrada")
+
+    if normalize_errors or db_errors:
+        logger.warning("⚠️ %d normalize failures, %d db failures", len(normalize_errors), db_errors)
+        for err in normalize_errors[:10]:
+            logger.debug("   - %s", err)
 
-    print("\n🔄 Aplicando lifecycle...")
+    logger.info("🔄 Aplicando lifecycle...")
     try:
         apply_lifecycle()
     except Exception as e:
-        print(f"⚠️ Erro lifecycle: {e}")
+        logger.warning("⚠️ Erro lifecycle: %s", e)
 
     if run_id:
         try:
@@ -694,12 +898,30 @@ async def run_scan(
         except:
             pass
 
-    print("\n" + "=" * 70)
-    print("✅ PIPELINE CONCLUÍDO")
-    print(f"📦 Total: {len(all_results)} cards")
+    logger.info("=" * 70)
+    logger.info("✅ PIPELINE CONCLUÍDO")
+    logger.info("📦 Total: %d cards", len(all_results))
     for p, s in portal_status.items():
-        print(f"   - {p}: {s.upper()}")
-    print("=" * 70)
+        logger.info("   - %s: %s", p, s.upper())
+    logger.info("=" * 70)
+
+
+def setup_logging(verbose: bool = False) -> QueueListener:
+    """
+    Route the job's logger through a queue so the scan loop never blocks on
+    stderr; per-card lines are DEBUG and only shown with --verbose.
+    """
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    handler = logging.StreamHandler(sys.stderr)
+    handler.setFormatter(logging.Formatter("%(asctime)s | %(message)s"))
+    listener = QueueListener(log_queue, handler)
+
+    logger.addHandler(QueueHandler(log_queue))
+    logger.setLevel(logging.DEBUG if verbose else logging.INFO)
+    logger.propagate = False
+
+    listener.start()
+    return listener
 
 
 def main():
@@ -708,16 +930,21 @@ def main():
     parser.add_argument("--state", default=DEFAULT_STATE)
     parser.add_argument("--portals", type=str, default=None)
     parser.add_argument("--pages", type=int, default=MAX_PAGES_PER_PORTAL)
+    parser.add_argument("--verbose", action="store_true", help="Log per-card detail results")
     
     args = parser.parse_args()
     portals = args.portals.split(",") if args.portals else None
     
-    asyncio.run(run_scan(
-        city=args.city,
-        state=args.state,
-        portals=portals,
-        max_pages=args.pages
-    ))
+    listener = setup_logging(verbose=args.verbose)
+    try:
+        asyncio.run(run_scan(
+            city=args.city,
+            state=args.state,
+            portals=portals,
+            max_pages=args.pages
+        ))
+    finally:
+        listener.stop()
 
 
 if __name__ == "__main__":
@@ -16,6 +16,7 @@ V2 Features:
 
 Usage:
     python -m jobs.scan_campinas_v2 --pages 10 --portals imovelweb,vivareal,zap
+    SCAN_DEBUG_CARDS=1 python -m jobs.scan_campinas_v2   # dump every parsed card
 
 Exit Codes:
     0 = Success
@@ -30,13 +31,20 @@ import time
 import random
 import json
 import logging
+import importlib
+import queue
+from logging.handlers import QueueHandler, QueueListener
+from contextlib import AsyncExitStack, asynccontextmanager
+from hashlib import blake2b
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import List, Dict, Any, Optional, Tuple
+from urllib.parse import urlsplit
 
 import httpx
 
-logger = logging.getLogger(__name__)
+logger = logging.getLogger("scan_v2")
 
 # Add parent directory to path
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -44,10 +52,6 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from dotenv import load_dotenv
 load_dotenv()
 
-from app.scrapers.v2.vivareal_listing_only import VivaRealListingOnlyScraper
-from app.scrapers.v2.zap_listing_only import ZapListingOnlyScraper
-from app.scrapers.imovelweb import ImovelwebScraper
-
 # StealthFetcher for JS-rendered pages
 try:
     from app.scrapers.stealth import StealthFetcher
@@ -56,10 +60,28 @@ except ImportError:
     HAS_STEALTH = False
     print("⚠️ StealthFetcher not available - VivaReal/Zap may not work")
 
+# Optional async file I/O for debug dumps (worker thread otherwise)
+try:
+    import aiofiles
+except ImportError:
+    aiofiles = None
+
+# Optional faster event loop (libuv); not available on Windows
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
+
+# Optional fast JSON for the card dump (stdlib json otherwise)
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # Optional DB imports (graceful fallback if unavailable)
 try:
     from jobs.pipeline.normalizer import normalize_listing
-    from jobs.pipeline.upserter import upsert_listing, create_scrape_run, finish_scrape_run
+    from jobs.pipeline.upserter import upsert_listings_bulk, create_scrape_run, finish_scrape_run
     HAS_DB = True
 except ImportError:
     HAS_DB = False
@@ -76,13 +98,30 @@ DEFAULT_STATE = "SP"
 # Rate limiting - Human-like delays
 JITTER_RANGE = (3.0, 8.0)         # Seconds between pages (human-like browsing)
 REQUEST_TIMEOUT = 30.0            # HTTP timeout
+MAX_CONCURRENT_PER_HOST = 4       # In-flight requests per portal host
+STEALTH_PAGE_CONCURRENCY = 3      # Initial browser pages in flight per JS-rendered portal
+STEALTH_MAX_CONCURRENCY = 8       # Ceiling the adaptive limiter may grow to
+
+# Adaptive per-host rate (ListingFetcher): AIMD on requests/minute
+HOST_RATE_PER_MIN = 12            # Starting rate (~ one page every 5s)
+HOST_RATE_MIN = 2                 # Floor after repeated 403/429
+HOST_RATE_MAX = 60                # Ceiling for a healthy host
+HOST_RATE_STEP = 2                # Additive increase
+HOST_RATE_STREAK = 10             # Consecutive 200s before increasing
+HOST_BURST = 2                    # Max requests sent back-to-back
 
 # Retry configuration
 MAX_RETRIES = 2                   # Extra retries per page
+HTTP_MAX_RETRIES = 3              # Extra retries per page (ListingFetcher)
 BACKOFF_BASE = 2.0                # Exponential backoff base
+MAX_DELAY = 30.0                  # Cap for any single retry sleep
+
+# Card parsing (BeautifulSoup, CPU-bound) runs in worker processes
+PARSE_WORKERS = os.cpu_count() or 1
 
 # Debug output
 DEBUG_DIR = Path("./debug/scan_v2")
+DEBUG_CARDS = bool(os.environ.get("SCAN_DEBUG_CARDS"))  # Full card dump per page
 
 # Portals that require JavaScript rendering
 JS_RENDERED_PORTALS = ["vivareal", "zap", "imovelweb"]  # All need StealthFetcher for Cloudflare
@@ -105,84 +144,318 @@ DEFAULT_HEADERS = {
 # =========================================================================
 # SCRAPERS REGISTRY
 # =========================================================================
+# Imported on first use so a single-portal run only loads its own scraper
+SCRAPER_PATHS = {
+    "vivareal": ("app.scrapers.v2.vivareal_listing_only", "VivaRealListingOnlyScraper"),
+    "zap": ("app.scrapers.v2.zap_listing_only", "ZapListingOnlyScraper"),
+    "imovelweb": ("app.scrapers.imovelweb", "ImovelwebScraper"),
+}
+
+
 def get_scraper(portal: str):
     """Get the appropriate scraper for the portal."""
-    scrapers = {
-        "vivareal": VivaRealListingOnlyScraper,
-        "zap": ZapListingOnlyScraper,
-        "imovelweb": ImovelwebScraper,
-    }
-    scraper_class = scrapers.get(portal.lower())
-    if scraper_class:
-        return scraper_class()
-    return None
+    path = SCRAPER_PATHS.get(portal.lower())
+    if path is None:
+        return None
+    module_name, class_name = path
+    return getattr(importlib.import_module(module_name), class_name)()
+
+
+# =========================================================================
+# URL TEMPLATES
+# =========================================================================
+IMOVELWEB_FILTERS = {"operation": "sale", "property_type": "apartment"}
+
+# Placeholder page number; build_url compares page > 1, so it must be an int
+_PAGE_SENTINEL = 987654321
+
+# (portal, city, state) -> (page-1 URL, URL for page N with the sentinel)
+_URL_TEMPLATES: Dict[Tuple[str, str, str], Tuple[str, str]] = {}
+
+
+def _parse_imovelweb(scraper, html: str) -> List[Dict[str, Any]]:
+    # Imovelweb uses different parse signature; convert OfferCard to dict
+    now_iso = datetime.now(timezone.utc).isoformat()
+    to_dict = card_to_dict
+    return [to_dict(c, "imovelweb", now_iso) for c in scraper.parse_cards(html, recency_days=365)]
+
+
+# Per-portal URL builder, parser and rendered-content selector, looked up once
+# per page instead of branching on the portal name
+PORTAL_CONFIG = {
+    "vivareal": {
+        "wait_sel": '.olx-core-surface, .listings-wrapper',
+        "build": lambda s, city, state, page: s.build_url(city=city, state=state, page=page),
+        "parse": lambda s, html: s.parse_cards(html),
+    },
+    "zap": {
+        "wait_sel": '[data-testid="listing-card"], .olx-core-surface',
+        "build": lambda s, city, state, page: s.build_url(city=city, state=state, page=page),
+        "parse": lambda s, html: s.parse_cards(html),
+    },
+    "imovelweb": {
+        "wait_sel": '[data-posting-type], .posting-card, article[data-qa]',
+        "build": lambda s, city, state, page: s.build_url(
+            city=city, state=state, filters=IMOVELWEB_FILTERS, page=page
+        ),
+        "parse": _parse_imovelweb,
+    },
+}
+
+
+def page_url(scraper, portal: str, city: str, state: str, page: int) -> str:
+    """
+    Listing URL for a page. build_url runs only twice per (portal, city, state):
+    page 1 has no pagination suffix, every other page reuses one template.
+    """
+    key = (portal, city, state)
+    tmpl = _URL_TEMPLATES.get(key)
+    if tmpl is None:
+        build = PORTAL_CONFIG[portal]["build"]
+        tmpl = _URL_TEMPLATES[key] = (
+            build(scraper, city, state, 1),
+            build(scraper, city, state, _PAGE_SENTINEL),
+        )
+    if page <= 1:
+        return tmpl[0]
+    return tmpl[1].replace(str(_PAGE_SENTINEL), str(page))
 
 
 # =========================================================================
 # HTTP CLIENT
 # =========================================================================
+class HostLimiter:
+    """
+    Token bucket for one portal host with AIMD rate control:
+    halve the rate on 403/429, add HOST_RATE_STEP after
+    HOST_RATE_STREAK consecutive successes.
+    """
+
+    def __init__(self, rate_per_min: float = HOST_RATE_PER_MIN):
+        self.rate = rate_per_min
+        self.tokens = 1.0
+        self.ts = time.monotonic()
+        self.ok_streak = 0
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(HOST_BURST, self.tokens + (now - self.ts) * self.rate / 60.0)
+                self.ts = now
+                if self.tokens >= 1.0:
+                    self.tokens -= 1.0
+                    return
+                await asyncio.sleep((1.0 - self.tokens) * 60.0 / self.rate)
+
+    def on_success(self):
+        self.ok_streak += 1
+        if self.ok_streak >= HOST_RATE_STREAK:
+            self.ok_streak = 0
+            self.rate = min(HOST_RATE_MAX, self.rate + HOST_RATE_STEP)
+
+    def on_throttled(self):
+        self.ok_streak = 0
+        self.rate = max(HOST_RATE_MIN, self.rate / 2)
+
+
+class AdaptiveLimiter:
+    """
+    AIMD concurrency cap for one portal: each successful page raises the
+    in-flight limit by one, a block halves it and raises the jitter floor
+    added to the page delay (decaying again on success).
+    """
+
+    def __init__(self, limit: int = STEALTH_PAGE_CONCURRENCY, floor: int = 1,
+                 ceiling: int = STEALTH_MAX_CONCURRENCY):
+        self.limit = limit
+        self.floor = floor
+        self.ceiling = ceiling
+        self.in_flight = 0
+        self.jitter_floor = 0.0
+        self._cond = asyncio.Condition()
+
+    @asynccontextmanager
+    async def acquire(self):
+        async with self._cond:
+            await self._cond.wait_for(lambda: self.in_flight < self.limit)
+            self.in_flight += 1
+        permit = _Permit()
+        try:
+            yield permit
+        finally:
+            async with self._cond:
+                self.in_flight -= 1
+                if permit.outcome is True:
+                    self.limit = min(self.ceiling, self.limit + 1)
+                    self.jitter_floor = max(0.0, self.jitter_floor - 1.0)
+                elif permit.outcome is False:
+                    self.limit = max(self.floor, self.limit // 2)
+                    self.jitter_floor = min(MAX_DELAY, max(JITTER_RANGE[0], self.jitter_floor * 2))
+                self._cond.notify_all()
+
+
+class _Permit:
+    """Outcome of one AdaptiveLimiter slot, applied when the slot is released."""
+
+    __slots__ = ("outcome",)
+
+    def __init__(self):
+        self.outcome: Optional[bool] = None
+
+    def success(self):
+        self.outcome = True
+
+    def failure(self):
+        self.outcome = False
+
+
+def _challenge_header(headers) -> Optional[str]:
+    """Block reason when response headers already identify a WAF challenge."""
+    if headers.get("cf-mitigated", "").lower() == "challenge":
+        return "cloudflare_challenge"
+    return None
+
+
 class ListingFetcher:
     """
-    Simple HTTP client for listing pages.
-    Uses httpx with persistent session (cookies).
+    Simple async HTTP client for listing pages.
+    Uses httpx with persistent session (cookies), shared by concurrent portals.
     No WAF bypass - just standard requests.
     """
 
     def __init__(self, run_id: str):
         self.run_id = run_id
-        self.client = httpx.Client(
+        self.client = httpx.AsyncClient(
             headers=DEFAULT_HEADERS,
             timeout=REQUEST_TIMEOUT,
             follow_redirects=True,
+            # HTTP/2 multiplexes a portal's pages over one TLS connection;
+            # generous keep-alive so it survives the jitter between pages
+            http2=True,
+            # Pool sized to the per-host gate: every in-flight request can
+            # keep its connection, and nothing beyond that is ever opened
+            limits=httpx.Limits(
+                max_keepalive_connections=MAX_CONCURRENT_PER_HOST * len(SCRAPER_PATHS),
+                max_connections=MAX_CONCURRENT_PER_HOST * len(SCRAPER_PATHS),
+                keepalive_expiry=60.0,
+            ),
         )
         self.request_count = 0
         self.success_count = 0
         self.blocked_count = 0
-
-    def fetch(self, url: str, portal: str, page: int) -> Tuple[str, int, Optional[str]]:
+        self._host_slots: Dict[str, asyncio.BoundedSemaphore] = {}
+        self._limiters: Dict[str, HostLimiter] = {}
+        # URL -> result of the request currently in flight for it
+        self._inflight: Dict[str, asyncio.Future] = {}
+        # Own RNG (seeded by run_id) so a run's retry timing is reproducible
+        self._rng = random.Random(run_id)
+
+    def _host_slot(self, url: str) -> asyncio.BoundedSemaphore:
+        """Per-host concurrency gate so no portal sees more than its tolerance."""
+        host = urlsplit(url).netloc
+        slot = self._host_slots.get(host)
+        if slot is None:
+            slot = self._host_slots[host] = asyncio.BoundedSemaphore(MAX_CONCURRENT_PER_HOST)
+        return slot
+
+    def _limiter(self, url: str) -> HostLimiter:
+        host = urlsplit(url).netloc
+        limiter = self._limiters.get(host)
+        if limiter is None:
+            limiter = self._limiters[host] = HostLimiter()
+        return limiter
+
+    async def fetch(self, url: str, portal: str, page: int) -> Tuple[bytes, str, int, Optional[str]]:
         """
         Fetch a listing page.
-        Returns: (html, status_code, error_reason)
+        Concurrent calls for the same URL share a single request.
+        Returns: (raw_body, html, status_code, error_reason)
         """
+        inflight = self._inflight.get(url)
+        if inflight is not None:
+            return await asyncio.shield(inflight)
+
+        fut = asyncio.get_running_loop().create_future()
+        self._inflight[url] = fut
+        try:
+            result = await self._fetch(url)
+        except BaseException:
+            # _fetch only raises on cancellation; waiters fail with it too
+            fut.cancel()
+            raise
+        finally:
+            del self._inflight[url]
+        fut.set_result(result)
+        return result
+
+    async def _fetch(self, url: str) -> Tuple[bytes, str, int, Optional[str]]:
         error_reason = None
+        limiter = self._limiter(url)
 
-        for attempt in range(MAX_RETRIES + 1):
+        for attempt in range(HTTP_MAX_RETRIES + 1):
+            retry_after = None
             try:
-                # Apply jitter
-                if attempt > 0:
-                    backoff = BACKOFF_BASE * (2 ** (attempt - 1))
-                    time.sleep(backoff)
-
                 self.request_count += 1
 
-                resp = self.client.get(url)
-                html = resp.text
-                status = resp.status_code
+                await limiter.acquire()
+                async with self._host_slot(url):
+                    async with self.client.stream("GET", url) as resp:
+                        status = resp.status_code
+                        challenge = _challenge_header(resp.headers)
 
-                if status == 200:
-                    self.success_count += 1
-                    return html, status, None
+                        # Only pay for reading/decoding the body on a real page;
+                        # error and challenge bodies are discarded anyway
+                        if status == 200 and not challenge:
+                            await resp.aread()
+                            self.success_count += 1
+                            limiter.on_success()
+                            return resp.content, resp.text, status, None
+
+                        if status in (403, 429):
+                            retry_after = resp.headers.get("Retry-After")
+
+                if challenge:
+                    self.blocked_count += 1
+                    limiter.on_throttled()
+                    return b"", "", status, challenge
 
                 if status in (403, 429):
                     self.blocked_count += 1
-                    error_reason = f"http_{status}"
-                    continue
+                    limiter.on_throttled()
 
                 error_reason = f"http_{status}"
-                continue
 
             except httpx.TimeoutException:
                 error_reason = "timeout"
-                continue
             except Exception as e:
                 error_reason = f"error_{type(e).__name__}"
-                continue
 
-        return "", 0, error_reason
+            # Single post-failure sleep before the next attempt
+            if attempt < HTTP_MAX_RETRIES:
+                await asyncio.sleep(self._retry_delay(attempt, retry_after))
+
+        return b"", "", 0, error_reason
+
+    def _retry_delay(self, attempt: int, retry_after: Optional[str]) -> float:
+        """
+        Server's Retry-After (seconds) when present, otherwise full-jitter
+        backoff so concurrent workers don't wake up in lockstep.
+        """
+        if retry_after and retry_after.isdigit():
+            return min(MAX_DELAY, float(retry_after))
+        return self._rng.uniform(0, min(MAX_DELAY, BACKOFF_BASE * (2 ** attempt)))
 
-    def close(self):
+    async def close(self):
         if self.client:
-            self.client.close()
+            await self.client.aclose()
+
+    async def __aenter__(self) -> "ListingFetcher":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
 
     def get_stats(self) -> Dict[str, int]:
         return {
@@ -195,68 +468,142 @@ class ListingFetcher:
 # =========================================================================
 # DEBUG DUMP
 # =========================================================================
-def save_debug_dump(
+async def save_debug_dump(
     run_id: str,
     portal: str,
     page: int,
-    html: str,
+    html_bytes: bytes,
     status_code: int,
     reason: str
 ):
-    """Save blocked/failed page HTML for debugging."""
+    """Save blocked/failed page HTML (raw bytes, no re-encoding) for debugging."""
     debug_path = DEBUG_DIR / run_id / portal
     debug_path.mkdir(parents=True, exist_ok=True)
 
     filename = f"page_{page}_{reason}.html"
     filepath = debug_path / filename
 
-    with open(filepath, "w", encoding="utf-8") as f:
-        f.write(f"<!-- Status: {status_code}, Reason: {reason} -->\n")
-        f.write(html or "<!-- Empty response -->")
+    data = f"<!-- Status: {status_code}, Reason: {reason} -->\n".encode("utf-8")
+    data += html_bytes or b"<!-- Empty response -->"
+
+    # Don't block the other portals' fetches on disk writes
+    if aiofiles is not None:
+        async with aiofiles.open(filepath, "wb") as f:
+            await f.write(data)
+    else:
+        await asyncio.to_thread(filepath.write_bytes, data)
 
     return filepath
 
 
+# =========================================================================
+# CARD STAGING (JSONL)
+# =========================================================================
+def write_cards_jsonl(path: Path, cards: List[Dict[str, Any]]) -> int:
+    """
+    Stream cards to a JSON Lines file, one encoded line at a time
+    (no intermediate string for the whole run). Returns cards written.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    written = 0
+    with open(path, "wb") as f:
+        for card in cards:
+            if not card:
+                continue
+            if orjson is not None:
+                f.write(orjson.dumps(card, default=str, option=orjson.OPT_APPEND_NEWLINE))
+            else:
+                f.write(json.dumps(card, ensure_ascii=False, default=str).encode("utf-8") + b"\n")
+            written += 1
+    return written
+
+
 # =========================================================================
 # CARD PRINTING (FULL DUMP)  ✅ MOD
 # =========================================================================
-def _sanitize_for_print(v, max_str: int = 280, max_list: int = 30, max_depth: int = 5, _depth: int = 0):
-    """Evita log infinito: imprime tudo, mas trunca strings/listas gigantes."""
-    if _depth >= max_depth:
-        return f"<max_depth:{max_depth}>"
+def _sanitize_for_print(root, max_str: int = 280, max_list: int = 30, max_depth: int = 5):
+    """
+    Evita log infinito: imprime tudo, mas trunca strings/listas gigantes.
+    Iterativo (pilha explícita) em vez de uma chamada recursiva por nó.
+    """
+    shell = [None]
+    stack = [(shell, 0, root, 0)]
+    pop, push = stack.pop, stack.append
+
+    while stack:
+        parent, key, v, depth = pop()
+        if depth >= max_depth:
+            parent[key] = f"<max_depth:{max_depth}>"
+            continue
 
-    if v is None:
-        return None
+        kind = _SANITIZE_KINDS.get(type(v))
+        if kind is None:
+            kind, v = _classify_other(v)
+
+        if kind is _SCALAR:
+            parent[key] = v
+        elif kind is _STR:
+            parent[key] = v if len(v) <= max_str else v[:max_str] + f"... <+{len(v) - max_str} chars>"
+        elif kind is _LIST:
+            n = min(len(v), max_list)
+            out = [None] * n
+            if len(v) > max_list:
+                out.append(f"... <+{len(v) - max_list} items>")
+            parent[key] = out
+            for i in range(n):
+                push((out, i, v[i], depth + 1))
+        else:
+            out = {}
+            parent[key] = out
+            items = [(str(k), val) for k, val in v.items()]
+            for k, _ in items:
+                out[k] = None
+            # Reversed so entries are processed in order (last duplicate key wins)
+            for k, val in reversed(items):
+                push((out, k, val, depth + 1))
+
+    return shell[0]
+
+
+_SCALAR, _STR, _LIST, _DICT = "scalar", "str", "list", "dict"
+
+# Exact-type dispatch: one dict lookup per node instead of an isinstance chain
+_SANITIZE_KINDS = {
+    type(None): _SCALAR,
+    bool: _SCALAR,
+    int: _SCALAR,
+    float: _SCALAR,
+    str: _STR,
+    list: _LIST,
+    dict: _DICT,
+}
 
+
+def _classify_other(v):
     # datetime-like
     if hasattr(v, "isoformat") and callable(getattr(v, "isoformat")):
         try:
-            return v.isoformat()
+            return _SCALAR, v.isoformat()
         except Exception:
-            return str(v)
+            return _SCALAR, str(v)
 
+    # Subclasses of the dispatched types (enums, str subclasses, ...)
     if isinstance(v, (int, float, bool)):
-        return v
-
+        return _SCALAR, v
     if isinstance(v, str):
-        if len(v) <= max_str:
-            return v
-        return v[:max_str] + f"... <+{len(v) - max_str} chars>"
-
+        return _STR, v
     if isinstance(v, list):
-        if len(v) <= max_list:
-            return [_sanitize_for_print(x, max_str, max_list, max_depth, _depth + 1) for x in v]
-        head = [_sanitize_for_print(x, max_str, max_list, max_depth, _depth + 1) for x in v[:max_list]]
-        head.append(f"... <+{len(v) - max_list} items>")
-        return head
-
+        return _LIST, v
     if isinstance(v, dict):
-        out = {}
-        for k, val in v.items():
-            out[str(k)] = _sanitize_for_print(val, max_str, max_list, max_depth, _depth + 1)
-        return out
+        return _DICT, v
+
+    return _SCALAR, str(v)
 
-    return str(v)
+
+def _dump_json(data) -> str:
+    if orjson is not None:
+        return orjson.dumps(data, default=str, option=orjson.OPT_INDENT_2 | orjson.OPT_SORT_KEYS).decode()
+    return json.dumps(data, ensure_ascii=False, indent=2, sort_keys=True, default=str)
 
 
 def ensure_url_key(card: Dict[str, Any], portal: str) -> None:
@@ -264,24 +611,41 @@ def ensure_url_key(card: Dict[str, Any], portal: str) -> None:
     if not isinstance(card, dict):
         return
 
-    if card.get("url"):
+    get = card.get
+    if get("url"):
         return
 
-    for k in ("link", "href", "detail_url", "permalink", "listing_url"):
-        if card.get(k):
-            card["url"] = card.get(k)
-            break
-
-    url = card.get("url")
+    url = get("link") or get("href") or get("detail_url") or get("permalink") or get("listing_url")
     if not url:
         return
+    card["url"] = url
 
-    base = PORTAL_HOMEPAGES.get(portal.lower())
+    base = _PORTAL_BASE.get(portal)
     if base and isinstance(url, str):
-        if url.startswith("/"):
-            card["url"] = base.rstrip("/") + url
-        elif url.startswith("//"):
+        if url.startswith("//"):
             card["url"] = "https:" + url
+        elif url.startswith("/"):
+            card["url"] = base + url
+
+
+def _url_key(url: str) -> str:
+    """Canonical listing URL (no query string / trailing slash) for dedup."""
+    return url.split("?", 1)[0].rstrip("/")
+
+
+def dedup_cards(cards: List[Dict[str, Any]], portal: str, seen_urls: set) -> List[Dict[str, Any]]:
+    """Drop cards whose URL was already processed in this run (any page/portal)."""
+    fresh = []
+    for card in cards:
+        ensure_url_key(card, portal)
+        url = card.get("url")
+        if url:
+            key = _url_key(url)
+            if key in seen_urls:
+                continue
+            seen_urls.add(key)
+        fresh.append(card)
+    return fresh
 
 
 def print_cards_full(cards: List[Dict[str, Any]], portal: str, limit: Optional[int] = None):
@@ -289,21 +653,82 @@ def print_cards_full(cards: List[Dict[str, Any]], portal: str, limit: Optional[i
     Imprime TODOS os campos do card (inclusive url).
     limit=None -> imprime todos; limit=N -> imprime N cards.
     """
+    if limit == 0 or not cards:
+        return
     show = cards if limit is None else cards[:limit]
+    total = len(cards)
+    tag = portal.upper()
+    rule = "=" * 70
 
     for i, card in enumerate(show, 1):
         ensure_url_key(card, portal)
-        sanitized = _sanitize_for_print(card)
-        print(f"\n{'='*70}")
-        print(f"🏠 CARD {i}/{len(cards)} [{portal.upper()}]")
-        print(f"🔗 URL: {card.get('url', 'N/A')}")
-        print(f"💰 Preço: R$ {card.get('price', 'N/A')}")
-        print(f"📍 Bairro: {card.get('neighborhood', 'N/A')} | Cidade: {card.get('city', 'N/A')} | Estado: {card.get('state', 'N/A')}")
-        print(f"🛏️ Quartos: {card.get('bedrooms', 'N/A')} | 🚿 Banheiros: {card.get('bathrooms', 'N/A')} | 🚗 Vagas: {card.get('parking', 'N/A')} | 📐 Área: {card.get('area_m2', 'N/A')}m²")
-        print(f"🖼️ Imagem: {card.get('main_image_url', 'N/A')[:80]}..." if card.get('main_image_url') else "🖼️ Imagem: N/A")
-        print(f"{'='*70}")
-        print("📋 Dados completos:")
-        print(json.dumps(sanitized, ensure_ascii=False, indent=2, sort_keys=True, default=str))
+        get = card.get
+        image = get("main_image_url")
+        image_line = f"🖼️ Imagem: {image[:80]}..." if image else "🖼️ Imagem: N/A"
+        # One write per card instead of one per line
+        print(
+            f"\n{rule}\n"
+            f"🏠 CARD {i}/{total} [{tag}]\n"
+            f"🔗 URL: {get('url', 'N/A')}\n"
+            f"💰 Preço: R$ {get('price', 'N/A')}\n"
+            f"📍 Bairro: {get('neighborhood', 'N/A')} | Cidade: {get('city', 'N/A')} | Estado: {get('state', 'N/A')}\n"
+            f"🛏️ Quartos: {get('bedrooms', 'N/A')} | 🚿 Banheiros: {get('bathrooms', 'N/A')} | 🚗 Vagas: {get('parking', 'N/A')} | 📐 Área: {get('area_m2', 'N/A')}m²\n"
+            f"{image_line}\n"
+            f"{rule}\n"
+            f"📋 Dados completos:\n"
+            f"{_dump_json(_sanitize_for_print(card))}"
+        )
+
+
+# =========================================================================
+# CARD PARSING (PROCESS POOL)
+# =========================================================================
+_parse_pool: Optional[ProcessPoolExecutor] = None
+
+
+def get_parse_pool() -> ProcessPoolExecutor:
+    global _parse_pool
+    if _parse_pool is None:
+        _parse_pool = ProcessPoolExecutor(max_workers=PARSE_WORKERS)
+    return _parse_pool
+
+
+def shutdown_parse_pool() -> None:
+    global _parse_pool
+    if _parse_pool is not None:
+        _parse_pool.shutdown(wait=True)
+        _parse_pool = None
+
+
+def _parse_cards_worker(portal: str, html: str) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+    """
+    Runs in a worker process: builds a fresh scraper, parses the page and
+    returns plain dicts plus the scraper's parse counters for merging.
+    """
+    scraper = get_scraper(portal)
+    cards = PORTAL_CONFIG[portal]["parse"](scraper, html)
+    return cards, scraper.stats
+
+
+def _merge_parse_stats(scraper, parse_stats: Dict[str, Any]) -> None:
+    stats = scraper.stats
+    for key in ("total_cards_found", "total_cards_parsed"):
+        stats[key] += parse_stats[key]
+    stats["failure_reasons"].update(parse_stats["failure_reasons"])
+
+
+async def parse_page(scraper, portal: str, html: str) -> List[Dict[str, Any]]:
+    """Parse a listing page off the event loop; parse errors yield no cards."""
+    loop = asyncio.get_running_loop()
+    try:
+        cards, parse_stats = await loop.run_in_executor(
+            get_parse_pool(), _parse_cards_worker, portal, html
+        )
+    except Exception as e:
+        logger.warning("   ⚠️ Parse error: %s", e)
+        return []
+    _merge_parse_stats(scraper, parse_stats)
+    return cards
 
 
 # =========================================================================
@@ -317,6 +742,7 @@ async def collect_portal(
     fetcher: ListingFetcher,
     run_id: str,
     save_to_db: bool = True,
+    seen_urls: Optional[set] = None,
 ) -> Dict[str, Any]:
     """
     Collect listings from a single portal.
@@ -327,7 +753,8 @@ async def collect_portal(
         print(f"❌ Unknown portal: {portal}")
         return {"status": "unknown_portal", "cards": []}
 
-    scraper.reset_stats() if hasattr(scraper, "reset_stats") else None
+    scraper.reset_stats()
+    counters = scraper.stats
 
     all_cards = []
 
@@ -337,53 +764,62 @@ async def collect_portal(
     print(f"{'='*60}")
 
     consecutive_blocks = 0
+    # Page whose cards are still being parsed: (page, html KB, parse task)
+    pending = None
+    prev_hash = None
+
+    async def finish_page(job) -> None:
+        page_num, html_kb, parse_task = job
+        cards = await parse_task
+
+        if seen_urls is not None:
+            cards = dedup_cards(cards, portal, seen_urls)
+
+        print(f"   ✅ Page {page_num} OK: {html_kb}KB HTML, {len(cards)} cards parsed")
+
+        # Full card dump is opt-in (SCAN_DEBUG_CARDS=1 or --verbose); the
+        # stdout writes run in a worker thread, off the event loop
+        if cards and (DEBUG_CARDS or logger.isEnabledFor(logging.DEBUG)):
+            await asyncio.to_thread(print_cards_full, cards, portal)
+
+        all_cards.extend(cards)
 
     for page in range(1, max_pages + 1):
-        # Build URL
-        if portal == "imovelweb":
-            url = scraper.build_url(
-                city=city,
-                state=state,
-                filters={"operation": "sale", "property_type": "apartment"},
-                page=page
-            )
-        else:
-            url = scraper.build_url(city=city, state=state, page=page)
+        url = page_url(scraper, portal, city, state, page)
 
         print(f"\n📄 Page {page}/{max_pages}: {url[:80]}...")
 
-        # Apply jitter between pages
-        if page > 1:
-            jitter = random.uniform(*JITTER_RANGE)
-            await asyncio.sleep(jitter)
+        # Fetch page; pacing comes from the fetcher's per-host limiter,
+        # and the previous page finishes parsing while this one is in flight
+        fetch_task = asyncio.ensure_future(fetcher.fetch(url, portal, page))
 
-        # Fetch page
-        html, status_code, error_reason = fetcher.fetch(url, portal, page)
+        if pending is not None:
+            await finish_page(pending)
+            pending = None
+
+        body, html, status_code, error_reason = await fetch_task
 
         # Track stats
-        if hasattr(scraper, "stats"):
-            scraper.stats["pages_attempted"] = scraper.stats.get("pages_attempted", 0) + 1
+        counters["pages_attempted"] += 1
 
         # Check for block/error
         is_blocked = False
         if error_reason:
             is_blocked = True
             print(f"   ❌ FAILED: {error_reason} (status={status_code})")
-        elif hasattr(scraper, "is_blocked") and scraper.is_blocked(html):
+        elif scraper.is_blocked(html):
             is_blocked = True
-            block_reason = scraper.get_block_reason(html, status_code) if hasattr(scraper, "get_block_reason") else "blocked"
+            block_reason = scraper.get_block_reason(html, status_code)
             error_reason = block_reason
             print(f"   🛡️ BLOCKED: {block_reason}")
 
         if is_blocked:
             # Save debug dump
-            save_debug_dump(run_id, portal, page, html, status_code, error_reason or "unknown")
+            await save_debug_dump(run_id, portal, page, body, status_code, error_reason or "unknown")
 
             consecutive_blocks += 1
-            if hasattr(scraper, "stats"):
-                scraper.stats["pages_blocked"] = scraper.stats.get("pages_blocked", 0) + 1
-                scraper.stats["failure_reasons"][error_reason] = \
-                    scraper.stats["failure_reasons"].get(error_reason, 0) + 1
+            counters["pages_blocked"] += 1
+            counters["failure_reasons"][error_reason] += 1
 
             # Abort after 2 consecutive blocks
             if consecutive_blocks >= 2:
@@ -394,37 +830,27 @@ async def collect_portal(
 
         # Success - reset block counter
         consecutive_blocks = 0
-        if hasattr(scraper, "stats"):
-            scraper.stats["pages_ok"] = scraper.stats.get("pages_ok", 0) + 1
+        counters["pages_ok"] += 1
 
-        # Parse cards
-        try:
-            if portal == "imovelweb":
-                # Imovelweb uses different parse signature
-                cards = scraper.parse_cards(html, recency_days=365)
-                # Convert OfferCard to dict
-                cards = [card_to_dict(c, portal) for c in cards]
-            else:
-                cards = scraper.parse_cards(html)
-        except Exception as e:
-            print(f"   ⚠️ Parse error: {e}")
-            cards = []
-
-        cards_count = len(cards)
-        print(f"   ✅ OK: {len(html)//1000}KB HTML, {cards_count} cards parsed")
+        # Past the last page some portals serve the previous page again
+        page_hash = blake2b(body, digest_size=8).digest()
+        if page_hash == prev_hash:
+            print("   🔁 Same content as previous page - end of pagination")
+            break
+        prev_hash = page_hash
 
-        # ✅ MOD: Print FULL cards (first 2 by default)
-        if cards_count > 0:
-            print_cards_full(cards, portal)  # Print ALL cards with URL and details
+        # Parse in the pool; results are collected while the next page is fetched
+        # Raw body length is already known; no need to measure the decoded text
+        pending = (page, len(body) // 1000, asyncio.ensure_future(parse_page(scraper, portal, html)))
 
-        all_cards.extend(cards)
+    if pending is not None:
+        await finish_page(pending)
 
     # Calculate field coverage
-    if hasattr(scraper, "calculate_field_coverage"):
-        scraper.calculate_field_coverage(all_cards)
+    scraper.calculate_field_coverage(all_cards)
 
     # Get final stats
-    stats = scraper.get_stats() if hasattr(scraper, "get_stats") else {}
+    stats = scraper.get_stats()
     stats["total_cards"] = len(all_cards)
     stats["cards"] = all_cards
 
@@ -438,24 +864,51 @@ async def collect_portal(
 
     # Save to DB (if available)
     if save_to_db and HAS_DB and all_cards:
-        saved = 0
-        for card_dict in all_cards:
-            try:
-                normalized = normalize_listing(card_dict)
-                if normalized:
-                    result = upsert_listing(normalized)
-                    if result:
-                        saved += 1
-            except Exception:
-                pass
+        saved = save_cards(all_cards, portal)
         print(f"\n💾 [{portal.upper()}] Saved {saved}/{len(all_cards)} cards to DB")
 
     return stats
 
 
-def card_to_dict(card, portal: str) -> Dict[str, Any]:
-    """Convert OfferCard model to dict (for Imovelweb compatibility)."""
-    now = datetime.now(timezone.utc).isoformat()
+def save_cards(cards: List[Dict[str, Any]], portal: str) -> int:
+    """
+    Normalize cards and write them with one bulk upsert.
+    Returns how many rows were inserted/updated; failures are reported, not swallowed.
+    """
+    rows = []
+    # Local aliases: one lookup per page instead of one per card
+    normalize = normalize_listing
+    append = rows.append
+    normalize_errors = 0
+    for card in cards:
+        try:
+            normalized = normalize(card)
+        except Exception as e:
+            normalize_errors += 1
+            logger.debug("Normalize error (%s): %s", card.get("url"), e)
+            continue
+        if normalized:
+            append(normalized)
+
+    result = upsert_listings_bulk(rows) if rows else {"new": 0, "updated": 0, "errors": 0}
+    if normalize_errors or result["errors"]:
+        logger.warning(
+            "   ⚠️ [%s] %d normalize failures, %d db failures",
+            portal.upper(), normalize_errors, result["errors"],
+        )
+    return result["new"] + result["updated"]
+
+
+def card_to_dict(card, portal: str, now: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Convert OfferCard model to dict (for Imovelweb compatibility).
+    `now` (ISO timestamp) is shared by every card of a page; the DB upsert
+    sets the authoritative first/last_seen_at anyway.
+    """
+    if now is None:
+        now = datetime.now(timezone.utc).isoformat()
+    specs = card.specs
+    location = card.location
     return {
         "external_id": card.external_id,
         "portal": portal,
@@ -464,15 +917,15 @@ def card_to_dict(card, portal: str) -> Dict[str, Any]:
         "price": card.price,
         "condo_fee": None,
         "iptu": None,
-        "area_m2": card.specs.area if card.specs else None,
-        "bedrooms": card.specs.bedrooms if card.specs else None,
-        "bathrooms": card.specs.bathrooms if card.specs else None,
-        "parking": card.specs.parking if card.specs else None,
+        "area_m2": specs.area if specs else None,
+        "bedrooms": specs.bedrooms if specs else None,
+        "bathrooms": specs.bathrooms if specs else None,
+        "parking": specs.parking if specs else None,
         "property_type": "apartment",
         "street": None,
-        "neighborhood": card.location.neighborhood if card.location else None,
-        "city": card.location.city if card.location else None,
-        "state": card.location.state if card.location else None,
+        "neighborhood": location.neighborhood if location else None,
+        "city": location.city if location else None,
+        "state": location.state if location else None,
         "latitude": None,
         "longitude": None,
         "main_image_url": card.main_image_url,
@@ -552,6 +1005,8 @@ async def run_scan_v2(
     """Main scan function."""
     if portals is None:
         portals = DEFAULT_PORTALS
+    # Lowercase once; per-card helpers look portals up as-is
+    portals = [p.strip().lower() for p in portals]
 
     # Generate run ID
     run_id = datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -578,18 +1033,44 @@ async def run_scan_v2(
             print(f"⚠️ DB run creation failed: {e}")
 
     portal_stats = {}
+    # Listing URLs already processed this run (shared by every portal)
+    seen_urls: set = set()
 
     # Separate portals by type
     js_portals = [p for p in portals if p.lower() in JS_RENDERED_PORTALS]
     http_portals = [p for p in portals if p.lower() not in JS_RENDERED_PORTALS]
 
-    # Process HTTP-based portals (Imovelweb)
-    if http_portals:
-        print(f"\n📡 HTTP-based portals: {', '.join(http_portals)}")
-        fetcher = ListingFetcher(run_id)
-        try:
+    async def run_stealth_portal(portal: str) -> Dict[str, Any]:
+        # One browser per portal: StealthFetcher rotates/closes its session
+        # and isn't safe to share between concurrent portals
+        async with StealthFetcher(headless=headless) as stealth:
+            return await collect_portal_stealth(
+                portal=portal,
+                city=city,
+                state=state,
+                max_pages=max_pages,
+                fetcher=stealth,
+                run_id=run_id,
+                save_to_db=save_to_db,
+                seen_urls=seen_urls,
+                # Cards are only needed for JSONL staging when nothing goes to the DB
+                collect_cards=not (save_to_db and HAS_DB),
+            )
+
+    # Portals are independent hosts: every portal (HTTP and JS-rendered)
+    # runs concurrently, so the scan takes as long as the slowest portal
+    tasks: Dict[str, asyncio.Task] = {}
+
+    # Unwinds the shared HTTP client and the parse pool on any exit,
+    # including cancellation (Ctrl+C) while portals are still running
+    async with AsyncExitStack() as stack:
+        stack.callback(shutdown_parse_pool)
+
+        if http_portals:
+            print(f"\n📡 HTTP-based portals: {', '.join(http_portals)}")
+            fetcher = await stack.enter_async_context(ListingFetcher(run_id))
             for portal in http_portals:
-                stats = await collect_portal(
+                tasks[portal] = asyncio.create_task(collect_portal(
                     portal=portal,
                     city=city,
                     state=state,
@@ -597,39 +1078,40 @@ async def run_scan_v2(
                     fetcher=fetcher,
                     run_id=run_id,
                     save_to_db=save_to_db,
-                )
-                portal_stats[portal] = stats
-        finally:
-            fetcher.close()
-
-    # Process JS-rendered portals (VivaReal, Zap, Imovelweb if included)
-    if js_portals:
-        print(f"\n🎭 JS-rendered portals: {', '.join(js_portals)}")
-        if not HAS_STEALTH:
-            print("❌ StealthFetcher not available - skipping JS portals")
-            for portal in js_portals:
-                portal_stats[portal] = {"status": "no_stealth", "total_cards": 0}
-        else:
-            stealth = StealthFetcher(headless=headless)
-            try:
+                    seen_urls=seen_urls,
+                ))
+
+        if js_portals:
+            print(f"\n🎭 JS-rendered portals: {', '.join(js_portals)}")
+            if not HAS_STEALTH:
+                print("❌ StealthFetcher not available - skipping JS portals")
+                for portal in js_portals:
+                    portal_stats[portal] = {"status": "no_stealth", "total_cards": 0}
+            else:
                 for portal in js_portals:
-                    stats = await collect_portal_stealth(
-                        portal=portal,
-                        city=city,
-                        state=state,
-                        max_pages=max_pages,
-                        fetcher=stealth,
-                        run_id=run_id,
-                        save_to_db=save_to_db,
-                    )
-                    portal_stats[portal] = stats
-            finally:
-                await stealth.close()
-                print("🎭 StealthFetcher closed")
+                    tasks[portal] = asyncio.create_task(run_stealth_portal(portal))
+
+        # return_exceptions: one failing portal doesn't cancel the others
+        # (a TaskGroup would); cancelling this await cancels them all
+        results = await asyncio.gather(*tasks.values(), return_exceptions=True)
+
+    for portal, result in zip(tasks, results):
+        if isinstance(result, Exception):
+            print(f"❌ [{portal.upper()}] Portal failed: {type(result).__name__}: {result}")
+            result = {"status": "error", "total_cards": 0, "failure_reasons": {f"error_{type(result).__name__}": 1}}
+        portal_stats[portal] = result
 
     # Print final statistics
     exit_code = print_final_stats(portal_stats)
 
+    # Without a DB write, stage the cards so the run can be loaded later
+    if not (save_to_db and HAS_DB):
+        all_cards = [c for s in portal_stats.values() for c in s.get("cards", [])]
+        if all_cards:
+            staging_path = DEBUG_DIR / run_id / "cards.jsonl"
+            written = await asyncio.to_thread(write_cards_jsonl, staging_path, all_cards)
+            print(f"\n📦 {written} cards staged to {staging_path}")
+
     # Finish DB run
     if HAS_DB and db_run_id:
         try:
@@ -656,38 +1138,49 @@ PORTAL_HOMEPAGES = {
     "imovelweb": "https://www.imovelweb.com.br/",
 }
 
+# Absolute-URL prefix per portal for relative card links (ensure_url_key)
+_PORTAL_BASE = {k.lower(): v.rstrip("/") for k, v in PORTAL_HOMEPAGES.items()}
 
-async def warmup_homepage(fetcher, portal: str, run_id: str):
+
+async def warmup_homepage(fetcher, portal: str, run_id: str, rng: Optional[random.Random] = None):
     """
     Visit portal homepage to build legitimate cookies and Cloudflare clearance.
     This simulates a user arriving at the site naturally before browsing listings.
+    Runs once per portal per fetcher session; later calls return immediately.
     """
-    homepage = PORTAL_HOMEPAGES.get(portal.lower())
+    portal = portal.lower()
+    homepage = PORTAL_HOMEPAGES.get(portal)
     if not homepage:
         return
 
-    print(f"\n🏠 [WARMUP] Visiting {portal} homepage for cookie warmup...")
+    # The lock keeps two concurrent callers from warming the same portal twice
+    async with fetcher.warmup_locks[portal]:
+        if portal in fetcher.warmed_portals:
+            return
 
-    try:
-        meta = await fetcher.fetch(
-            homepage,
-            return_meta=True,
-            run_id=run_id,
-            scenario="warmup",
-            request_type="homepage",
-            simulate_human=True,
-        )
+        print(f"\n🏠 [WARMUP] Visiting {portal} homepage for cookie warmup...")
 
-        if meta and meta.get("status") == 200:
-            print(f"   ✅ Homepage loaded ({meta.get('cookies_count', 0)} cookies)")
-            # Longer pause to let Cloudflare cookies fully settle
-            wait_time = random.uniform(5.0, 8.0)
-            print(f"   ⏳ Waiting {wait_time:.1f}s for CF cookies to settle...")
-            await asyncio.sleep(wait_time)
-        else:
-            print(f"   ⚠️ Homepage returned status {meta.get('status', 'unknown')}")
-    except Exception as e:
-        print(f"   ⚠️ Homepage warmup failed: {e}")
+        try:
+            meta = await fetcher.fetch(
+                homepage,
+                return_meta=True,
+                run_id=run_id,
+                scenario="warmup",
+                request_type="homepage",
+                simulate_human=True,
+            )
+
+            if meta and meta.get("status") == 200:
+                print(f"   ✅ Homepage loaded ({meta.get('cookies_count', 0)} cookies)")
+                # Longer pause to let Cloudflare cookies fully settle
+                wait_time = (rng or random).uniform(5.0, 8.0)
+                print(f"   ⏳ Waiting {wait_time:.1f}s for CF cookies to settle...")
+                await asyncio.sleep(wait_time)
+                fetcher.warmed_portals.add(portal)
+            else:
+                print(f"   ⚠️ Homepage returned status {meta.get('status', 'unknown')}")
+        except Exception as e:
+            print(f"   ⚠️ Homepage warmup failed: {e}")
 
 
 async def collect_portal_stealth(
@@ -698,73 +1191,62 @@ async def collect_portal_stealth(
     fetcher,  # StealthFetcher
     run_id: str,
     save_to_db: bool = True,
+    seen_urls: Optional[set] = None,
+    collect_cards: bool = True,
 ) -> Dict[str, Any]:
     """
     Collect listings from a JS-rendered portal using StealthFetcher.
+
+    Field coverage and card totals are aggregated page by page; the cards
+    themselves are only kept (stats["cards"]) when collect_cards is set.
     """
     scraper = get_scraper(portal)
     if not scraper:
-        print(f"❌ Unknown portal: {portal}")
+        logger.error("❌ Unknown portal: %s", portal)
         return {"status": "unknown_portal", "cards": []}
 
-    if hasattr(scraper, "reset_stats"):
-        scraper.reset_stats()
+    scraper.reset_stats()
 
     all_cards = []
+    total_cards = 0
+    field_counts: Dict[str, int] = {}
 
-    print(f"\n{'='*60}")
-    print(f"🎭 [{portal.upper()}] Starting JS-rendered scan: {city}, {state}")
-    print(f"   Pages: {max_pages} | City: {city} | State: {state}")
-    print(f"{'='*60}")
+    rule = "=" * 60
+    logger.info(
+        "\n%s\n🎭 [%s] Starting JS-rendered scan: %s, %s\n   Pages: %d | City: %s | State: %s\n%s",
+        rule, portal.upper(), city, state, max_pages, city, state, rule,
+    )
 
     consecutive_blocks = 0
     pages_attempted = 0
     pages_ok = 0
     pages_blocked = 0
 
-    # Homepage warm-up: Visit portal homepage first to build cookies/clearance
-    await warmup_homepage(fetcher, portal, run_id)
-
-    for page in range(1, max_pages + 1):
-        # Build URL (handle different scraper signatures)
-        if portal.lower() == "imovelweb":
-            url = scraper.build_url(
-                city=city,
-                state=state,
-                filters={"operation": "sale", "property_type": "apartment"},
-                page=page
-            )
-        else:
-            url = scraper.build_url(city=city, state=state, page=page)
-
-        print(f"\n📄 Page {page}/{max_pages}: {url[:80]}...")
-
-        # Apply jitter between pages
-        if page > 1:
-            jitter = random.uniform(*JITTER_RANGE)
-            print(f"   ⏳ Waiting {jitter:.1f}s...")
-            await asyncio.sleep(jitter)
+    # Per-portal RNG: no shared global state between portal tasks, and the
+    # same run_id replays the same delays. A str seed is stable across
+    # processes (hash() of a str is salted per interpreter).
+    rng = random.Random(f"{run_id}:{portal}")
 
-        pages_attempted += 1
+    portal_key = portal.lower()
+    wait_selector = PORTAL_CONFIG[portal_key]["wait_sel"]
 
-        # Define wait selector based on portal (for JS-rendered content)
-        wait_selector = None
-        if portal.lower() == "vivareal":
-            wait_selector = '.olx-core-surface, .listings-wrapper'
-        elif portal.lower() == "zap":
-            wait_selector = '[data-testid="listing-card"], .olx-core-surface'
-        elif portal.lower() == "imovelweb":
-            wait_selector = '[data-posting-type], .posting-card, article[data-qa]'
+    # Pages are fetched concurrently under an adaptive cap; `stop` ends the
+    # scan early on consecutive blocks or when pagination runs out
+    limiter = AdaptiveLimiter()
+    stop = asyncio.Event()
+    page_hashes: Dict[int, bytes] = {}
 
-        # Fetch page with StealthFetcher
+    async def fetch_page(page: int, url: str) -> Tuple[Optional[str], Optional[str]]:
+        """Fetch with retries. Returns (html, error_reason)."""
         html = None
         error_reason = None
 
         for attempt in range(MAX_RETRIES + 1):
             try:
                 if attempt > 0:
-                    backoff = BACKOFF_BASE * (2 ** (attempt - 1))
-                    print(f"   ↻ Retry {attempt}/{MAX_RETRIES} after {backoff:.1f}s...")
+                    # Full jitter: concurrent pages/portals don't retry in lockstep
+                    backoff = rng.uniform(0, min(MAX_DELAY, BACKOFF_BASE * (2 ** (attempt - 1))))
+                    logger.debug("   ↻ [p%d] Retry %d/%d after %.1fs...", page, attempt, MAX_RETRIES, backoff)
                     await asyncio.sleep(backoff)
 
                 meta = await fetcher.fetch(
@@ -790,89 +1272,123 @@ async def collect_portal_stealth(
 
             except Exception as e:
                 error_reason = f"fetch_error_{type(e).__name__}"
-                print(f"   ❌ Fetch error: {e}")
-
-        # Check for block
-        is_blocked = False
-        if not html:
-            is_blocked = True
-            error_reason = error_reason or "empty_response"
-        elif hasattr(scraper, "is_blocked") and scraper.is_blocked(html):
-            is_blocked = True
-            error_reason = scraper.get_block_reason(html, 200) if hasattr(scraper, "get_block_reason") else "blocked"
+                logger.warning("   ❌ [p%d] Fetch error: %s", page, e)
+
+        return html, error_reason
+
+    async def scan_page(page: int) -> None:
+        nonlocal consecutive_blocks, pages_attempted, pages_ok, pages_blocked, total_cards
+
+        async with limiter.acquire() as permit:
+            if stop.is_set():
+                return
+
+            url = page_url(scraper, portal_key, city, state, page)
+            logger.debug("📄 Page %d/%d: %.80s...", page, max_pages, url)
+
+            # Jitter staggers the concurrent pages (human-like pacing);
+            # the limiter's floor grows while the portal is blocking us
+            if page > 1:
+                jitter = limiter.jitter_floor + rng.uniform(*JITTER_RANGE)
+                logger.debug("   ⏳ [p%d] Waiting %.1fs...", page, jitter)
+                await asyncio.sleep(jitter)
+                if stop.is_set():
+                    return
+
+            pages_attempted += 1
+            html, error_reason = await fetch_page(page, url)
+
+            # Check for block
+            is_blocked = False
+            if not html:
+                is_blocked = True
+                error_reason = error_reason or "empty_response"
+            elif scraper.is_blocked(html):
+                is_blocked = True
+                error_reason = scraper.get_block_reason(html, 200)
+
+            if is_blocked:
+                permit.failure()
+            else:
+                permit.success()
 
         if is_blocked:
-            print(f"   🛡️ BLOCKED: {error_reason}")
-            save_debug_dump(run_id, portal, page, html or "", 0, error_reason or "unknown")
+            logger.warning("   🛡️ page=%d status=blocked reason=%s", page, error_reason)
+            await save_debug_dump(run_id, portal, page, (html or "").encode("utf-8"), 0, error_reason or "unknown")
 
             consecutive_blocks += 1
             pages_blocked += 1
 
-            if hasattr(scraper, "stats"):
-                scraper.stats["failure_reasons"] = scraper.stats.get("failure_reasons", {})
-                scraper.stats["failure_reasons"][error_reason] = \
-                    scraper.stats["failure_reasons"].get(error_reason, 0) + 1
-
-            # Abort after 2 consecutive blocks
-            if consecutive_blocks >= 2:
-                print(f"   ⛔ Aborting portal after {consecutive_blocks} consecutive blocks")
-                break
+            scraper.stats["failure_reasons"][error_reason] += 1
 
-            continue
+            # Abort after 2 consecutive blocks (in completion order)
+            if consecutive_blocks >= 2 and not stop.is_set():
+                logger.warning("   ⛔ Aborting portal after %d consecutive blocks", consecutive_blocks)
+                stop.set()
+            return
 
         # Success
         consecutive_blocks = 0
         pages_ok += 1
 
-        # Parse cards
-        try:
-            if portal.lower() == "imovelweb":
-                cards = scraper.parse_cards(html, recency_days=365)
-                cards = [card_to_dict(c, portal) for c in cards]
-            else:
-                cards = scraper.parse_cards(html)
-        except Exception as e:
-            print(f"   ⚠️ Parse error: {e}")
-            cards = []
+        # Past the last page some portals serve the previous page again
+        page_hash = blake2b(html.encode("utf-8"), digest_size=8).digest()
+        page_hashes[page] = page_hash
+        if page_hashes.get(page + 1) == page_hash:
+            stop.set()
+        if page_hashes.get(page - 1) == page_hash:
+            logger.info("   🔁 page=%d status=end_of_pagination", page)
+            stop.set()
+            return
+
+        # Parse in the process pool; other pages keep fetching meanwhile
+        cards = await parse_page(scraper, portal_key, html)
+
+        if seen_urls is not None:
+            cards = dedup_cards(cards, portal, seen_urls)
+
+        # Full card dump is opt-in (SCAN_DEBUG_CARDS=1 or --verbose); the
+        # stdout writes run in a worker thread, off the event loop
+        if cards and (DEBUG_CARDS or logger.isEnabledFor(logging.DEBUG)):
+            await asyncio.to_thread(print_cards_full, cards, portal)
+
+        # Incremental DB insertion (one bulk upsert per page); runs in a
+        # worker thread so the other pages' fetches aren't held up
+        inserted = 0
+        if save_to_db and HAS_DB and cards:
+            inserted = await asyncio.to_thread(save_cards, cards, portal)
 
-        cards_count = len(cards)
-        print(f"   ✅ OK: {len(html)//1000}KB HTML, {cards_count} cards parsed")
+        # One record per page
+        logger.info(
+            "   ✅ page=%d status=ok cards=%d inserted=%d html_kb=%d",
+            page, len(cards), inserted, len(html) // 1024,
+        )
 
-        # ✅ MOD: Print FULL cards with URL and all details
-        if cards_count > 0:
-            print_cards_full(cards, portal)  # Print ALL cards
+        total_cards += len(cards)
+        scraper.count_filled_fields(cards, field_counts)
+        if collect_cards:
+            all_cards.extend(cards)
 
-        # Incremental DB insertion (insert after each page for reliability)
-        if save_to_db and HAS_DB and cards:
-            inserted = 0
-            for card in cards:
-                try:
-                    normalized = normalize_listing(card)
-                    upsert_listing(normalized)
-                    inserted += 1
-                except Exception as e:
-                    logger.debug(f"DB insert error: {e}")
-            print(f"   💾 Inserted {inserted}/{len(cards)} cards to DB")
+    # Homepage warm-up: Visit portal homepage first to build cookies/clearance
+    await warmup_homepage(fetcher, portal, run_id, rng)
 
-        all_cards.extend(cards)
+    await asyncio.gather(*(scan_page(page) for page in range(1, max_pages + 1)))
 
-    # Update stats
-    if hasattr(scraper, "stats"):
-        scraper.stats["pages_attempted"] = pages_attempted
-        scraper.stats["pages_ok"] = pages_ok
-        scraper.stats["pages_blocked"] = pages_blocked
+    # Page counters were kept as locals; written once here
+    scraper.stats.update(
+        pages_attempted=pages_attempted,
+        pages_ok=pages_ok,
+        pages_blocked=pages_blocked,
+    )
 
     # Calculate field coverage
-    if hasattr(scraper, "calculate_field_coverage"):
-        scraper.calculate_field_coverage(all_cards)
+    scraper.coverage_from_counts(field_counts, total_cards)
 
     # Get final stats
-    stats = scraper.get_stats() if hasattr(scraper, "get_stats") else {}
-    stats["pages_attempted"] = pages_attempted
-    stats["pages_ok"] = pages_ok
-    stats["pages_blocked"] = pages_blocked
-    stats["total_cards"] = len(all_cards)
-    stats["cards"] = all_cards
+    stats = scraper.get_stats()
+    stats["total_cards"] = total_cards
+    if collect_cards:
+        stats["cards"] = all_cards
 
     # Determine status
     if pages_blocked == pages_attempted:
@@ -882,23 +1398,27 @@ async def collect_portal_stealth(
     else:
         stats["status"] = "ok"
 
-    # Save to DB (redundant final pass; kept as in your original)
-    if save_to_db and HAS_DB and all_cards:
-        saved = 0
-        for card_dict in all_cards:
-            try:
-                normalized = normalize_listing(card_dict)
-                if normalized:
-                    result = upsert_listing(normalized)
-                    if result:
-                        saved += 1
-            except Exception:
-                pass
-        print(f"\n💾 [{portal.upper()}] Saved {saved}/{len(all_cards)} cards to DB")
-
     return stats
 
 
+def setup_logging(verbose: bool = False) -> QueueListener:
+    """
+    Route the job's logger through a queue so the scan loop never blocks on
+    stderr; per-page waits/retries are DEBUG and only shown with --verbose.
+    """
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    handler = logging.StreamHandler(sys.stderr)
+    handler.setFormatter(logging.Formatter("%(asctime)s | %(message)s"))
+    listener = QueueListener(log_queue, handler)
+
+    logger.addHandler(QueueHandler(log_queue))
+    logger.setLevel(logging.DEBUG if verbose else logging.INFO)
+    logger.propagate = False
+
+    listener.start()
+    return listener
+
+
 def main():
     parser = argparse.ArgumentParser(
         description="Scan Campinas V2 - Listing Only",
@@ -944,6 +1464,11 @@ Examples:
         action="store_true",
         help="Run browser in visible mode (non-headless) - helps bypass Cloudflare"
     )
+    parser.add_argument(
+        "--verbose",
+        action="store_true",
+        help="Log per-page waits/retries and dump every parsed card"
+    )
 
     args = parser.parse_args()
 
@@ -951,14 +1476,19 @@ Examples:
     save_to_db = not args.no_db
     headless = not args.visible
 
-    exit_code = asyncio.run(run_scan_v2(
-        city=args.city,
-        state=args.state,
-        portals=portals,
-        max_pages=args.pages,
-        save_to_db=save_to_db,
-        headless=headless,
-    ))
+    listener = setup_logging(verbose=args.verbose)
+    run = uvloop.run if uvloop is not None else asyncio.run
+    try:
+        exit_code = run(run_scan_v2(
+            city=args.city,
+            state=args.state,
+            portals=portals,
+            max_pages=args.pages,
+            save_to_db=save_to_db,
+            headless=headless,
+        ))
+    finally:
+        listener.stop()
 
     sys.exit(exit_code)
 
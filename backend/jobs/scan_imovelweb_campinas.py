@@ -7,6 +7,7 @@ import logging
 import random
 from pathlib import Path
 from datetime import datetime, timezone
+from typing import Any, Dict, List
 
 # Playwright
 from playwright.async_api import async_playwright
@@ -34,20 +35,49 @@ logger = logging.getLogger("scan_quintoandar")
 logging.basicConfig(level=logging.INFO, format="%(asctime)s | %(message)s")
 
 BASE_URL = "https://www.quintoandar.com.br/comprar/imovel/campinas-sp-brasil"
+CARD_SELECTOR = 'div[data-testid="house-card"]'
+DETAIL_CONCURRENCY = 4  # Abas de detalhe abertas ao mesmo tempo
+
+# Lê todos os cards num único page.evaluate (um round-trip CDP em vez de
+# vários por card). Recebe [selector, limite].
+EXTRACT_CARDS_JS = """([sel, limit]) => Array.from(document.querySelectorAll(sel))
+    .slice(0, limit)
+    .map((card) => {
+        const getText = (s) => card.querySelector(s)?.innerText || "";
+        return {
+            url: card.querySelector('a')?.getAttribute('href') || "",
+            text: card.innerText,
+            address: getText('[data-testid="house-card-address"]'),
+            area: getText('[data-testid="house-card-area"]'),
+            price: getText('[data-testid="house-card-price"]'),
+        };
+    })"""
+
+# Primeira linha do primeiro card (snapshot antes/depois do filtro)
+FIRST_CARD_LINE_JS = """(sel) => {
+    const card = document.querySelector(sel);
+    return card ? card.innerText.split('\\n')[0] : "Nada";
+}"""
 
 # -----------------------------
 # 2. Utils e Parsers
 # -----------------------------
 
+# Compilados uma vez: estes helpers rodam para cada card
+_RE_EXT_ID = re.compile(r"/imovel/(\d+)")
+_RE_NEW = re.compile(r"(hora|minuto|segundo|agora|novo|hoje)")
+_NON_DIGIT_RE = re.compile(r"\D")
+
+
 def safe_int_str(text: str) -> int:
     try:
-        clean = re.sub(r"[^\d]", "", text)
+        clean = _NON_DIGIT_RE.sub("", text)
         return int(clean) if clean else 0
-    except:
+    except (ValueError, TypeError, AttributeError):
         return 0
 
 def extract_external_id(url: str) -> str:
-    match = re.search(r"/imovel/(\d+)", url)
+    match = _RE_EXT_ID.search(url)
     if match: return match.group(1)
     return str(random.randint(100000, 999999))
 
@@ -55,7 +85,7 @@ def check_is_new(text_date: str) -> bool:
     """True se for 'hora', 'minuto', 'agora', 'novo'."""
     if not text_date: return False
     clean = text_date.lower()
-    return bool(re.search(r"(hora|minuto|segundo|agora|novo|hoje)", clean))
+    return _RE_NEW.search(clean) is not None
 
 # -----------------------------
 # 3. Funções de Filtro (DEBUG PESADO)
@@ -106,11 +136,11 @@ async def debug_and_force_filter(page):
 
     # 3. Analisa o estado do botão
     if target_button:
-        # Print do HTML do botão para ver se bate com o seu
-        html_btn = await target_button.inner_html()
+        # HTML + estado do botão num único evaluate
+        html_btn, aria_selected = await target_button.evaluate(
+            "(el) => [el.innerHTML, el.getAttribute('aria-selected')]"
+        )
         print(f"📄 HTML do botão encontrado:\n{html_btn.strip()[:200]}...")
-
-        aria_selected = await target_button.get_attribute("aria-selected")
         print(f"ℹ️ Estado atual (aria-selected): {aria_selected}")
 
         if aria_selected == "true":
@@ -120,8 +150,7 @@ async def debug_and_force_filter(page):
             print("🖱️ O filtro está desativado. CLICANDO AGORA...")
             
             # Captura o primeiro imóvel antes do clique para comparar depois
-            first_card_before = await page.locator('div[data-testid="house-card"]').first.inner_text()
-            first_line_before = first_card_before.split('\n')[0] if first_card_before else "Nada"
+            first_line_before = await page.evaluate(FIRST_CARD_LINE_JS, CARD_SELECTOR)
             
             await target_button.click()
             
@@ -130,8 +159,7 @@ async def debug_and_force_filter(page):
             await asyncio.sleep(4) # Espera extra para o React renderizar
             
             # Verificação Pós-Clique
-            first_card_after = await page.locator('div[data-testid="house-card"]').first.inner_text()
-            first_line_after = first_card_after.split('\n')[0] if first_card_after else "Nada"
+            first_line_after = await page.evaluate(FIRST_CARD_LINE_JS, CARD_SELECTOR)
             
             print(f"   Imóvel Topo ANTES: {first_line_before}")
             print(f"   Imóvel Topo DEPOIS: {first_line_after}")
@@ -147,8 +175,12 @@ async def debug_and_force_filter(page):
 # 4. Navegação e Extração
 # -----------------------------
 
-async def get_details_date(context, card_element, index) -> str:
-    """Abre aba, pega data, fecha aba."""
+async def get_details_date(context, card_element, index, sem: asyncio.Semaphore) -> str:
+    """Abre aba, pega data, fecha aba (no máximo DETAIL_CONCURRENCY abas por vez)."""
+    async with sem:
+        return await _get_details_date(context, card_element, index)
+
+async def _get_details_date(context, card_element, index) -> str:
     page_detail = await context.new_page()
     try:
         # Pega o link
@@ -177,21 +209,8 @@ async def get_details_date(context, card_element, index) -> str:
     finally:
         await page_detail.close()
 
-async def extract_card_data(card_element) -> Dict[str, Any]:
-    # Extração rápida via JS para evitar latência
-    data = await card_element.evaluate("""(card) => {
-        const getText = (sel) => card.querySelector(sel)?.innerText || "";
-        const getAttr = (sel, attr) => card.querySelector(sel)?.getAttribute(attr) || "";
-        
-        return {
-            url: getAttr('a', 'href'),
-            text: card.innerText,
-            address: getText('[data-testid="house-card-address"]'),
-            area: getText('[data-testid="house-card-area"]'),
-            price: getText('[data-testid="house-card-price"]')
-        }
-    }""")
-    
+def build_card(data: Dict[str, str]) -> Dict[str, Any]:
+    """Monta o card a partir do dict retornado por EXTRACT_CARDS_JS."""
     full_url = "https://www.quintoandar.com.br" + data['url'] if data['url'].startswith("/") else data['url']
 
     return {
@@ -204,6 +223,11 @@ async def extract_card_data(card_element) -> Dict[str, Any]:
         "raw_card_text": data['text']
     }
 
+async def extract_cards_data(page, limit: int) -> List[Dict[str, Any]]:
+    """Extrai os primeiros `limit` cards com um único round-trip ao browser."""
+    data_list = await page.evaluate(EXTRACT_CARDS_JS, [CARD_SELECTOR, limit])
+    return [build_card(data) for data in data_list]
+
 # -----------------------------
 # 5. Execução Principal
 # -----------------------------
@@ -231,7 +255,7 @@ async def run_scan(headless: bool):
         await debug_and_force_filter(page)
         # =====================================
 
-        card_selector = 'div[data-testid="house-card"]'
+        card_selector = CARD_SELECTOR
         print("⏳ Aguardando carregamento dos cards...")
         try:
             await page.wait_for_selector(card_selector, timeout=15000)
@@ -246,6 +270,15 @@ async def run_scan(headless: bool):
         last_valid_index = -1
         cutoff_index = -1
         found_cutoff = False
+
+        # Datas já consultadas (índice -> texto); as abas de detalhe rodam em paralelo
+        sem = asyncio.Semaphore(DETAIL_CONCURRENCY)
+        dates: Dict[int, str] = {}
+
+        async def probe(cards, indices):
+            missing = [i for i in indices if i not in dates]
+            texts = await asyncio.gather(*(get_details_date(context, cards[i], i, sem) for i in missing))
+            dates.update(zip(missing, texts))
         
         print("\n🏁 INICIANDO LÓGICA DE SALTO (Verificando data a cada 10 cards)...")
 
@@ -268,10 +301,12 @@ async def run_scan(headless: bool):
 
             if found_cutoff: break
 
-            target_card = cards[current_index]
             print(f"\n🔍 Verificando Card Índice {current_index}...")
-            
-            date_text = await get_details_date(context, target_card, current_index)
+
+            # Consulta este índice e os próximos saltos já carregados de uma vez
+            ahead = list(range(current_index, len(cards), step))[:DETAIL_CONCURRENCY]
+            await probe(cards, ahead)
+            date_text = dates[current_index]
             is_new = check_is_new(date_text)
             
             if is_new:
@@ -282,39 +317,36 @@ async def run_scan(headless: bool):
                 print(f"🛑 Card {current_index} é ANTIGO ({date_text}).")
                 print(f"🔙 Iniciando BACKTRACK entre {last_valid_index} e {current_index} para achar o limite...")
                 
-                found_exact = False
-                # Loop reverso do índice atual até o último válido
-                for i in range(current_index - 1, last_valid_index, -1):
-                    print(f"   Checking índice {i}...")
-                    c_card = cards[i]
-                    d_text = await get_details_date(context, c_card, i)
-                    
-                    if check_is_new(d_text):
-                        print(f"🎉 CORTE LOCALIZADO! Card {i} é o último novo ({d_text}).")
-                        cutoff_index = i
-                        found_cutoff = True
-                        found_exact = True
-                        break
-                
-                if not found_exact:
+                # Busca em k partes: cada rodada consulta até DETAIL_CONCURRENCY cards
+                # espaçados entre lo (novo) e hi (antigo) em paralelo e estreita o
+                # intervalo para o trecho onde a data vira (~2 rodadas para um salto de 10)
+                lo, hi = last_valid_index, current_index
+                while hi - lo > 1:
+                    gap = hi - lo
+                    k = min(DETAIL_CONCURRENCY, gap - 1)
+                    mids = [lo + gap * j // (k + 1) for j in range(1, k + 1)]
+                    await probe(cards, mids)
+                    for i in mids:
+                        if check_is_new(dates[i]):
+                            lo = i
+                        else:
+                            hi = i
+                            break
+
+                cutoff_index = lo
+                found_cutoff = True
+                if lo > last_valid_index:
+                    print(f"🎉 CORTE LOCALIZADO! Card {lo} é o último novo ({dates[lo]}).")
+                else:
                     # Se nenhum no meio do caminho for novo, o último novo era o last_valid_index
                     print(f"⚠️ Nenhum intermediário era novo. Corte mantido em {last_valid_index}.")
-                    cutoff_index = last_valid_index
-                    found_cutoff = True
 
         # === EXTRAÇÃO FINAL ===
         print("\n" + "="*50)
         print(f"💰 EXTRAINDO DADOS FINAIS (0 até {cutoff_index})")
         print("="*50)
         
-        final_cards = await page.query_selector_all(card_selector)
-        results = []
-        
-        for i in range(cutoff_index + 1):
-            if i >= len(final_cards): break
-            print(f"📥 Extraindo card {i}...")
-            data = await extract_card_data(final_cards[i])
-            results.append(data)
+        results = await extract_cards_data(page, cutoff_index + 1)
 
         print(f"\n✅ Concluído! {len(results)} imóveis novos capturados.")
         # Aqui você chamaria o save_to_supabase(results)
@@ -6,11 +6,28 @@ import argparse
 import hashlib
 import logging
 import random
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from datetime import datetime, timezone
 from typing import Any, Dict, List, Optional
+import soupsieve as sv
 from bs4 import BeautifulSoup, NavigableString
 
+# lxml monta a árvore em C (bem mais rápido que o html.parser nas páginas
+# de ~200KB); a API do BeautifulSoup é a mesma nos dois casos
+try:
+    import lxml  # noqa: F401
+    HTML_PARSER = "lxml"
+except ImportError:
+    HTML_PARSER = "html.parser"
+
+# selectolax (Lexbor, opcional) extrai os cards direto da árvore em C,
+# bem mais rápido que BeautifulSoup; sem ele o parser bs4 abaixo é usado
+try:
+    from selectolax.lexbor import LexborHTMLParser
+except ImportError:
+    LexborHTMLParser = None
+
 # -----------------------------
 # 1. Configuração e Env
 # -----------------------------
@@ -29,59 +46,139 @@ try:
 except ImportError:
     create_client = None
 
+# Escrita assíncrona opcional dos dumps de HTML (thread auxiliar caso contrário)
+try:
+    import aiofiles
+except ImportError:
+    aiofiles = None
+
 logger = logging.getLogger("scan_vivareal")
 logging.basicConfig(level=logging.INFO, format="%(asctime)s | %(levelname)s | %(message)s")
 
+# Páginas buscadas ao mesmo tempo (no mesmo navegador)
+PAGE_CONCURRENCY = 3
+# Processos de parse: no máximo um por página em andamento
+PARSE_WORKERS = min(PAGE_CONCURRENCY, os.cpu_count() or 1)
+# Linhas por requisição de upsert (todas as páginas são gravadas no fim)
+UPSERT_CHUNK = 500
+
 # URL Fixa
+BASE_URL = "https://www.vivareal.com.br"
 FIXED_URL = "https://www.vivareal.com.br/venda/sp/campinas/?transacao=venda&onde=%2CS%C3%A3o+Paulo%2CCampinas%2C%2C%2C%2C%2Ccity%2CBR%3ESao+Paulo%3ENULL%3ECampinas%2C-22.905082%2C-47.061333%2C&ordem=MOST_RECENT"
 
 # -----------------------------
 # 2. Utils
 # -----------------------------
 
+# Compiladas uma vez: as funções abaixo rodam para cada card
+_PAGE_RE = re.compile(r"page=\d+")
+_WS_RE = re.compile(r"\s+")
+_NON_DIGIT_RE = re.compile(r"\D")
+_ID_RE = re.compile(r"(\d{6,})")
+_FLOAT_RE = re.compile(r"(\d+(\.\d+)?)")
+# Condomínio e IPTU numa só varredura; um rótulo nunca avança além do próximo
+_FEES_RE = re.compile(r"(?P<k>Cond|IPTU)(?:(?!Cond|IPTU).)*?R\$\s*(?P<v>[\d\.,]+)", re.I)
+
+# Seletores CSS compilados uma vez (o soupsieve vem com o bs4) em vez de
+# serem reinterpretados a cada card
+CARDS_CSS = 'li[data-cy="rp-property-cd"], .property-card__container, [data-testid="listing-card"]'
+PRICE_CSS = '[data-cy="rp-cardProperty-price-txt"]'
+SPEC_CSS = {
+    "area": 'li[data-cy="rp-cardProperty-propertyArea-txt"]',
+    "bed": 'li[data-cy="rp-cardProperty-bedroomQuantity-txt"]',
+    "bath": 'li[data-cy="rp-cardProperty-bathroomQuantity-txt"]',
+    "park": 'li[data-cy="rp-cardProperty-parkingSpacesQuantity-txt"]',
+}
+# Literais que qualquer card de CARDS_CSS traz no HTML: sem nenhum deles,
+# a página não tem cards e nem vale montar a árvore
+CARD_MARKERS = ("rp-property-cd", "property-card__container", "listing-card")
+SEL_CARDS = sv.compile(CARDS_CSS)
+SEL_LINK = sv.compile("a[href]")
+SEL_IMG = sv.compile("img[src]")
+SEL_PRICE = sv.compile(PRICE_CSS)
+SEL_PRICE_P1 = sv.compile("p:nth-of-type(1)")
+SEL_PRICE_P2 = sv.compile("p:nth-of-type(2)")
+SEL_PRICE_OLD = sv.compile(".property-card__price")
+SEL_LOC_H2 = sv.compile('h2[data-cy="rp-cardProperty-location-txt"]')
+SEL_TITLE = sv.compile('[data-testid="listing-title"]')
+SEL_STREET = sv.compile('p[data-cy="rp-cardProperty-street-txt"]')
+SEL_BELOW = sv.compile('[data-testid="rp-card-belowPrice-txt"]')
+SEL_AREA = sv.compile(SPEC_CSS["area"])
+SEL_BED = sv.compile(SPEC_CSS["bed"])
+SEL_BATH = sv.compile(SPEC_CSS["bath"])
+SEL_PARK = sv.compile(SPEC_CSS["park"])
+
+# "1.234,5" -> "1234.5" numa única passada
+_BR_DECIMAL = str.maketrans({".": None, ",": "."})
+
 def with_page(url: str, page: int) -> str:
     if "page=" in url:
-        return re.sub(r"page=\d+", f"page={page}", url)
+        return _PAGE_RE.sub(f"page={page}", url)
     else:
         return f"{url}&page={page}"
 
+def absolute_url(href: str) -> str:
+    """Links dos cards vêm relativos ao portal; absolutos passam direto."""
+    return href if href.startswith("http") else (BASE_URL + href if href else "")
+
 def normalize_spaces(s: str) -> str:
-    return re.sub(r"\s+", " ", (s or "").strip())
+    return _WS_RE.sub(" ", (s or "").strip())
 
 def parse_money_brl_to_int(text: str) -> Optional[int]:
     if not text: return None
-    digits = re.sub(r"[^\d]", "", text)
+    digits = _NON_DIGIT_RE.sub("", text)
     return int(digits) if digits else None
 
+def parse_fees(text: str) -> Dict[str, Optional[int]]:
+    """Condomínio e IPTU da linha de taxas, numa única passada da regex."""
+    fees: Dict[str, Optional[int]] = {}
+    for m in _FEES_RE.finditer(text):
+        fees.setdefault(m.group("k").lower(), parse_money_brl_to_int(m.group("v")))
+    return fees
+
 def extract_external_id(url: str) -> str:
     if not url: return ""
-    m = re.search(r"(\d{6,})", url)
+    m = _ID_RE.search(url)
     if m: return m.group(1)
+    # Só para URLs sem ID numérico. Precisa ser estável entre execuções
+    # (é a chave do upsert): hash() do Python muda a cada processo
     return hashlib.sha1(url.encode("utf-8")).hexdigest()[:16]
 
 def parse_smart_number(text: str) -> Optional[int]:
     if not text: return None
-    clean_text = text.replace(".", "")
-    match = re.search(r"(\d+)", clean_text)
-    return int(match.group(1)) if match else None
+    # Texto curto ("3", "2 vagas"): varre os dígitos direto, sem regex;
+    # pontos de milhar são ignorados como no replace(".", "") original
+    out = None
+    for ch in text:
+        if ch.isdecimal():
+            out = int(ch) if out is None else out * 10 + int(ch)
+        elif ch != "." and out is not None:
+            break
+    return out
 
 def parse_smart_float(text: str) -> Optional[float]:
     if not text: return None
-    clean_text = text.replace(".", "").replace(",", ".")
-    match = re.search(r"(\d+(\.\d+)?)", clean_text)
+    clean_text = text.translate(_BR_DECIMAL)
+    # Formato usual ("120 m²", "1234.56 m²"): o primeiro token já é o número
+    parts = clean_text.split(None, 1)
+    if parts:
+        head, dot, tail = parts[0].partition(".")
+        if head.isdecimal() and (not dot or tail.isdecimal()):
+            return float(parts[0])
+    match = _FLOAT_RE.search(clean_text)
     return float(match.group(1)) if match else None
 
 def extract_specs_from_icons(container) -> Dict[str, Any]:
-    area_node = container.select_one('li[data-cy="rp-cardProperty-propertyArea-txt"]')
+    area_node = SEL_AREA.select_one(container)
     area_m2 = parse_smart_float(area_node.get_text()) if area_node else None
 
-    bed_node = container.select_one('li[data-cy="rp-cardProperty-bedroomQuantity-txt"]')
+    bed_node = SEL_BED.select_one(container)
     bedrooms = parse_smart_number(bed_node.get_text()) if bed_node else None
 
-    bath_node = container.select_one('li[data-cy="rp-cardProperty-bathroomQuantity-txt"]')
+    bath_node = SEL_BATH.select_one(container)
     bathrooms = parse_smart_number(bath_node.get_text()) if bath_node else None
 
-    park_node = container.select_one('li[data-cy="rp-cardProperty-parkingSpacesQuantity-txt"]')
+    park_node = SEL_PARK.select_one(container)
     parking = parse_smart_number(park_node.get_text()) if park_node else None
 
     return {
@@ -91,41 +188,149 @@ def extract_specs_from_icons(container) -> Dict[str, Any]:
         "parking": parking
     }
 
-def parse_cards_from_listing_html(html: str) -> List[Dict[str, Any]]:
-    soup = BeautifulSoup(html or "", "html.parser")
-    
-    txt = soup.get_text()
-    if "Attention Required" in txt or "Why have I been blocked" in txt:
+def extract_specs_from_icons_lexbor(container) -> Dict[str, Any]:
+    """Mesmo que extract_specs_from_icons, para um Node do selectolax."""
+    area_node = container.css_first(SPEC_CSS["area"])
+    bed_node = container.css_first(SPEC_CSS["bed"])
+    bath_node = container.css_first(SPEC_CSS["bath"])
+    park_node = container.css_first(SPEC_CSS["park"])
+    return {
+        "area_m2": parse_smart_float(area_node.text()) if area_node else None,
+        "bedrooms": parse_smart_number(bed_node.text()) if bed_node else None,
+        "bathrooms": parse_smart_number(bath_node.text()) if bath_node else None,
+        "parking": parse_smart_number(park_node.text()) if park_node else None,
+    }
+
+def split_location(raw_location_text: str):
+    """'Bairro, Cidade' -> (bairro, cidade); sem vírgula assume Campinas."""
+    clean_loc = normalize_spaces(raw_location_text.replace('"', '').strip())
+    head, sep, tail = clean_loc.rpartition(",")
+    if sep:
+        return head.strip(), tail.strip()
+    return clean_loc, "Campinas"
+
+def make_card(
+    url: str, title, price, neighborhood, city, address, image_url,
+    specs: Dict[str, Any], is_below_market: bool, raw_card_text,
+) -> Dict[str, Any]:
+    return {
+        "portal": "vivareal",
+        "url": url,
+        "external_id": extract_external_id(url),
+        "title": title,
+        "price": price,
+        "location_data": {
+            "city": city,
+            "neighborhood": neighborhood,
+            "address": address,
+            "raw": f"{neighborhood}, {city}" if city else neighborhood
+        },
+        "main_image_url": image_url,
+        "specs": specs,
+        "is_below_market": is_below_market,
+        "raw_card_text": raw_card_text,
+    }
+
+def _parse_cards_lexbor(html: str, include_raw: bool) -> List[Dict[str, Any]]:
+    """Parser dos cards com selectolax; saída idêntica ao caminho bs4."""
+    tree = LexborHTMLParser(html)
+    out = []
+
+    for container in tree.css(CARDS_CSS):
+        link_elem = container.css_first("a[href]")
+        url = absolute_url(link_elem.attributes.get("href") or "") if link_elem else ""
+
+        price = None
+        condo_fee = None
+        iptu = None
+
+        price_container = container.css_first(PRICE_CSS)
+        if price_container:
+            sale_p = price_container.css_first("p:nth-of-type(1)")
+            if sale_p: price = parse_money_brl_to_int(sale_p.text())
+
+            fees_p = price_container.css_first("p:nth-of-type(2)")
+            if fees_p:
+                fees = parse_fees(normalize_spaces(fees_p.text()))
+                condo_fee = fees.get("cond")
+                iptu = fees.get("iptu")
+        else:
+            price_node = container.css_first(".property-card__price")
+            price = parse_money_brl_to_int(normalize_spaces(price_node.text())) if price_node else None
+
+        title = None
+        neighborhood = None
+        city = None
+
+        h2_node = container.css_first('h2[data-cy="rp-cardProperty-location-txt"]')
+        if h2_node:
+            raw_location_text = ""
+            for content in h2_node.iter(include_text=True):
+                if content.tag == "span":
+                    title = normalize_spaces(content.text())
+                elif content.tag == "-text":
+                    raw_location_text += content.text()
+            neighborhood, city = split_location(raw_location_text)
+        else:
+            title_node = container.css_first('[data-testid="listing-title"]')
+            title = normalize_spaces(title_node.text(separator=" ", strip=True)) if title_node else None
+
+        street_node = container.css_first('p[data-cy="rp-cardProperty-street-txt"]')
+        address = normalize_spaces(street_node.text(separator=" ", strip=True)) if street_node else None
+
+        specs = extract_specs_from_icons_lexbor(container)
+        specs["condo_fee"] = condo_fee
+        specs["iptu"] = iptu
+
+        is_below_market = container.css_first('[data-testid="rp-card-belowPrice-txt"]') is not None
+        img = container.css_first("img[src]")
+
+        out.append(make_card(
+            url, title, price, neighborhood, city, address,
+            img.attributes.get("src") if img else None,
+            specs, is_below_market,
+            container.text(separator=" ", strip=True) if include_raw or is_below_market else None,
+        ))
+    return out
+
+def parse_cards_from_listing_html(html: str, include_raw: bool = False) -> List[Dict[str, Any]]:
+    html = html or ""
+    # Bloqueio do Cloudflare: busca direto no HTML, antes de montar a árvore
+    if "Attention Required" in html or "Why have I been blocked" in html:
+        return []
+    if not any(marker in html for marker in CARD_MARKERS):
         return []
 
-    cards = soup.select('li[data-cy="rp-property-cd"], .property-card__container, [data-testid="listing-card"]')
+    if LexborHTMLParser is not None:
+        return _parse_cards_lexbor(html, include_raw)
+
+    soup = BeautifulSoup(html, HTML_PARSER)
+
+    cards = SEL_CARDS.select(soup)
     out = []
 
     for container in cards:
         # 1. URL
-        link_elem = container.select_one("a[href]")
-        url = link_elem.get("href", "") if link_elem else ""
-        if url and not url.startswith("http"): url = "https://www.vivareal.com.br" + url
+        link_elem = SEL_LINK.select_one(container)
+        url = absolute_url(link_elem["href"]) if link_elem else ""
 
         # 2. Preço
         price = None
         condo_fee = None
         iptu = None
 
-        price_container = container.select_one('[data-cy="rp-cardProperty-price-txt"]')
+        price_container = SEL_PRICE.select_one(container)
         if price_container:
-            sale_p = price_container.select_one("p:nth-of-type(1)")
+            sale_p = SEL_PRICE_P1.select_one(price_container)
             if sale_p: price = parse_money_brl_to_int(sale_p.get_text())
 
-            fees_p = price_container.select_one("p:nth-of-type(2)")
+            fees_p = SEL_PRICE_P2.select_one(price_container)
             if fees_p:
-                fees_text = normalize_spaces(fees_p.get_text())
-                m_cond = re.search(r"Cond.*?R\$\s*([\d\.,]+)", fees_text, flags=re.I)
-                if m_cond: condo_fee = parse_money_brl_to_int(m_cond.group(1))
-                m_iptu = re.search(r"IPTU.*?R\$\s*([\d\.,]+)", fees_text, flags=re.I)
-                if m_iptu: iptu = parse_money_brl_to_int(m_iptu.group(1))
+                fees = parse_fees(normalize_spaces(fees_p.get_text()))
+                condo_fee = fees.get("cond")
+                iptu = fees.get("iptu")
         else:
-            price_node = container.select_one(".property-card__price")
+            price_node = SEL_PRICE_OLD.select_one(container)
             price = parse_money_brl_to_int(normalize_spaces(price_node.get_text())) if price_node else None
 
         # 3. Location
@@ -133,7 +338,7 @@ def parse_cards_from_listing_html(html: str) -> List[Dict[str, Any]]:
         neighborhood = None
         city = None
         
-        h2_node = container.select_one('h2[data-cy="rp-cardProperty-location-txt"]')
+        h2_node = SEL_LOC_H2.select_one(container)
         if h2_node:
             raw_location_text = ""
             for content in h2_node.contents:
@@ -141,23 +346,13 @@ def parse_cards_from_listing_html(html: str) -> List[Dict[str, Any]]:
                     title = normalize_spaces(content.get_text())
                 elif isinstance(content, NavigableString):
                     raw_location_text += str(content)
-            
-            clean_loc = raw_location_text.replace('"', '').strip()
-            clean_loc = normalize_spaces(clean_loc)
-            
-            if "," in clean_loc:
-                parts = clean_loc.split(",")
-                city = parts[-1].strip()
-                neighborhood = ",".join(parts[:-1]).strip()
-            else:
-                neighborhood = clean_loc
-                city = "Campinas" 
+            neighborhood, city = split_location(raw_location_text)
         else:
-            title_node = container.select_one('[data-testid="listing-title"]')
+            title_node = SEL_TITLE.select_one(container)
             title = normalize_spaces(title_node.get_text(" ", strip=True)) if title_node else None
 
         # 4. Rua
-        street_node = container.select_one('p[data-cy="rp-cardProperty-street-txt"]')
+        street_node = SEL_STREET.select_one(container)
         address = normalize_spaces(street_node.get_text(" ", strip=True)) if street_node else None
 
         # 5. Specs
@@ -167,40 +362,38 @@ def parse_cards_from_listing_html(html: str) -> List[Dict[str, Any]]:
 
         # 6. Check de Preço Abaixo do Mercado
         # Procura o ícone/texto específico
-        below_market_node = container.select_one('[data-testid="rp-card-belowPrice-txt"]')
+        below_market_node = SEL_BELOW.select_one(container)
         is_below_market = True if below_market_node else False
 
-        out.append({
-            "portal": "vivareal",
-            "url": url,
-            "external_id": extract_external_id(url),
-            "title": title,
-            "price": price,
-            "location_data": {
-                "city": city,
-                "neighborhood": neighborhood,
-                "address": address,
-                "raw": f"{neighborhood}, {city}" if city else neighborhood
-            },
-            "main_image_url": (container.select_one("img[src]") or {}).get("src"),
-            "specs": specs,
-            "is_below_market": is_below_market,
-            "raw_card_text": container.get_text(" ", strip=True),
-        })
+        out.append(make_card(
+            url, title, price, neighborhood, city, address,
+            (SEL_IMG.select_one(container) or {}).get("src"),
+            specs, is_below_market,
+            # get_text percorre a subárvore inteira: só quando pedido ou para oportunidades
+            container.get_text(" ", strip=True) if include_raw or is_below_market else None,
+        ))
     return out
 
 # -----------------------------
 # 3. Supabase
 # -----------------------------
 
+_supabase_client = None
+
 def get_supabase_client():
+    """Cliente único por processo: reaproveita a sessão HTTP (keep-alive/TLS) entre upserts."""
+    global _supabase_client
+    if _supabase_client is not None: return _supabase_client
     if create_client is None: return None
     sb_url = os.getenv("SUPABASE_URL")
     sb_key = os.getenv("SUPABASE_SERVICE_ROLE_KEY") or os.getenv("SUPABASE_KEY")
     if not sb_url or not sb_key: return None
-    return create_client(sb_url, sb_key)
+    _supabase_client = create_client(sb_url, sb_key)
+    return _supabase_client
 
-def to_listing_row(card: Dict[str, Any]) -> Dict[str, Any]:
+def to_listing_row(card: Dict[str, Any], now_iso: str) -> Dict[str, Any]:
+    """Linha da tabela listings; os parsers sempre preenchem todas as chaves do card."""
+    raw_text = card["raw_card_text"]
     loc = card["location_data"]
     specs = card["specs"]
 
@@ -208,53 +401,71 @@ def to_listing_row(card: Dict[str, Any]) -> Dict[str, Any]:
         "portal": card["portal"],
         "external_id": card["external_id"],
         "url": card["url"],
-        "title": card.get("title"),
-        "price": card.get("price"),
+        "title": card["title"],
+        "price": card["price"],
         
         # Colunas Planas
         "neighborhood": loc["neighborhood"],
         "city": loc["city"],
         "state": "SP",
         
-        "area_m2": specs.get("area_m2"),
-        "bedrooms": specs.get("bedrooms"),
-        "bathrooms": specs.get("bathrooms"),
-        "parking": specs.get("parking"),
-        "condo_fee": specs.get("condo_fee"),
-        "iptu": specs.get("iptu"),
+        "area_m2": specs["area_m2"],
+        "bedrooms": specs["bedrooms"],
+        "bathrooms": specs["bathrooms"],
+        "parking": specs["parking"],
+        "condo_fee": specs["condo_fee"],
+        "iptu": specs["iptu"],
         
         # NOVA COLUNA (Requer o comando SQL acima)
-        "is_below_market": card.get("is_below_market"),
+        "is_below_market": card["is_below_market"],
         
-        "main_image_url": card.get("main_image_url"),
-        "last_seen_at": datetime.now(timezone.utc).isoformat(),
+        "main_image_url": card["main_image_url"],
+        "last_seen_at": now_iso,
         
-        "full_data": {
-            "raw_card_text": card.get("raw_card_text")
-        },
+        "full_data": {"raw_card_text": raw_text} if raw_text else {},
     }
 
 # -----------------------------
 # 4. Job Principal
 # -----------------------------
 
-async def run_scan(pages: int, max_cards_per_page: int, headless: bool, dry_run: bool) -> None:
-    sb = None if dry_run else get_supabase_client()
-    
-    if not dry_run and not sb:
-        logger.error("Abortando: Falha ao conectar no Supabase.")
-        return
+async def dump_html(path: Path, html: str) -> None:
+    """Grava o HTML da página sem travar o loop (aiofiles ou thread)."""
+    data = html.encode("utf-8")
+    if aiofiles is not None:
+        async with aiofiles.open(path, "wb") as f:
+            await f.write(data)
+    else:
+        await asyncio.to_thread(path.write_bytes, data)
 
-    dump_dir = Path("html_dumps")
-    dump_dir.mkdir(exist_ok=True)
-    total_written = 0
 
-    for page in range(1, pages + 1):
-        fetcher = None
+async def upsert_rows(sb, rows: List[Dict[str, Any]]) -> int:
+    """Upsert das linhas de todas as páginas em lotes de UPSERT_CHUNK; retorna quantas foram salvas."""
+    written = 0
+    for start in range(0, len(rows), UPSERT_CHUNK):
+        chunk = rows[start:start + UPSERT_CHUNK]
         try:
-            logger.info(f"🔄 [INIT] Abrindo navegador para pág {page}...")
-            fetcher = StealthFetcher(headless=headless) 
-            await asyncio.sleep(2) 
+            await asyncio.to_thread(sb.table("listings").upsert(chunk, on_conflict="portal,external_id").execute)
+            written += len(chunk)
+        except Exception as db_err:
+            logger.error(f"Erro Supabase: {db_err}")
+    return written
+
+async def scan_page(
+    fetcher: StealthFetcher,
+    page: int,
+    max_cards_per_page: int,
+    parse_pool: ProcessPoolExecutor,
+    dump_dir: Optional[Path],
+    sem: asyncio.Semaphore,
+    include_raw: bool = False,
+) -> List[Dict[str, Any]]:
+    """Busca e processa uma página; retorna as linhas para o banco."""
+    async with sem:
+        try:
+            # Espaça as páginas concorrentes (ritmo humano)
+            if page > 1:
+                await asyncio.sleep(random.uniform(5.0, 10.0))
 
             page_url = with_page(FIXED_URL, page)
             logger.info(f"🌍 [FETCH] Buscando page={page}")
@@ -263,75 +474,96 @@ async def run_scan(pages: int, max_cards_per_page: int, headless: bool, dry_run:
 
             if not html:
                 logger.warning(f"⛔ [BLOCK] Cloudflare bloqueou a pág {page}.")
-                continue
+                return []
 
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            with open(dump_dir / f"page_{page}_{timestamp}.html", "w", encoding="utf-8") as f: 
-                f.write(html)
+            if dump_dir:
+                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+                await dump_html(dump_dir / f"page_{page}_{timestamp}.html", html)
 
-            raw_cards = parse_cards_from_listing_html(html)
+            # Parse num processo separado: o loop segue buscando as outras páginas
+            raw_cards = await asyncio.get_running_loop().run_in_executor(
+                parse_pool, parse_cards_from_listing_html, html, include_raw
+            )
             
             if not raw_cards:
-                logger.warning(f"⚠️ [VAZIO] HTML ok, mas 0 cards.")
-                await asyncio.sleep(5)
-                continue
+                logger.warning(f"⚠️ [VAZIO] HTML ok, mas 0 cards na pág {page}.")
+                return []
 
-            unique_cards = []
-            seen_ids = set()
+            # Fica o primeiro card de cada ID (posição e dados); setdefault não sobrescreve
+            first = {}
             for c in raw_cards:
-                eid = c.get('external_id')
-                if eid and eid not in seen_ids:
-                    seen_ids.add(eid)
-                    unique_cards.append(c)
-            cards = unique_cards
+                if c.get('external_id'):
+                    first.setdefault(c['external_id'], c)
+            cards = list(first.values())
             if max_cards_per_page > 0: cards = cards[:max_cards_per_page]
             
-            logger.info(f"✅ [SUCESSO] Pág {page}: {len(cards)} imóveis únicos.")
-
-            logger.info("\n" + "="*60)
-            logger.info(f" LISTA DE IMÓVEIS - PÁGINA {page}")
-            logger.info("="*60)
-            
-            for i, c in enumerate(cards, 1):
-                loc = c['location_data']
-                specs = c['specs']
-                p_fmt = f"{c['price']:,}".replace(",", ".") if c['price'] else "N/A"
-                
-                # Tag visual no log
-                below_tag = "🔥 [ABAIXO DO PREÇO]" if c.get('is_below_market') else ""
-
-                logger.info(f"🏠 #{i} | {c['title'] or 'Sem Título'} {below_tag}")
-                logger.info(f"   🏘️  {loc['neighborhood']} ({loc['city']})")
-                logger.info(f"   📏 {specs['area_m2']}m² | 🛏️ {specs['bedrooms']} qts | 🚿 {specs['bathrooms']} ban | 🚗 {specs['parking']} vagas")
-                logger.info(f"   💰 Venda: R$ {p_fmt}")
-                logger.info(f"   🔗 {c['url']}")
-                logger.info("   " + "-"*40)
-            
-            logger.info("="*60 + "\n")
-
-            rows = [to_listing_row(c) for c in cards]
-            
-            if not dry_run and sb and rows:
-                BATCH = 50
-                for start in range(0, len(rows), BATCH):
-                    try:
-                        batch = rows[start:start+BATCH]
-                        await asyncio.to_thread(sb.table("listings").upsert(batch, on_conflict="portal,external_id").execute)
-                    except Exception as db_err:
-                        logger.error(f"Erro Supabase: {db_err}")
-                total_written += len(rows)
-                logger.info(f"💾 [DB] Salvo.")
-
-            if page < pages:
-                wait = random.uniform(5.0, 10.0)
-                await asyncio.sleep(wait)
+            below = sum(1 for c in cards if c['is_below_market'])
+            logger.info(f"✅ [SUCESSO] Pág {page}: {len(cards)} imóveis únicos ({below} abaixo do preço).")
+
+            # Lista detalhada só com --verbose, montada e emitida num único registro
+            if logger.isEnabledFor(logging.DEBUG):
+                lines = ["", "="*60, f" LISTA DE IMÓVEIS - PÁGINA {page}", "="*60]
+                for i, c in enumerate(cards, 1):
+                    loc = c['location_data']
+                    specs = c['specs']
+                    p_fmt = f"{c['price']:,}".replace(",", ".") if c['price'] else "N/A"
+
+                    # Tag visual no log
+                    below_tag = "🔥 [ABAIXO DO PREÇO]" if c['is_below_market'] else ""
+
+                    lines += (
+                        f"🏠 #{i} | {c['title'] or 'Sem Título'} {below_tag}",
+                        f"   🏘️  {loc['neighborhood']} ({loc['city']})",
+                        f"   📏 {specs['area_m2']}m² | 🛏️ {specs['bedrooms']} qts | 🚿 {specs['bathrooms']} ban | 🚗 {specs['parking']} vagas",
+                        f"   💰 Venda: R$ {p_fmt}",
+                        f"   🔗 {c['url']}",
+                        "   " + "-"*40,
+                    )
+                lines.append("="*60 + "\n")
+                logger.debug("\n".join(lines))
+
+            # Um timestamp por página, não um por card
+            now_iso = datetime.now(timezone.utc).isoformat()
+            return [to_listing_row(c, now_iso) for c in cards]
 
         except Exception as e:
             logger.error(f"❌ Erro pág {page}: {e}")
-        
-        finally:
-            if fetcher:
-                await fetcher.close()
+            return []
+
+async def run_scan(
+    pages: int, max_cards_per_page: int, headless: bool, dry_run: bool,
+    dump: bool = False, include_raw: bool = False,
+) -> None:
+    sb = None if dry_run else get_supabase_client()
+    
+    if not dry_run and not sb:
+        logger.error("Abortando: Falha ao conectar no Supabase.")
+        return
+
+    # Dumps de HTML só com --dump-html (debug)
+    dump_dir = Path("html_dumps") if dump else None
+    if dump_dir:
+        dump_dir.mkdir(exist_ok=True)
+
+    # Um único navegador para todas as páginas (cookies/clearance reaproveitados);
+    # até PAGE_CONCURRENCY páginas em andamento ao mesmo tempo
+    logger.info(f"🔄 [INIT] Abrindo navegador para {pages} pág(s)...")
+    sem = asyncio.Semaphore(PAGE_CONCURRENCY)
+    with ProcessPoolExecutor(max_workers=PARSE_WORKERS) as parse_pool:
+        async with StealthFetcher(headless=headless) as fetcher:
+            page_rows = await asyncio.gather(*(
+                scan_page(fetcher, page, max_cards_per_page, parse_pool, dump_dir, sem, include_raw)
+                for page in range(1, pages + 1)
+            ))
+
+    # Um anúncio pode cair em duas páginas se a listagem andar durante o scan,
+    # e o upsert não aceita a mesma chave duas vezes na mesma requisição
+    rows = list({r["external_id"]: r for page_list in page_rows for r in page_list}.values())
+
+    total_written = 0
+    if not dry_run and sb and rows:
+        total_written = await upsert_rows(sb, rows)
+        logger.info(f"💾 [DB] {total_written}/{len(rows)} linhas salvas.")
 
     logger.info(f"🏁 [FIM] Total Salvos: {total_written}")
 
@@ -341,9 +573,14 @@ def main():
     p.add_argument("--max-cards", type=int, default=30)
     p.add_argument("--headless", action="store_true", default=False)
     p.add_argument("--dry-run", action="store_true", default=False)
+    p.add_argument("--dump-html", action="store_true", default=False, help="Salva o HTML de cada página (debug)")
+    p.add_argument("--verbose", action="store_true", default=False, help="Lista cada imóvel no log")
+    p.add_argument("--include-raw", action="store_true", default=False, help="Grava o texto bruto de todos os cards em full_data (debug)")
     args = p.parse_args()
+    if args.verbose:
+        logger.setLevel(logging.DEBUG)
 
-    asyncio.run(run_scan(args.pages, args.max_cards, args.headless, args.dry_run))
+    asyncio.run(run_scan(args.pages, args.max_cards, args.headless, args.dry_run, args.dump_html, args.include_raw))
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
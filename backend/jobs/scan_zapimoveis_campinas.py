@@ -7,11 +7,28 @@ import hashlib
 import logging
 import json
 import random
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from datetime import datetime, timezone
 from typing import Any, Dict, List, Optional
+import soupsieve as sv
 from bs4 import BeautifulSoup
 
+# lxml monta a árvore em C (bem mais rápido que o html.parser nas páginas
+# de ~200KB); a API do BeautifulSoup é a mesma nos dois casos
+try:
+    import lxml  # noqa: F401
+    HTML_PARSER = "lxml"
+except ImportError:
+    HTML_PARSER = "html.parser"
+
+# orjson (opcional) faz o parse do JSON-LD bem mais rápido que o json da stdlib
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
 # -----------------------------
 # 1. Configuração e Env
 # -----------------------------
@@ -30,52 +47,119 @@ try:
 except ImportError:
     create_client = None
 
+# Escrita assíncrona opcional dos dumps de HTML (thread auxiliar caso contrário)
+try:
+    import aiofiles
+except ImportError:
+    aiofiles = None
+
 logger = logging.getLogger("scan_zap")
 logging.basicConfig(level=logging.INFO, format="%(asctime)s | %(levelname)s | %(message)s")
 
+# Páginas buscadas ao mesmo tempo (no mesmo navegador)
+PAGE_CONCURRENCY = 3
+# Processos de parse: no máximo um por página em andamento
+PARSE_WORKERS = min(PAGE_CONCURRENCY, os.cpu_count() or 1)
+# Linhas por requisição de upsert (todas as páginas são gravadas no fim)
+UPSERT_CHUNK = 500
+
 # URL Fixa
+BASE_URL = "https://www.zapimoveis.com.br"
 FIXED_URL = "https://www.zapimoveis.com.br/venda/imoveis/sp+campinas/?transacao=venda&onde=%2CS%C3%A3o+Paulo%2CCampinas%2C%2C%2C%2C%2Ccity%2CBR%3ESao+Paulo%3ENULL%3ECampinas%2C-22.905082%2C-47.061333%2C&ordem=MOST_RECENT"
 
 # -----------------------------
 # 2. Utils e Parsers
 # -----------------------------
 
+# Compiladas uma vez: as funções abaixo rodam para cada card
+_PAGINA_RE = re.compile(r"pagina=\d+")
+_WS_RE = re.compile(r"\s+")
+_NON_DIGIT_RE = re.compile(r"\D")
+_ID_RE = re.compile(r"id-(\d+)")
+_BLOCK_RE = re.compile(r"verifique se você é humano|access denied", re.I)
+_FLOAT_RE = re.compile(r"(\d+(\.\d+)?)")
+# Condomínio e IPTU numa só varredura; um rótulo nunca avança além do próximo
+_FEES_RE = re.compile(r"(?P<k>Cond|IPTU)(?:(?!Cond|IPTU).)*?R\$\s*(?P<v>[\d\.,]+)")
+
+# Seletores CSS compilados uma vez (o soupsieve vem com o bs4) em vez de
+# serem reinterpretados a cada card
+SEL_CARDS = sv.compile('li[data-cy="rp-property-cd"], [data-testid="result-card"]')
+# Literais dos seletores acima: sem nenhum deles no HTML não há cards
+CARD_MARKERS = ("rp-property-cd", "result-card")
+SEL_LINK = sv.compile("a[href]")
+SEL_IMG = sv.compile('img[src^="http"]')
+SEL_PRICE = sv.compile('[data-cy="rp-cardProperty-price-txt"]')
+SEL_PRICE_P1 = sv.compile("p:nth-of-type(1)")
+SEL_PRICE_P2 = sv.compile("p:nth-of-type(2)")
+SEL_LOC = sv.compile('[data-cy="rp-cardProperty-location-txt"]')
+SEL_STREET = sv.compile('[data-cy="rp-cardProperty-street-txt"]')
+SEL_BELOW = sv.compile('[data-testid="rp-card-belowPrice-txt"]')
+SEL_SPECS = {
+    attr: sv.compile(f'[data-cy="rp-cardProperty-{attr}-txt"]')
+    for attr in ("propertyArea", "bedroomQuantity", "bathroomQuantity", "parkingSpacesQuantity")
+}
+
+# "1.234,5" -> "1234.5" numa única passada
+_BR_DECIMAL = str.maketrans({".": None, ",": "."})
+
 def with_page(url: str, page: int) -> str:
     if "pagina=" in url:
-        return re.sub(r"pagina=\d+", f"pagina={page}", url)
+        return _PAGINA_RE.sub(f"pagina={page}", url)
     else:
         return f"{url}&pagina={page}"
 
+def absolute_url(href: str) -> str:
+    """Links dos cards vêm relativos ao portal; absolutos passam direto."""
+    return href if href.startswith("http") else (BASE_URL + href if href else "")
+
 def normalize_spaces(s: str) -> str:
-    return re.sub(r"\s+", " ", (s or "").strip())
+    return _WS_RE.sub(" ", (s or "").strip())
 
 def parse_money_brl_to_int(text: str) -> Optional[int]:
     if not text: return None
-    digits = re.sub(r"[^\d]", "", text)
+    digits = _NON_DIGIT_RE.sub("", text)
     return int(digits) if digits else None
 
+def parse_fees(text: str) -> Dict[str, Optional[int]]:
+    """Condomínio e IPTU da linha de taxas, numa única passada da regex."""
+    fees: Dict[str, Optional[int]] = {}
+    for m in _FEES_RE.finditer(text):
+        fees.setdefault(m.group("k").lower(), parse_money_brl_to_int(m.group("v")))
+    return fees
+
 def extract_external_id(url: str) -> str:
     if not url: return ""
-    m = re.search(r"id-(\d+)", url)
+    m = _ID_RE.search(url)
     if m: return m.group(1)
+    # Só para URLs sem ID numérico. Precisa ser estável entre execuções
+    # (é a chave do upsert): hash() do Python muda a cada processo
     return hashlib.sha1(url.encode("utf-8")).hexdigest()[:16]
 
 def parse_smart_float(text: str) -> Optional[float]:
     if not text: return None
-    clean_text = text.replace(".", "").replace(",", ".")
-    match = re.search(r"(\d+(\.\d+)?)", clean_text)
+    clean_text = text.translate(_BR_DECIMAL)
+    # Formato usual ("120 m²", "1234.56 m²"): o primeiro token já é o número
+    parts = clean_text.split(None, 1)
+    if parts:
+        head, dot, tail = parts[0].partition(".")
+        if head.isdecimal() and (not dot or tail.isdecimal()):
+            return float(parts[0])
+    match = _FLOAT_RE.search(clean_text)
     return float(match.group(1)) if match else None
 
 # --- PARSER HÍBRIDO (JSON-LD + HTML) ---
 
-def parse_cards_from_listing_html(html: str) -> List[Dict[str, Any]]:
-    soup = BeautifulSoup(html or "", "html.parser")
-    
-    # Check básico de bloqueio
-    txt = soup.get_text().lower()
-    if "verifique se você é humano" in txt or "access denied" in txt:
+def parse_cards_from_listing_html(html: str, include_raw: bool = False) -> List[Dict[str, Any]]:
+    html = html or ""
+    # Check básico de bloqueio: busca direto no HTML, antes de montar a árvore
+    if _BLOCK_RE.search(html):
         logger.warning("⛔ BLOCK: Captcha detectado.")
         return []
+    # Os cards visuais são a fonte dos resultados (o JSON-LD só complementa)
+    if not any(marker in html for marker in CARD_MARKERS):
+        return []
+
+    soup = BeautifulSoup(html, HTML_PARSER)
 
     processed_cards = []
     
@@ -85,8 +169,12 @@ def parse_cards_from_listing_html(html: str) -> List[Dict[str, Any]]:
     structured_items = {}
     
     for script in json_ld_scripts:
+        raw = script.string or ""
+        # Só a ItemList interessa: evita o parse dos outros blobs (breadcrumb, org, ...)
+        if '"ItemList"' not in raw:
+            continue
         try:
-            data = json.loads(script.string)
+            data = _json_loads(raw)
             if data.get('@type') == 'ItemList' and 'itemListElement' in data:
                 for item in data['itemListElement']:
                     real_item = item.get('item', {})
@@ -94,19 +182,18 @@ def parse_cards_from_listing_html(html: str) -> List[Dict[str, Any]]:
                     ext_id = extract_external_id(url)
                     if ext_id:
                         structured_items[ext_id] = real_item
-        except:
+        except (ValueError, AttributeError, TypeError):
+            # JSON inválido (orjson.JSONDecodeError também é ValueError) ou formato inesperado
             continue
 
     # 2. Extração Visual (HTML)
     # Percorre os cards visuais para pegar dados que não estão no JSON (Ex: IPTU, Tag Abaixo do Preço)
-    html_cards = soup.select('li[data-cy="rp-property-cd"], [data-testid="result-card"]')
+    html_cards = SEL_CARDS.select(soup)
     
     for container in html_cards:
         # Link e ID
-        link_elem = container.select_one("a[href]")
-        url = link_elem.get("href", "") if link_elem else ""
-        if url and not url.startswith("http"): 
-            url = "https://www.zapimoveis.com.br" + url
+        link_elem = SEL_LINK.select_one(container)
+        url = absolute_url(link_elem["href"]) if link_elem else ""
         
         ext_id = extract_external_id(url)
         # Tenta casar com os dados do JSON se existirem
@@ -118,23 +205,19 @@ def parse_cards_from_listing_html(html: str) -> List[Dict[str, Any]]:
         iptu = None
         
         # Tenta pegar do container visual de preço (geralmente tem as taxas)
-        price_container = container.select_one('[data-cy="rp-cardProperty-price-txt"]')
+        price_container = SEL_PRICE.select_one(container)
         if price_container:
             # Preço principal
-            price_text = price_container.select_one("p:nth-of-type(1)")
+            price_text = SEL_PRICE_P1.select_one(price_container)
             if price_text:
                 price = parse_money_brl_to_int(price_text.get_text())
             
             # Taxas (Condominio e IPTU)
-            fees_text = price_container.select_one("p:nth-of-type(2)")
+            fees_text = SEL_PRICE_P2.select_one(price_container)
             if fees_text:
-                ft = fees_text.get_text()
-                if "Cond" in ft:
-                    m = re.search(r"Cond.*?R\$\s*([\d\.,]+)", ft)
-                    if m: condo_fee = parse_money_brl_to_int(m.group(1))
-                if "IPTU" in ft:
-                    m = re.search(r"IPTU.*?R\$\s*([\d\.,]+)", ft)
-                    if m: iptu = parse_money_brl_to_int(m.group(1))
+                fees = parse_fees(fees_text.get_text())
+                condo_fee = fees.get("cond")
+                iptu = fees.get("iptu")
         
         # Se não achou preço no HTML, usa do JSON (Fallback)
         if not price and json_data:
@@ -146,16 +229,17 @@ def parse_cards_from_listing_html(html: str) -> List[Dict[str, Any]]:
         neighborhood = None
         city = "Campinas"
         
-        loc_node = container.select_one('[data-cy="rp-cardProperty-location-txt"]')
-        address_node = container.select_one('[data-cy="rp-cardProperty-street-txt"]')
+        loc_node = SEL_LOC.select_one(container)
+        address_node = SEL_STREET.select_one(container)
         
         if loc_node:
             # Ex: "Apartamento à venda em Jardim São Vicente, Campinas"
             full_loc = normalize_spaces(loc_node.get_text())
-            if " em " in full_loc:
-                parts = full_loc.split(" em ")[-1].split(",")
-                if len(parts) > 0: neighborhood = parts[0].strip()
-                if len(parts) > 1: city = parts[1].strip()
+            _, sep, after = full_loc.rpartition(" em ")
+            if sep:
+                head, sep, rest = after.partition(",")
+                neighborhood = head.strip()
+                if sep: city = rest.partition(",")[0].strip()
             else:
                 neighborhood = full_loc
         
@@ -164,7 +248,7 @@ def parse_cards_from_listing_html(html: str) -> List[Dict[str, Any]]:
         # --- Specs (Area, Quartos, etc) ---
         def get_spec(attr_name, json_key):
             # Prioridade HTML (data-cy)
-            node = container.select_one(f'[data-cy="rp-cardProperty-{attr_name}-txt"]')
+            node = SEL_SPECS[attr_name].select_one(container)
             if node:
                 val = parse_smart_float(node.get_text())
                 if val is not None: return val
@@ -184,7 +268,7 @@ def parse_cards_from_listing_html(html: str) -> List[Dict[str, Any]]:
         # --- Imagem ---
         img_url = None
         # Tenta pegar do carrossel HTML
-        img_node = container.select_one('img[src^="http"]')
+        img_node = SEL_IMG.select_one(container)
         if img_node:
             img_url = img_node.get('src')
         elif json_data and json_data.get('image'):
@@ -196,7 +280,7 @@ def parse_cards_from_listing_html(html: str) -> List[Dict[str, Any]]:
         # --- Check de "Abaixo do preço" (SEU PEDIDO) ---
         is_below_market = False
         # Procura a div exata que você forneceu
-        below_node = container.select_one('[data-testid="rp-card-belowPrice-txt"]')
+        below_node = SEL_BELOW.select_one(container)
         if below_node:
             is_below_market = True
 
@@ -222,7 +306,8 @@ def parse_cards_from_listing_html(html: str) -> List[Dict[str, Any]]:
             },
             "main_image_url": img_url,
             "is_below_market": is_below_market,
-            "raw_card_text": normalize_spaces(container.get_text(" "))
+            # get_text percorre a subárvore inteira: só quando pedido ou para oportunidades
+            "raw_card_text": normalize_spaces(container.get_text(" ")) if include_raw or is_below_market else None
         })
 
     return processed_cards
@@ -231,59 +316,86 @@ def parse_cards_from_listing_html(html: str) -> List[Dict[str, Any]]:
 # 3. Supabase
 # -----------------------------
 
+_supabase_client = None
+
 def get_supabase_client():
+    """Cliente único por processo: reaproveita a sessão HTTP (keep-alive/TLS) entre upserts."""
+    global _supabase_client
+    if _supabase_client is not None: return _supabase_client
     if create_client is None: return None
     sb_url = os.getenv("SUPABASE_URL")
     sb_key = os.getenv("SUPABASE_SERVICE_ROLE_KEY") or os.getenv("SUPABASE_KEY")
     if not sb_url or not sb_key: return None
-    return create_client(sb_url, sb_key)
+    _supabase_client = create_client(sb_url, sb_key)
+    return _supabase_client
 
-def to_listing_row(card: Dict[str, Any]) -> Dict[str, Any]:
+def to_listing_row(card: Dict[str, Any], now_iso: str) -> Dict[str, Any]:
+    """Linha da tabela listings; os parsers sempre preenchem todas as chaves do card."""
+    raw_text = card["raw_card_text"]
     loc = card["location_data"]
     specs = card["specs"]
     return {
         "portal": card["portal"],
         "external_id": card["external_id"],
         "url": card["url"],
-        "title": card.get("title"),
-        "price": card.get("price"),
+        "title": card["title"],
+        "price": card["price"],
         "neighborhood": loc["neighborhood"],
         "city": loc["city"],
         "state": "SP",
-        "area_m2": specs.get("area_m2"),
-        "bedrooms": specs.get("bedrooms"),
-        "bathrooms": specs.get("bathrooms"),
-        "parking": specs.get("parking"),
-        "condo_fee": specs.get("condo_fee"),
-        "iptu": specs.get("iptu"),
-        "is_below_market": card.get("is_below_market"),
-        "main_image_url": card.get("main_image_url"),
-        "last_seen_at": datetime.now(timezone.utc).isoformat(),
-        "full_data": {"raw_card_text": card.get("raw_card_text")},
+        "area_m2": specs["area_m2"],
+        "bedrooms": specs["bedrooms"],
+        "bathrooms": specs["bathrooms"],
+        "parking": specs["parking"],
+        "condo_fee": specs["condo_fee"],
+        "iptu": specs["iptu"],
+        "is_below_market": card["is_below_market"],
+        "main_image_url": card["main_image_url"],
+        "last_seen_at": now_iso,
+        "full_data": {"raw_card_text": raw_text} if raw_text else {},
     }
 
 # -----------------------------
 # 4. Job Principal
 # -----------------------------
 
-async def run_scan(pages: int, max_cards_per_page: int, headless: bool, dry_run: bool) -> None:
-    sb = None if dry_run else get_supabase_client()
-    
-    if not dry_run and not sb:
-        logger.error("Abortando: Falha ao conectar no Supabase.")
-        return
+async def dump_html(path: Path, html: str) -> None:
+    """Grava o HTML da página sem travar o loop (aiofiles ou thread)."""
+    data = html.encode("utf-8")
+    if aiofiles is not None:
+        async with aiofiles.open(path, "wb") as f:
+            await f.write(data)
+    else:
+        await asyncio.to_thread(path.write_bytes, data)
 
-    dump_dir = Path("html_dumps_zap")
-    dump_dir.mkdir(exist_ok=True)
-    total_written = 0
 
-    for page in range(1, pages + 1):
-        fetcher = None
+async def upsert_rows(sb, rows: List[Dict[str, Any]]) -> int:
+    """Upsert das linhas de todas as páginas em lotes de UPSERT_CHUNK; retorna quantas foram salvas."""
+    written = 0
+    for start in range(0, len(rows), UPSERT_CHUNK):
+        chunk = rows[start:start + UPSERT_CHUNK]
         try:
-            logger.info(f"🔄 [INIT] Abrindo navegador para pág {page}...")
-            fetcher = StealthFetcher(headless=headless) 
-            # Tempo de espera para scripts
-            await asyncio.sleep(4) 
+            await asyncio.to_thread(sb.table("listings").upsert(chunk, on_conflict="portal,external_id").execute)
+            written += len(chunk)
+        except Exception as db_err:
+            logger.error(f"Erro Supabase: {db_err}")
+    return written
+
+async def scan_page(
+    fetcher: StealthFetcher,
+    page: int,
+    max_cards_per_page: int,
+    parse_pool: ProcessPoolExecutor,
+    dump_dir: Optional[Path],
+    sem: asyncio.Semaphore,
+    include_raw: bool = False,
+) -> List[Dict[str, Any]]:
+    """Busca e processa uma página; retorna as linhas para o banco."""
+    async with sem:
+        try:
+            # Espaça as páginas concorrentes (ritmo humano)
+            if page > 1:
+                await asyncio.sleep(random.uniform(8.0, 15.0))
 
             page_url = with_page(FIXED_URL, page)
             logger.info(f"🌍 [FETCH] {page_url}")
@@ -291,64 +403,91 @@ async def run_scan(pages: int, max_cards_per_page: int, headless: bool, dry_run:
             html = await fetcher.fetch(page_url)
             
             if not html or len(html) < 1000:
-                logger.warning(f"⛔ [BLOCK] Página vazia ou bloqueada.")
-                continue
-
-            # Opcional: Salvar HTML para debug
-            # timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            # with open(dump_dir / f"zap_page_{page}_{timestamp}.html", "w", encoding="utf-8") as f: f.write(html)
-
-            cards = parse_cards_from_listing_html(html)
+                logger.warning(f"⛔ [BLOCK] Pág {page} vazia ou bloqueada.")
+                return []
+
+            # Opcional: Salvar HTML para debug (--dump-html)
+            if dump_dir:
+                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+                await dump_html(dump_dir / f"zap_page_{page}_{timestamp}.html", html)
+
+            # Parse num processo separado: o loop segue buscando as outras páginas
+            cards = await asyncio.get_running_loop().run_in_executor(
+                parse_pool, parse_cards_from_listing_html, html, include_raw
+            )
             
             if not cards:
-                logger.warning(f"⚠️ [VAZIO] 0 cards encontrados. Verifique seletores.")
-                continue
+                logger.warning(f"⚠️ [VAZIO] 0 cards encontrados na pág {page}. Verifique seletores.")
+                return []
 
-            # Remove duplicatas de ID na mesma página
-            unique_cards = []
-            seen_ids = set()
+            # Remove duplicatas de ID na mesma página: fica o primeiro card de cada ID
+            first = {}
             for c in cards:
-                eid = c.get('external_id')
-                if eid and eid not in seen_ids:
-                    seen_ids.add(eid)
-                    unique_cards.append(c)
+                if c.get('external_id'):
+                    first.setdefault(c['external_id'], c)
+            unique_cards = list(first.values())
             
             final_cards = unique_cards[:max_cards_per_page] if max_cards_per_page > 0 else unique_cards
             
-            logger.info(f"✅ [SUCESSO] {len(final_cards)} imóveis encontrados na pág {page}")
-
-            # Log bonito no terminal
-            for i, c in enumerate(final_cards, 1):
-                loc = c['location_data']
-                specs = c['specs']
-                p_fmt = f"{c['price']:,}".replace(",", ".") if c['price'] else "N/A"
-                
-                fire_icon = "🔥" if c['is_below_market'] else ""
-                
-                logger.info(f"🏠 #{i} {fire_icon} {c['title'][:40]}... | R$ {p_fmt} | {specs['area_m2']}m²")
-                if c['is_below_market']:
-                    logger.info(f"   └── 💰 OPORTUNIDADE DETECTADA!")
-
-            rows = [to_listing_row(c) for c in final_cards]
-            
-            if not dry_run and sb and rows:
-                try:
-                    await asyncio.to_thread(sb.table("listings").upsert(rows, on_conflict="portal,external_id").execute)
-                    total_written += len(rows)
-                    logger.info(f"💾 [DB] Lote salvo no Supabase.")
-                except Exception as db_err:
-                    logger.error(f"Erro Supabase: {db_err}")
-
-            if page < pages:
-                wait = random.uniform(8.0, 15.0)
-                await asyncio.sleep(wait)
+            below = sum(1 for c in final_cards if c['is_below_market'])
+            logger.info(f"✅ [SUCESSO] {len(final_cards)} imóveis encontrados na pág {page} ({below} oportunidades)")
+
+            # Log bonito no terminal (--verbose), num único registro por página
+            if final_cards and logger.isEnabledFor(logging.DEBUG):
+                lines = []
+                for i, c in enumerate(final_cards, 1):
+                    specs = c['specs']
+                    p_fmt = f"{c['price']:,}".replace(",", ".") if c['price'] else "N/A"
+
+                    fire_icon = "🔥" if c['is_below_market'] else ""
+
+                    lines.append(f"🏠 #{i} {fire_icon} {c['title'][:40]}... | R$ {p_fmt} | {specs['area_m2']}m²")
+                    if c['is_below_market']:
+                        lines.append("   └── 💰 OPORTUNIDADE DETECTADA!")
+                logger.debug("\n".join(lines))
+
+            # Um timestamp por página, não um por card
+            now_iso = datetime.now(timezone.utc).isoformat()
+            return [to_listing_row(c, now_iso) for c in final_cards]
 
         except Exception as e:
             logger.error(f"❌ Erro pág {page}: {e}")
-        
-        finally:
-            if fetcher:
-                await fetcher.close()
+            return []
+
+async def run_scan(
+    pages: int, max_cards_per_page: int, headless: bool, dry_run: bool,
+    dump: bool = False, include_raw: bool = False,
+) -> None:
+    sb = None if dry_run else get_supabase_client()
+    
+    if not dry_run and not sb:
+        logger.error("Abortando: Falha ao conectar no Supabase.")
+        return
+
+    # Dumps de HTML só com --dump-html (debug)
+    dump_dir = Path("html_dumps_zap") if dump else None
+    if dump_dir:
+        dump_dir.mkdir(exist_ok=True)
+
+    # Um único navegador para todas as páginas (cookies/clearance reaproveitados);
+    # até PAGE_CONCURRENCY páginas em andamento ao mesmo tempo
+    logger.info(f"🔄 [INIT] Abrindo navegador para {pages} pág(s)...")
+    sem = asyncio.Semaphore(PAGE_CONCURRENCY)
+    with ProcessPoolExecutor(max_workers=PARSE_WORKERS) as parse_pool:
+        async with StealthFetcher(headless=headless) as fetcher:
+            page_rows = await asyncio.gather(*(
+                scan_page(fetcher, page, max_cards_per_page, parse_pool, dump_dir, sem, include_raw)
+                for page in range(1, pages + 1)
+            ))
+
+    # Um anúncio pode cair em duas páginas se a listagem andar durante o scan,
+    # e o upsert não aceita a mesma chave duas vezes na mesma requisição
+    rows = list({r["external_id"]: r for page_list in page_rows for r in page_list}.values())
+
+    total_written = 0
+    if not dry_run and sb and rows:
+        total_written = await upsert_rows(sb, rows)
+        logger.info(f"💾 [DB] {total_written}/{len(rows)} linhas salvas.")
 
     logger.info(f"🏁 [FIM] Total processado: {total_written}")
 
@@ -358,9 +497,14 @@ def main():
     p.add_argument("--max-cards", type=int, default=30)
     p.add_argument("--headless", action="store_true", default=False)
     p.add_argument("--dry-run", action="store_true", default=False)
+    p.add_argument("--dump-html", action="store_true", default=False, help="Salva o HTML de cada página (debug)")
+    p.add_argument("--verbose", action="store_true", default=False, help="Lista cada imóvel no log")
+    p.add_argument("--include-raw", action="store_true", default=False, help="Grava o texto bruto de todos os cards em full_data (debug)")
     args = p.parse_args()
+    if args.verbose:
+        logger.setLevel(logging.DEBUG)
 
-    asyncio.run(run_scan(args.pages, args.max_cards, args.headless, args.dry_run))
+    asyncio.run(run_scan(args.pages, args.max_cards, args.headless, args.dry_run, args.dump_html, args.include_raw))
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -1,10 +1,14 @@
 import asyncio
+import functools
+import json
+import logging
 import os
 import re
 import sys
 import zlib
 from pathlib import Path
 from datetime import datetime, timezone
+from logging.handlers import RotatingFileHandler
 
 from playwright.async_api import async_playwright
 
@@ -27,10 +31,19 @@ try:
 except ImportError:
     create_client = None
 
+# orjson (opcional) decodifica as respostas da API bem mais rápido que o json da stdlib
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
 BASE_URL = "https://www.quintoandar.com.br/comprar/imovel/campinas-sp-brasil"
 
 NAV_TIMEOUT_MS = int(os.getenv("NAV_TIMEOUT_MS") or "25000")
 DETAIL_TIMEOUT_MS = int(os.getenv("DETAIL_TIMEOUT_MS") or "15000")
+# páginas de detalhe abertas ao mesmo tempo ao buscar datas de publicação
+DETAIL_CONCURRENCY = int(os.getenv("DETAIL_CONCURRENCY") or "5")
 
 HEADLESS = (os.getenv("HEADLESS") or "1").strip().lower() not in ("0", "false", "no")
 BATCH_SIZE = int(os.getenv("BATCH_SIZE") or "10")
@@ -45,15 +58,21 @@ LOG_DIR = ROOT_DIR / "logs"
 LOG_DIR.mkdir(parents=True, exist_ok=True)
 LOG_FILE = LOG_DIR / f"quintoandar_{datetime.now().strftime('%Y-%m-%d')}.log"
 
+# arquivo aberto uma vez (antes: open/write/close a cada linha)
+logger = logging.getLogger("quintoandar")
+logger.setLevel(logging.INFO)
+logger.propagate = False
+if not logger.handlers:
+    _log_fmt = logging.Formatter("[%(asctime)s] %(message)s", "%H:%M:%S")
+    for _handler in (
+        logging.StreamHandler(sys.stdout),
+        RotatingFileHandler(LOG_FILE, maxBytes=5_000_000, backupCount=3, encoding="utf-8"),
+    ):
+        _handler.setFormatter(_log_fmt)
+        logger.addHandler(_handler)
+
 def log(msg: str):
-    ts = datetime.now().strftime("%H:%M:%S")
-    line = f"[{ts}] {msg}"
-    print(line, flush=True)
-    try:
-        with open(LOG_FILE, "a", encoding="utf-8") as f:
-            f.write(line + "\n")
-    except:
-        pass
+    logger.info(msg)
 
 async def dump_debug(page, label: str):
     ts = datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -86,29 +105,35 @@ async def dump_debug(page, label: str):
 async def wait_for_cards(page, selectors: list[str], timeout_ms: int = 60000) -> str:
     """
     Espera aparecer algum seletor de card.
-    Usa state='attached' (mais permissivo que 'visible') e faz scroll pra destravar lazy-load.
-    Retorna o seletor vencedor.
+    Uma única espera nativa (locator.or_) com state='attached' (mais permissivo que 'visible');
+    em paralelo, um scroll periódico destrava o lazy-load.
+    Retorna o primeiro seletor da lista que tem cards.
     """
-    start = asyncio.get_event_loop().time()
-    last_scroll = 0
+    combined = page.locator(selectors[0])
+    for sel in selectors[1:]:
+        combined = combined.or_(page.locator(sel))
 
-    while (asyncio.get_event_loop().time() - start) * 1000 < timeout_ms:
-        for sel in selectors:
-            try:
-                await page.wait_for_selector(sel, timeout=1500, state="attached")
-                if await page.locator(sel).count() > 0:
-                    return sel
-            except:
-                pass
-
-        now = asyncio.get_event_loop().time()
-        if now - last_scroll > 1.2:
-            last_scroll = now
+    async def nudge_lazy_load():
+        while True:
+            await asyncio.sleep(1.2)
             try:
                 await page.mouse.wheel(0, 1600)
-            except:
+            except Exception:
                 pass
-        await asyncio.sleep(0.2)
+
+    scroller = asyncio.create_task(nudge_lazy_load())
+    try:
+        await combined.first.wait_for(state="attached", timeout=timeout_ms)
+    except Exception as e:
+        raise TimeoutError("Nenhum seletor de card apareceu no tempo limite") from e
+    finally:
+        scroller.cancel()
+        # garante que o cancelamento chegou antes de seguir
+        await asyncio.gather(scroller, return_exceptions=True)
+
+    for sel in selectors:
+        if await page.locator(sel).count() > 0:
+            return sel
 
     raise TimeoutError("Nenhum seletor de card apareceu no tempo limite")
 
@@ -137,14 +162,38 @@ FALLBACK_PROPERTY_TYPE = _fallback_property_type(ALLOWED_PROPERTY_TYPES)
 # -----------------------------
 # 2) Utils e Parsers
 # -----------------------------
+# compilados uma vez: rodam para cada card/probe
+_RE_EXTERNAL_ID = re.compile(r"/imovel/(\d+)")
+_RE_IS_NEW = re.compile(r"(hora|minuto|segundo|agora|novo|hoje)")
+_RE_NEIGH_SPLIT = re.compile(r"\scom\s|\sde\s|\(|\.")
+_RE_NEIGH_CAMPINAS = re.compile(r",\s*([^·\n,]{3,})\s*·\s*Campinas", re.IGNORECASE)
+_RE_SORT = re.compile(r"Mais (recentes|relevantes)|Relevância", re.IGNORECASE)
+_RE_MOST_RECENT = re.compile("Mais recentes", re.IGNORECASE)
+
 def extract_external_id(url: str) -> str:
     if not url:
         return "0"
-    match = re.search(r"/imovel/(\d+)", url)
+    match = _RE_EXTERNAL_ID.search(url)
     if match:
         return match.group(1)
     return str(abs(zlib.adler32(url.encode("utf-8"))))
 
+# (palavras-chave, tipo) na ordem de prioridade: a primeira regra que casar vence
+_PT_RULES = (
+    (("studio", "kitnet", "loft", "flat"), "other"),
+    (("casa", "sobrado"), "house"),
+    (("apart",), "apartment"),
+    (("lote", "terreno", "land"), "land"),
+    (("comercial", "loja", "sala", "office"), "commercial"),
+)
+
+def _property_label(t: str) -> str:
+    for keywords, label in _PT_RULES:
+        for k in keywords:
+            if k in t:
+                return label
+    return "other"
+
 def normalize_property_type(text: str, allowed: set = None) -> str:
     allowed = allowed or ALLOWED_PROPERTY_TYPES
     fallback = _fallback_property_type(allowed)
@@ -152,35 +201,23 @@ def normalize_property_type(text: str, allowed: set = None) -> str:
     if not text:
         return fallback
 
-    t = str(text).lower().strip()
-
-    if any(k in t for k in ["studio", "kitnet", "loft", "flat"]):
-        return "other" if "other" in allowed else fallback
-
-    if any(k in t for k in ["casa", "sobrado"]):
-        return "house" if "house" in allowed else fallback
-
-    if "apart" in t:
-        return "apartment" if "apartment" in allowed else fallback
-
-    if any(k in t for k in ["lote", "terreno", "land"]):
-        return "land" if "land" in allowed else fallback
-
-    if any(k in t for k in ["comercial", "loja", "sala", "office"]):
-        return "commercial" if "commercial" in allowed else fallback
-
-    return "other" if "other" in allowed else fallback
+    label = _property_label(str(text).lower().strip())
+    return label if label in allowed else fallback
 
 def check_is_new(text_date: str) -> bool:
     if not text_date:
         return False
-    return bool(re.search(r"(hora|minuto|segundo|agora|novo|hoje)", text_date.lower()))
+    return bool(_RE_IS_NEW.search(text_date.lower()))
 
 def _build_quintoandar_image_url(value: str) -> str:
     if not value:
         return ""
-    v = str(value).strip()
-    if v.startswith("http://") or v.startswith("https://"):
+    return _quintoandar_image_url(str(value).strip())
+
+@functools.lru_cache(maxsize=4096)
+def _quintoandar_image_url(v: str) -> str:
+    # cacheado: o mesmo path aparece em coverImage e imageList e se repete entre lotes
+    if v.startswith(("http://", "https://")):
         return v
     if v.startswith("/"):
         return "https://www.quintoandar.com.br" + v
@@ -190,12 +227,12 @@ def _fallback_neighborhood_from_dom(h2_text: str, full_text: str) -> str:
     h2 = (h2_text or "").strip()
     if " em " in h2:
         part = h2.split(" em ", 1)[-1]
-        part = re.split(r"\scom\s|\sde\s|\(|\.", part)[0].strip()
+        part = _RE_NEIGH_SPLIT.split(part, 1)[0].strip()
         if part and len(part) >= 3:
             return part
 
     txt = full_text or ""
-    m = re.search(r",\s*([^·\n,]{3,})\s*·\s*Campinas", txt, flags=re.IGNORECASE)
+    m = _RE_NEIGH_CAMPINAS.search(txt)
     if m:
         return m.group(1).strip()
 
@@ -204,14 +241,27 @@ def _fallback_neighborhood_from_dom(h2_text: str, full_text: str) -> str:
 # -----------------------------
 # 3) Listener da API (cache)
 # -----------------------------
-def attach_quintoandar_api_listener(page, api_by_id: dict):
+# respostas JSON aguardando decodificação; acima disso são descartadas
+# (o card cai no fallback do DOM) em vez de acumular tasks e payloads em memória
+API_QUEUE_SIZE = 32
+API_WORKERS = 2
+# só a busca de imóveis (hits -> api_by_id) entra na fila; telemetria/analytics
+# em JSON não disputa as vagas (ex.: apigw.../house-listing-search/v2/search/list)
+API_SEARCH_URL_MARKERS = ("house-listing-search", "/search")
+
+def attach_quintoandar_api_listener(page, api_by_id: dict) -> list:
+    """
+    Preenche api_by_id com os hits das respostas JSON da página.
+    As respostas passam por uma fila limitada drenada por API_WORKERS workers.
+    Retorna as tasks dos workers (cancelar ao final do scan).
+    """
+    queue: asyncio.Queue = asyncio.Queue(maxsize=API_QUEUE_SIZE)
+    dropped = 0
+
     async def capture_response(response):
         try:
-            ct = (response.headers.get("content-type") or "").lower()
-            if "application/json" not in ct:
-                return
-
-            data = await response.json()
+            # bytes crus + orjson em vez de response.json() (stdlib json)
+            data = _json_loads(await response.body())
             hits = (data.get("hits") or {}).get("hits")
             if not isinstance(hits, list) or not hits:
                 return
@@ -226,15 +276,45 @@ def attach_quintoandar_api_listener(page, api_by_id: dict):
         except Exception:
             return
 
-    page.on("response", lambda resp: asyncio.create_task(capture_response(resp)))
+    async def worker():
+        while True:
+            response = await queue.get()
+            try:
+                await capture_response(response)
+            finally:
+                queue.task_done()
+
+    def on_response(response):
+        nonlocal dropped
+        # URL e headers já estão disponíveis aqui: só JSON da busca entra na fila
+        url = response.url
+        if "quintoandar" not in url or not any(m in url for m in API_SEARCH_URL_MARKERS):
+            return
+        ct = (response.headers.get("content-type") or "").lower()
+        if "application/json" not in ct:
+            return
+        try:
+            queue.put_nowait(response)
+        except asyncio.QueueFull:
+            dropped += 1
+            log(f"⚠️ Fila da API cheia: resposta de busca descartada ({dropped} no total), cards dela vão pelo DOM. {url}")
+
+    workers = [asyncio.create_task(worker()) for _ in range(API_WORKERS)]
+    page.on("response", on_response)
+    return workers
 
 # -----------------------------
 # 4) Extração (API-first)
 # -----------------------------
-async def extract_card_data(card_element, api_by_id: dict) -> dict:
+async def extract_batch_raw(page, selector: str, start: int, end: int) -> list[dict]:
+    """
+    Dados crus dos cards [start, end) numa única chamada ao browser
+    (em vez de um evaluate por card).
+    """
     # robusto: card pode ser <a> (fallback) ou container <div>
-    raw = await card_element.evaluate(
-        """(card) => {
+    return await page.eval_on_selector_all(
+        selector,
+        """(cards, [start, end]) => cards.slice(start, end).map((card) => {
             const link = (card.tagName === 'A') ? card : card.querySelector('a');
             const img = card.querySelector('img');
             const h2 = card.querySelector('h2');
@@ -244,9 +324,11 @@ async def extract_card_data(card_element, api_by_id: dict) -> dict:
                 h2_text: h2 ? (h2.innerText || "") : "",
                 full_text: (card.innerText || "")
             }
-        }"""
+        })""",
+        [start, end],
     )
 
+def extract_card_data(raw: dict, api_by_id: dict) -> dict:
     full_url = (
         "https://www.quintoandar.com.br" + raw["url"]
         if raw.get("url") and raw["url"].startswith("/")
@@ -294,6 +376,7 @@ async def extract_card_data(card_element, api_by_id: dict) -> dict:
                 "raw_text": raw.get("full_text"),
                 "api_source": None,
                 "property_type_raw": raw_pt,
+                "property_type_normalized": property_type,
                 "property_type_allowed": sorted(list(ALLOWED_PROPERTY_TYPES)),
             },
         }
@@ -343,8 +426,8 @@ async def extract_card_data(card_element, api_by_id: dict) -> dict:
                 if u:
                     images.append(_build_quintoandar_image_url(u))
 
-    seen = set()
-    images = [x for x in images if x and (x not in seen and not seen.add(x))]
+    # dedup mantendo a ordem (dict preserva inserção)
+    images = list(dict.fromkeys(x for x in images if x))
 
     main_image_url = raw.get("img") or (images[0] if images else "")
 
@@ -392,7 +475,7 @@ async def force_filter_interaction(page):
     log("🛠️  Aplicando filtro 'Mais recentes'...")
     sort_btn = (
         page.locator('div[role="button"], div[class*="Chip"]')
-        .filter(has_text=re.compile(r"Mais (recentes|relevantes)|Relevância", re.IGNORECASE))
+        .filter(has_text=_RE_SORT)
         .first
     )
     if await sort_btn.count() == 0:
@@ -406,7 +489,7 @@ async def force_filter_interaction(page):
 
             await sort_btn.click()
             opt = page.locator('li, div[role="option"]').filter(
-                has_text=re.compile("Mais recentes", re.IGNORECASE)
+                has_text=_RE_MOST_RECENT
             ).first
             await opt.wait_for(state="visible", timeout=5000)
             await opt.click(force=True)
@@ -428,8 +511,63 @@ async def click_load_more(page):
             pass
     return False
 
-async def get_details_date(context, card_element, is_link_selector: bool) -> str:
-    page_detail = await context.new_page()
+# a página de detalhe só serve para ler publication_date: nada disso é necessário
+DETAIL_BLOCKED_RESOURCES = {"image", "media", "font", "stylesheet"}
+
+async def _block_heavy_resources(route):
+    if route.request.resource_type in DETAIL_BLOCKED_RESOURCES:
+        await route.abort()
+    else:
+        await route.continue_()
+
+class PagePool:
+    """
+    Páginas de detalhe reaproveitadas entre probes, em vez de new_page()/close() a cada data.
+    No máximo max_size páginas existem ao mesmo tempo; acquire() espera se todas estão em uso.
+    """
+
+    def __init__(self, context, max_size: int):
+        self.context = context
+        self._slots = asyncio.Semaphore(max_size)
+        self._idle: asyncio.Queue = asyncio.Queue()
+
+    async def acquire(self):
+        await self._slots.acquire()
+        try:
+            return self._idle.get_nowait()
+        except asyncio.QueueEmpty:
+            pass
+        try:
+            page = await self.context.new_page()
+            # só nas páginas de detalhe: a listagem continua carregando tudo
+            await page.route("**/*", _block_heavy_resources)
+            return page
+        except Exception:
+            self._slots.release()
+            raise
+
+    async def release(self, page):
+        try:
+            # limpa a página (timers/requests do anúncio anterior) antes de devolver
+            await page.goto("about:blank", timeout=5000)
+            self._idle.put_nowait(page)
+        except Exception:
+            try:
+                await page.close()
+            except Exception:
+                pass
+        finally:
+            self._slots.release()
+
+    async def close(self):
+        while not self._idle.empty():
+            try:
+                await self._idle.get_nowait().close()
+            except Exception:
+                pass
+
+async def get_details_date(pool: PagePool, card_element, is_link_selector: bool) -> str:
+    page_detail = await pool.acquire()
     try:
         if is_link_selector:
             href = await card_element.evaluate("el => el.href")
@@ -449,7 +587,19 @@ async def get_details_date(context, card_element, is_link_selector: bool) -> str
     except:
         return ""
     finally:
-        await page_detail.close()
+        await pool.release(page_detail)
+
+async def gather_dates(pool: PagePool, elements, is_link_selector: bool) -> list[str]:
+    """
+    Busca a publication_date de vários cards em paralelo.
+    O tamanho do pool limita quantas páginas de detalhe ficam abertas ao mesmo tempo.
+    Falhas viram "" (mesmo retorno de get_details_date).
+    """
+    results = await asyncio.gather(
+        *(get_details_date(pool, el, is_link_selector=is_link_selector) for el in elements),
+        return_exceptions=True,
+    )
+    return [r if isinstance(r, str) else "" for r in results]
 
 def _looks_like_property_type_constraint_error(e: Exception) -> bool:
     s = str(e)
@@ -463,10 +613,14 @@ def _coerce_row_property_type(row: dict, force_fallback: bool = False) -> dict:
     fallback = _fallback_property_type(allowed)
 
     raw_pt = row.get("property_type") or ""
-    normalized = normalize_property_type(raw_pt, allowed=allowed)
 
     if force_fallback:
         normalized = fallback
+    elif raw_pt in allowed and (row.get("full_data") or {}).get("property_type_normalized") == raw_pt:
+        # já normalizado em extract_card_data: só confere se é permitido
+        normalized = raw_pt
+    else:
+        normalized = normalize_property_type(raw_pt, allowed=allowed)
 
     if normalized not in allowed:
         normalized = fallback
@@ -474,22 +628,54 @@ def _coerce_row_property_type(row: dict, force_fallback: bool = False) -> dict:
     row["property_type"] = normalized
     return row
 
+# linhas aguardando upsert, por external_id (um imóvel repetido entre lotes não
+# pode aparecer duas vezes no mesmo upsert)
+_PENDING_ROWS: dict = {}
+UPSERT_FLUSH_EVERY = int(os.getenv("UPSERT_FLUSH_EVERY") or "100")
+
+_supabase_client = None
+
+def get_supabase_client():
+    """Cliente único por processo (evita create_client/handshake TLS a cada lote)."""
+    global _supabase_client
+    if _supabase_client is None:
+        url = os.getenv("SUPABASE_URL")
+        key = os.getenv("SUPABASE_KEY")
+        if not create_client or not url or not key:
+            return None
+        _supabase_client = create_client(url, key)
+    return _supabase_client
+
 async def save_to_supabase(data):
-    if not create_client or not data:
+    """Acumula o lote; o upsert só sai a cada UPSERT_FLUSH_EVERY linhas (ou no flush final)."""
+    if not data:
         return
 
-    url = os.getenv("SUPABASE_URL")
-    key = os.getenv("SUPABASE_KEY")
-    if not url or not key:
-        log("⚠️ SUPABASE_URL/SUPABASE_KEY não encontrados no .env — pulando save.")
+    for row in data:
+        row = _coerce_row_property_type(row)
+        _PENDING_ROWS[row["external_id"]] = row
+
+    if len(_PENDING_ROWS) >= UPSERT_FLUSH_EVERY:
+        await flush_to_supabase()
+
+async def flush_to_supabase():
+    if not _PENDING_ROWS:
+        return
+    if not create_client:
+        _PENDING_ROWS.clear()
         return
 
-    sb = create_client(url, key)
+    sb = get_supabase_client()
+    if not sb:
+        log("⚠️ SUPABASE_URL/SUPABASE_KEY não encontrados no .env — pulando save.")
+        _PENDING_ROWS.clear()
+        return
 
-    data = [_coerce_row_property_type(row) for row in data]
+    data = list(_PENDING_ROWS.values())
+    _PENDING_ROWS.clear()
 
     try:
-        sb.table("listings").upsert(data, on_conflict="portal,external_id").execute()
+        await asyncio.to_thread(sb.table("listings").upsert(data, on_conflict="portal,external_id").execute)
         log(f"💾 Salvou lote de {len(data)} imóveis.")
         return
 
@@ -501,7 +687,7 @@ async def save_to_supabase(data):
             for row in data:
                 try:
                     row = _coerce_row_property_type(row, force_fallback=True)
-                    sb.table("listings").upsert([row], on_conflict="portal,external_id").execute()
+                    await asyncio.to_thread(sb.table("listings").upsert([row], on_conflict="portal,external_id").execute)
                     ok += 1
                 except Exception as e2:
                     fail += 1
@@ -539,9 +725,10 @@ async def run_scan():
             user_agent=DEFAULT_UA,
         )
         page = await context.new_page()
+        detail_pool = PagePool(context, DETAIL_CONCURRENCY)
 
         api_by_id = {}
-        attach_quintoandar_api_listener(page, api_by_id)
+        api_workers = attach_quintoandar_api_listener(page, api_by_id)
 
         await page.goto(BASE_URL, wait_until="domcontentloaded", timeout=max(NAV_TIMEOUT_MS, 60000))
         await asyncio.sleep(2)
@@ -590,84 +777,77 @@ async def run_scan():
         stop_all = False
         batches = 0
 
-        while not stop_all and batches < MAX_BATCHES:
-            batches += 1
-            target_index_check = base_index + BATCH_SIZE - 1
-
-            cards = await page.query_selector_all(card_selector)
-
-            retries = 0
-            while len(cards) <= target_index_check:
-                log(f"📜 Carregando... (Temos {len(cards)}, precisamos {target_index_check + 1})")
-                clicked = await click_load_more(page)
-                if not clicked:
-                    await page.mouse.wheel(0, 1400)
-                await asyncio.sleep(1.5)
-
-                new_cards = await page.query_selector_all(card_selector)
-                if len(new_cards) == len(cards):
-                    retries += 1
-                    if retries >= 3:
-                        target_index_check = len(new_cards) - 1
-                        break
-                else:
-                    retries = 0
-                cards = new_cards
-
-            if base_index >= len(cards):
-                break
-
-            check_idx = min(target_index_check, len(cards) - 1)
-            log(f"🔍 Verificando lote {base_index}-{check_idx}...")
-
-            text_date = await get_details_date(context, cards[check_idx], is_link_selector=is_link_selector)
-            is_new = check_is_new(text_date)
-            log(f"📅 publication_date idx={check_idx}: '{text_date}' -> is_new={is_new}")
-
-            if is_new:
-                log("✅ Lote NOVO. Salvando...")
-                batch_data = []
-                current_dom = await page.query_selector_all(card_selector)
+        try:
+            while not stop_all and batches < MAX_BATCHES:
+                batches += 1
+                target_index_check = base_index + BATCH_SIZE - 1
+
+                cards = await page.query_selector_all(card_selector)
+
+                retries = 0
+                while len(cards) <= target_index_check:
+                    log(f"📜 Carregando... (Temos {len(cards)}, precisamos {target_index_check + 1})")
+                    clicked = await click_load_more(page)
+                    if not clicked:
+                        await page.mouse.wheel(0, 1400)
+                    await asyncio.sleep(1.5)
+
+                    new_cards = await page.query_selector_all(card_selector)
+                    if len(new_cards) == len(cards):
+                        retries += 1
+                        if retries >= 3:
+                            target_index_check = len(new_cards) - 1
+                            break
+                    else:
+                        retries = 0
+                    cards = new_cards
+
+                if base_index >= len(cards):
+                    break
+
+                check_idx = min(target_index_check, len(cards) - 1)
+                log(f"🔍 Verificando lote {base_index}-{check_idx}...")
+
+                text_date = await get_details_date(detail_pool, cards[check_idx], is_link_selector=is_link_selector)
+                is_new = check_is_new(text_date)
+                log(f"📅 publication_date idx={check_idx}: '{text_date}' -> is_new={is_new}")
+
+                if is_new:
+                    log("✅ Lote NOVO. Salvando...")
+                    raws = await extract_batch_raw(page, card_selector, base_index, check_idx + 1)
+                    batch_data = [extract_card_data(raw, api_by_id) for raw in raws]
+
+                    await save_to_supabase(batch_data)
+
+                    base_index += BATCH_SIZE
+                    if check_idx == len(cards) - 1:
+                        stop_all = True
 
-                for i in range(base_index, check_idx + 1):
-                    if i < len(current_dom):
-                        batch_data.append(await extract_card_data(current_dom[i], api_by_id))
+                else:
+                    log("🛑 Lote MISTO/ANTIGO. Buscando corte...")
+                    # datas do lote inteiro em paralelo (check_idx já sabemos que é antigo);
+                    # o corte sai da memória, sem navegações sequenciais
+                    dates = await gather_dates(detail_pool, cards[base_index:check_idx], is_link_selector)
+                    cutoff = -1
+                    for offset, d in enumerate(dates):
+                        if not check_is_new(d):
+                            break
+                        cutoff = base_index + offset
 
-                await save_to_supabase(batch_data)
+                    if cutoff >= base_index:
+                        log(f"💾 Salvando final (até {cutoff})...")
+                        raws = await extract_batch_raw(page, card_selector, base_index, cutoff + 1)
+                        final_batch = [extract_card_data(raw, api_by_id) for raw in raws]
+                        await save_to_supabase(final_batch)
 
-                base_index += BATCH_SIZE
-                if check_idx == len(cards) - 1:
                     stop_all = True
+        finally:
+            # o que sobrou abaixo de UPSERT_FLUSH_EVERY (também quando o loop quebra no meio)
+            await flush_to_supabase()
 
-            else:
-                log("🛑 Lote MISTO/ANTIGO. Buscando corte...")
-                low, high = base_index, check_idx
-                cutoff = -1
-
-                first_date = await get_details_date(context, cards[low], is_link_selector=is_link_selector)
-                if not check_is_new(first_date):
-                    cutoff = -1
-                else:
-                    while low + 1 < high:
-                        mid = (low + high) // 2
-                        mid_date = await get_details_date(context, cards[mid], is_link_selector=is_link_selector)
-                        if check_is_new(mid_date):
-                            low = mid
-                        else:
-                            high = mid
-                    cutoff = low
-
-                if cutoff >= base_index:
-                    log(f"💾 Salvando final (até {cutoff})...")
-                    final_batch = []
-                    current_dom = await page.query_selector_all(card_selector)
-                    for i in range(base_index, cutoff + 1):
-                        if i < len(current_dom):
-                            final_batch.append(await extract_card_data(current_dom[i], api_by_id))
-                    await save_to_supabase(final_batch)
-
-                stop_all = True
-
+            for task in api_workers:
+                task.cancel()
+            await detail_pool.close()
         await browser.close()
         log("✅ Finalizado.")
 